@@ -0,0 +1,42 @@
+"""文件重命名工具（用于蓝奏云分卷压缩包重命名）
+
+引擎部分为纯Python实现，导入本包不会加载PyQt5；
+图形界面位于 rename_files.gui，命令行入口为 python -m rename_files。
+"""
+import importlib
+
+# 公开名称 -> 所在模块。按需导入（PEP 562）：import rename_files 或只用 rename_files.gui、
+# rename_files.jobs 等子模块时不会连带加载引擎、SQLite 和线程池，图形界面启动更快
+_EXPORTS = {
+    'engine': ('MODES', 'RENAMED', 'SIMULATED', 'SKIPPED', 'ERROR', 'CONFLICT', 'RenameResult',
+               'RenameEngine', 'new_filename_for', 'format_result', 'iter_renames'),
+    'rules': ('Rule', 'RuleSet', 'BUILTIN_RULES', 'builtin_ruleset', 'load_rules',
+              'resolve_ruleset'),
+    'planner': ('RenamePlan',),
+    'scan': ('DirListing', 'TreeWalker', 'scan_dir', 'walk_tree'),
+    'control': ('Cancelled', 'Checkpoint', 'RunControl'),
+    'journal': ('Journal',),
+}
+_MODULE_OF = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = [
+    'MODES', 'RENAMED', 'SIMULATED', 'SKIPPED', 'ERROR', 'CONFLICT', 'RenameResult',
+    'RenameEngine', 'new_filename_for', 'format_result', 'iter_renames',
+    'Rule', 'RuleSet', 'BUILTIN_RULES', 'builtin_ruleset', 'load_rules', 'resolve_ruleset',
+    'RenamePlan',
+    'DirListing', 'TreeWalker', 'scan_dir', 'walk_tree',
+    'Cancelled', 'Checkpoint', 'RunControl', 'Journal',
+]
+
+
+def __getattr__(name):
+    module = _MODULE_OF.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
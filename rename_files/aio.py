@@ -0,0 +1,140 @@
+"""asyncio 接口：在共享的有界线程池上扫描和重命名，适合嵌入异步服务
+
+    pool = RenamePool(workers=8)
+    job = AsyncRenameJob(directory, 'rev-to-rar', recursive=True, dry_run=False, pool=pool)
+    async for result in job:
+        ...
+    print(job.summary())
+
+阻塞的文件系统调用（scandir、rename、verify 校验时的文件头读取）都在 pool 的线程中执行，不会阻塞事件循环；
+多个任务共用同一个 pool 时，总线程数不超过 pool.workers。
+"""
+import asyncio
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+from .engine import RenameEngine, RenameResult, collect_results
+
+
+class RenamePool:
+    """多个异步任务共享的有界线程池"""
+    def __init__(self, workers=4):
+        self.workers = max(1, workers)
+        self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                            thread_name_prefix='rename-aio')
+
+    async def run(self, func, *args):
+        """在线程池中执行阻塞函数"""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def close(self):
+        """等待已提交的调用完成并关闭线程池"""
+        self._executor.shutdown(wait=True)
+
+    async def aclose(self):
+        """不阻塞事件循环地关闭线程池"""
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+
+def _take(iterator, count):
+    return list(islice(iterator, count))
+
+
+class AsyncRenameJob:
+    """一个目录的异步重命名任务，异步迭代产出 RenameResult
+
+    concurrency 为本任务同时在线程池中执行的目录分片数上限；
+    目录扫描按批（batch_size 个结果或分片）在线程池中进行，与分片执行重叠。
+    未指定 pool 时任务自建一个 concurrency 个线程的线程池，结束时关闭。
+    其余参数与 RenameEngine 相同，但 workers/rename_workers 不可用（改由共享线程池执行）。
+    """
+    def __init__(self, directory, mode, recursive=False, dry_run=True, pool=None,
+                 concurrency=4, batch_size=256, **options):
+        if options.get('workers') or options.get('rename_workers'):
+            raise ValueError("异步接口使用共享线程池执行，不支持 workers/rename_workers 参数")
+        self.engine = RenameEngine(directory, mode, recursive, dry_run, **options)
+        self.pool = pool
+        self.concurrency = max(1, concurrency)
+        self.batch_size = batch_size
+
+    def __aiter__(self):
+        return self.results()
+
+    async def results(self):
+        """扫描并执行重命名，按与 RenameEngine.run() 相同的顺序产出结果"""
+        engine = self.engine
+        pool = self.pool or RenamePool(self.concurrency)
+        # 内容校验也在共享线程池上进行
+        engine.verify_executor = pool._executor
+        work = engine.iter_work()
+        pending = deque()
+        fetch = None
+        try:
+            while True:
+                # shield：任务被取消时线程中的调用不会随之停止，future 要留到 finally 中等待
+                fetch = asyncio.ensure_future(pool.run(_take, work, self.batch_size))
+                batch = await asyncio.shield(fetch)
+                fetch = None
+                if not batch:
+                    break
+                for item in batch:
+                    if isinstance(item, RenameResult):
+                        yield item
+                        continue
+                    pending.append(asyncio.ensure_future(pool.run(engine.rename_shard, *item)))
+                    # 背压：在途分片超过上限时先取回最早的结果
+                    while len(pending) > self.concurrency:
+                        for result in await self._next_done(pending, engine):
+                            yield result
+            while pending:
+                for result in await self._next_done(pending, engine):
+                    yield result
+        finally:
+            # 被取消或提前关闭时，已提交的分片和扫描批次仍在线程中执行：等它们结束，
+            # 分片中已完成的改名计入统计；扫描批次结束前关闭生成器会报 "generator already executing"
+            in_flight = list(pending)
+            if fetch is not None:
+                in_flight.append(fetch)
+            if in_flight:
+                await asyncio.wait(in_flight)
+            for future in pending:
+                if future.exception() is None:
+                    for _ in collect_results(future.result(), engine):
+                        pass
+            pending.clear()
+            # 生成器必须在线程池中关闭（关闭目录缓存等操作也是阻塞的）
+            await pool.run(work.close)
+            if self.pool is None:
+                await pool.aclose()
+
+    @staticmethod
+    async def _next_done(pending, engine):
+        """等待最早提交的分片完成，返回其 RenameResult 列表
+
+        先计入统计再产出，调用方中途停止迭代时统计仍包含整个分片；
+        等待期间被取消时分片仍留在 pending 中，由 results 的 finally 等待并计数。
+        """
+        results = await asyncio.shield(pending[0])
+        pending.popleft()
+        return list(collect_results(results, engine))
+
+    def summary(self):
+        """运行统计，字段与命令行的 summary 相同"""
+        return self.engine.summary()
+
+
+async def rename_async(directory, mode, recursive=False, dry_run=True, pool=None,
+                       on_result=None, **options):
+    """运行一个异步重命名任务并返回统计；on_result(结果) 对每个结果调用"""
+    job = AsyncRenameJob(directory, mode, recursive, dry_run, pool, **options)
+    async for result in job:
+        if on_result is not None:
+            on_result(result)
+    return job.summary()
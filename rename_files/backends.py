@@ -0,0 +1,229 @@
+"""存储后端：把列举、stat 和改名抽象为统一接口，默认为本地文件系统
+
+在 SMB/NFS/SFTP 等网络共享上，每次列举、stat、改名都是一次完整的网络往返，
+逐个同步调用时总耗时约为 调用次数 × 往返延迟。PipelinedBackend 在连接池上同时保持多个请求在途，
+用并发掩盖延迟：目录列举由遍历线程并行预取，同一目录中互不依赖的改名同时发出。
+
+后端（以及连接池中的每条连接）提供以下方法，出错时抛出 OSError：
+    list_dir(路径)            -> DirListing，无法访问时返回None
+    stat(路径)                -> os.stat_result 兼容对象
+    rename(目录, 旧名, 新名)
+    exists(目录, 名称)        -> 名称是否存在（不跟随符号链接）
+    read_header(路径, 字节数) -> 文件开头的若干字节（--verify 校验文件头）
+    close()
+LatencyConnection 为每次调用注入固定的往返延迟，是网络共享的本地替身，
+可在没有真实网络的环境中测量流水线带来的吞吐提升（见 bench --backend-latency）。
+"""
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from .planner import rename_in_dir
+from .scan import scan_dir
+from .verify import HEADER_SIZE, read_header
+
+# 网络共享默认的连接数（同时在途的请求数）
+DEFAULT_CONNECTIONS = 16
+
+
+class LocalBackend:
+    """本地文件系统（默认后端），直接调用 os 模块"""
+    # 同时在途的请求数：本地后端逐个同步调用
+    concurrency = 1
+
+    def list_dir(self, path):
+        return scan_dir(path)
+
+    def stat(self, path):
+        return os.stat(path)
+
+    def rename(self, root, old, new):
+        rename_in_dir(root, old, new)
+
+    def exists(self, root, name):
+        return os.path.lexists(os.path.join(root, name))
+
+    def read_header(self, path, size=HEADER_SIZE):
+        return read_header(path, size)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class LatencyConnection(LocalBackend):
+    """注入往返延迟的本地连接：每次调用先休眠 latency 秒，模拟高延迟的网络共享
+
+    一条连接同一时刻只处理一个请求（与 SMB/SFTP 会话上的同步调用相同），
+    吞吐只能通过同时使用多条连接提高。
+    """
+    def __init__(self, latency=0.02):
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def _round_trip(self):
+        with self._lock:
+            self.requests += 1
+            time.sleep(self.latency)
+
+    def list_dir(self, path):
+        self._round_trip()
+        return scan_dir(path)
+
+    def stat(self, path):
+        self._round_trip()
+        return os.stat(path)
+
+    def rename(self, root, old, new):
+        self._round_trip()
+        rename_in_dir(root, old, new)
+
+    def exists(self, root, name):
+        self._round_trip()
+        return os.path.lexists(os.path.join(root, name))
+
+    def read_header(self, path, size=HEADER_SIZE):
+        self._round_trip()
+        return read_header(path, size)
+
+
+class ConnectionPool:
+    """固定大小的连接池：连接按需由 factory() 创建，用完归还复用，最多同时存在 size 条
+
+    请求因连接断开（ConnectionError）失败时关闭并丢弃该连接，下一个请求重新建立；
+    其他错误（如文件不存在、目标已存在）不影响连接，连接照常归还复用。
+    """
+    def __init__(self, factory, size=DEFAULT_CONNECTIONS):
+        self.factory = factory
+        self.size = max(1, size)
+        self.created = 0
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def connection(self):
+        """借出一条连接（没有空闲连接且已达上限时等待）"""
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self.factory()
+                with self._lock:
+                    self.created += 1
+            broken = False
+            try:
+                yield conn
+            except ConnectionError:
+                broken = True
+                raise
+            finally:
+                if broken:
+                    conn.close()
+                else:
+                    self._idle.put(conn)
+
+    def close(self):
+        """关闭所有空闲连接"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+
+
+class PipelinedBackend:
+    """流水线后端：每个请求借用连接池中的一条连接，多个线程同时发出请求
+
+    concurrency 为同时在途的请求数（即连接数），引擎据此并行列举目录、按目录分片并行改名；
+    rename_many 把同一目录中互不依赖的改名同时发出，结果按提交顺序返回。
+    """
+    def __init__(self, factory=LocalBackend, connections=DEFAULT_CONNECTIONS):
+        self.pool = ConnectionPool(factory, connections)
+        self.concurrency = self.pool.size
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def list_dir(self, path):
+        with self.pool.connection() as conn:
+            return conn.list_dir(path)
+
+    def stat(self, path):
+        with self.pool.connection() as conn:
+            return conn.stat(path)
+
+    def rename(self, root, old, new):
+        with self.pool.connection() as conn:
+            conn.rename(root, old, new)
+
+    def exists(self, root, name):
+        with self.pool.connection() as conn:
+            return conn.exists(root, name)
+
+    def read_header(self, path, size=HEADER_SIZE):
+        with self.pool.connection() as conn:
+            return conn.read_header(path, size)
+
+    def _try_rename(self, root, old, new):
+        try:
+            self.rename(root, old, new)
+        except OSError as e:
+            return str(e)
+        return None
+
+    def rename_many(self, root, pairs, on_renamed=None):
+        """同时发出 [(旧名, 新名), ...] 的改名请求，返回对应的错误信息列表（成功为None）
+
+        调用方负责保证这些改名互不依赖。on_renamed(目录, 旧名, 新名) 按提交顺序在调用线程中
+        对每个成功的改名调用；在途请求数不超过连接数的两倍，超大目录也不会一次提交全部请求。
+        """
+        errors = []
+
+        def collect(error):
+            if error is None and on_renamed is not None:
+                old, new = pairs[len(errors)]
+                on_renamed(root, old, new)
+            errors.append(error)
+
+        if len(pairs) <= 1 or self.concurrency == 1:
+            for old, new in pairs:
+                collect(self._try_rename(root, old, new))
+            return errors
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.concurrency,
+                                                    thread_name_prefix='pipeline')
+        executor = self._executor
+        window = self.concurrency * 2
+        in_flight = deque()
+        for old, new in pairs:
+            in_flight.append(executor.submit(self._try_rename, root, old, new))
+            if len(in_flight) >= window:
+                collect(in_flight.popleft().result())
+        while in_flight:
+            collect(in_flight.popleft().result())
+        return errors
+
+    def close(self):
+        """等待在途请求完成并关闭所有连接"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self.pool.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
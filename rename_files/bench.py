@@ -0,0 +1,599 @@
+"""基准测试：在合成目录树上测量各模式的模拟运行与实际重命名耗时
+
+    python -m rename_files.bench --files 20000 --output bench.json
+    python -m rename_files.bench --compare bench.json
+    python -m rename_files.bench --match 500000
+    python -m rename_files.bench --files 2000 --backend-latency 5 --connections 16
+    python -m rename_files.bench --files 5000 --dedupe 3
+    python -m rename_files.bench --startup 5 --startup-budget 800 --compare startup.json
+
+结果为 JSON（含提交号、Python 版本、文件系统类型），可在不同提交之间比较。
+这里只测量耗时；结果是否正确（整批匹配、流水线后端、去重、延迟导入）由 tests/ 中的测试检查。
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from time import perf_counter
+
+from .backends import DEFAULT_CONNECTIONS, LatencyConnection, PipelinedBackend
+from .engine import MODES, RENAMED, SIMULATED, RenameEngine
+from .journal import Journal
+from .rules import BUILTIN_RULES, RuleSet, builtin_ruleset
+from .treegen import generate_tree, link_tree, synthetic_names
+
+# 测量启动耗时的子进程：与 rename_files_gui.py 相同的启动路径，首次绘制后输出 JSON 并退出
+STARTUP_SCRIPT = """\
+import sys
+from rename_files.startup import PHASE_IMPORT, StartupTimer
+startup = StartupTimer()
+from rename_files.gui import main
+startup.mark(PHASE_IMPORT)
+sys.exit(main(startup, exit_after_paint=True))
+"""
+# 单次启动的超时（秒）
+STARTUP_TIMEOUT = 60
+
+# 注入延迟的系统调用（scan/cache/executor 都通过 os 模块属性调用，可以直接替换）
+LATENCY_CALLS = ('scandir', 'stat', 'rename', 'open')
+
+
+@contextlib.contextmanager
+def inject_latency(seconds, calls=LATENCY_CALLS):
+    """模拟慢速文件系统：每次调用 calls 中的系统调用前休眠 seconds 秒"""
+    if not seconds:
+        yield
+        return
+    originals = {name: getattr(os, name) for name in calls}
+
+    def slow(func):
+        def wrapper(*args, **kwargs):
+            time.sleep(seconds)
+            return func(*args, **kwargs)
+        return wrapper
+
+    for name, func in originals.items():
+        setattr(os, name, slow(func))
+    try:
+        yield
+    finally:
+        for name, func in originals.items():
+            setattr(os, name, func)
+
+
+@contextlib.contextmanager
+def isolated_cache(base):
+    """把用户缓存目录（撤销日志、断点）重定向到 base，避免污染真实的缓存"""
+    keys = ('XDG_CACHE_HOME', 'LOCALAPPDATA')
+    saved = {key: os.environ.get(key) for key in keys}
+    for key in keys:
+        os.environ[key] = base
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_headless(directory, mode, dry_run, rename_workers=0):
+    """直接调用引擎（与命令行相同：实际重命名时写撤销日志）"""
+    journal = None if dry_run else Journal.create(directory, mode)
+    try:
+        engine = RenameEngine(directory, mode, True, dry_run,
+                              rename_workers=rename_workers, journal=journal)
+        start = perf_counter()
+        results = sum(1 for _ in engine.run())
+        seconds = perf_counter() - start
+    finally:
+        if journal is not None:
+            journal.close()
+    return {
+        'seconds': seconds,
+        'results': results,
+        'renamed': engine.renamed_count,
+        'skipped': engine.skipped_count,
+        'conflicts': engine.conflict_count,
+        'errors': engine.error_count,
+    }
+
+
+_qt_app = None
+
+
+def run_qt(directory, mode, dry_run, rename_workers=0):
+    """通过 RenameThread 运行，计时包含信号跨线程投递到界面线程的开销（offscreen 平台）"""
+    global _qt_app
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    from .gui import RenameThread
+
+    if _qt_app is None:
+        _qt_app = QApplication.instance() or QApplication([])
+    counts = {'log_lines': 0, 'progress': 0, 'renamed': 0, 'skipped': 0}
+
+    def on_log(lines):
+        counts['log_lines'] += len(lines)
+
+    def on_progress(snapshot):
+        counts['progress'] += 1
+
+    def on_finished(renamed, skipped):
+        counts['renamed'] = renamed
+        counts['skipped'] = skipped
+
+    thread = RenameThread(directory, mode, True, dry_run, rename_workers=rename_workers)
+    thread.log_signal.connect(on_log)
+    thread.progress_signal.connect(on_progress)
+    thread.finished_signal.connect(on_finished)
+    thread.finished.connect(_qt_app.quit)
+    start = perf_counter()
+    thread.start()
+    _qt_app.exec_()
+    thread.wait()
+    # 处理线程结束前发出、尚未投递的信号
+    _qt_app.processEvents()
+    counts['seconds'] = perf_counter() - start
+    return counts
+
+
+RUNNERS = {'headless': run_headless, 'qt': run_qt}
+
+
+def fs_type(path):
+    """path 所在文件系统的类型（仅 Linux，读取 /proc/mounts），未知时返回None"""
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8') as f:
+            mounts = [line.split()[:3] for line in f]
+    except OSError:
+        return None
+    path = os.path.realpath(path)
+    best = None
+    for fields in mounts:
+        if len(fields) < 3:
+            continue
+        mount_point = fields[1].replace('\\040', ' ')
+        if path == mount_point or path.startswith(mount_point.rstrip('/') + '/'):
+            if best is None or len(mount_point) > len(best[0]):
+                best = (mount_point, fields[2])
+    return best[1] if best else None
+
+
+def git_commit():
+    """当前代码的提交号，不在 git 仓库中时返回None"""
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        output = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repo,
+                                capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return output.stdout.strip() or None
+
+
+def _summarize(samples):
+    times = [sample['seconds'] for sample in samples]
+    record = dict(samples[-1])
+    record.pop('seconds')
+    record['seconds_min'] = round(min(times), 4)
+    record['seconds_median'] = round(statistics.median(times), 4)
+    record['samples'] = [round(t, 4) for t in times]
+    return record
+
+
+def run_benchmarks(args, base, log=None):
+    """按 模式 × (模拟/实际) × (headless/qt) 运行基准测试，返回结果列表"""
+    tree_options = dict(depth=args.depth, fanout=args.fanout, files=args.files,
+                        rar_ratio=args.rar_ratio, rev_ratio=args.rev_ratio,
+                        volumes=args.volumes, seed=args.seed)
+    # 模拟运行不修改文件，所有模拟运行共用一棵树；实际重命名每次都生成新树
+    shared_tree = os.path.join(base, 'shared')
+    tree_info = generate_tree(shared_tree, **tree_options)
+    serial = 0
+    results = []
+    for mode in args.modes:
+        for kind in args.runs:
+            dry_run = kind == 'dry'
+            for path in args.paths:
+                runner = RUNNERS[path]
+                key = {'mode': mode, 'dry_run': dry_run, 'path': path}
+                samples = []
+                try:
+                    for _ in range(args.repeat):
+                        if dry_run:
+                            directory = shared_tree
+                        else:
+                            serial += 1
+                            directory = os.path.join(base, f'run{serial}')
+                            generate_tree(directory, **tree_options)
+                        with inject_latency(args.latency / 1000.0):
+                            samples.append(runner(directory, mode, dry_run, args.rename_workers))
+                        if not dry_run:
+                            shutil.rmtree(directory, ignore_errors=True)
+                except ImportError as e:
+                    record = dict(key, skipped=f"PyQt5 不可用: {e}")
+                else:
+                    record = dict(key, **_summarize(samples))
+                    record['files_per_sec'] = round(tree_info['files'] / max(record['seconds_median'], 1e-9), 1)
+                results.append(record)
+                if log is not None:
+                    log(record)
+    return tree_info, results
+
+
+def compare(results, baseline, threshold):
+    """与基线结果比较中位耗时，返回 (比较结果列表, 是否有退化)"""
+    def key(record):
+        return (record['mode'], record['dry_run'], record['path'])
+
+    old = {key(record): record for record in baseline.get('results', [])
+           if 'seconds_median' in record}
+    rows = []
+    regressed = False
+    for record in results:
+        before = old.get(key(record))
+        if before is None or 'seconds_median' not in record:
+            continue
+        ratio = record['seconds_median'] / max(before['seconds_median'], 1e-9)
+        slower = ratio > threshold
+        regressed = regressed or slower
+        rows.append({'mode': record['mode'], 'dry_run': record['dry_run'],
+                     'path': record['path'], 'baseline': before['seconds_median'],
+                     'current': record['seconds_median'], 'ratio': round(ratio, 3),
+                     'regressed': slower})
+    return rows, regressed
+
+
+def time_matching(count, seed=0):
+    """比较整批匹配与逐个匹配的耗时
+
+    分别测量分卷占多数和只占2%的目录，以及含换行符文件名（退回逐个匹配）的目录。
+    """
+    listings = []
+    for ratio in (0.6, 0.02):
+        names = synthetic_names(count, seed, ratio)
+        listings.append(('dense' if ratio > 0.5 else 'sparse', False,
+                         [name for name in names if '\n' not in name]))
+        listings.append(('dense' if ratio > 0.5 else 'sparse', True, names))
+    rulesets = [builtin_ruleset(mode) for mode in sorted(BUILTIN_RULES)]
+    rulesets.append(RuleSet([BUILTIN_RULES['rev-to-rar'], BUILTIN_RULES['to-dot']]))
+    rows = []
+    for ruleset in rulesets:
+        for kind, fallback, listing in listings:
+            start = perf_counter()
+            ruleset._match_each(listing)
+            each_seconds = perf_counter() - start
+            start = perf_counter()
+            actual = ruleset.match_batch(listing)
+            batch_seconds = perf_counter() - start
+            rows.append({
+                'rules': ruleset.name,
+                'listing': kind,
+                'files': len(listing),
+                'fallback': fallback,
+                'matches': len(actual),
+                'each_seconds': round(each_seconds, 4),
+                'batch_seconds': round(batch_seconds, 4),
+            })
+    return rows
+
+
+def run_backend(directory, mode, dry_run, latency, connections):
+    """通过注入往返延迟的流水线后端运行引擎，统计请求数和实际建立的连接数"""
+    opened = []
+
+    def connect():
+        conn = LatencyConnection(latency)
+        opened.append(conn)
+        return conn
+
+    with PipelinedBackend(connect, connections) as backend:
+        engine = RenameEngine(directory, mode, True, dry_run, backend=backend)
+        start = perf_counter()
+        results = sum(1 for _ in engine.run())
+        seconds = perf_counter() - start
+    return {
+        'seconds': seconds,
+        'results': results,
+        'requests': sum(conn.requests for conn in opened),
+        'connections_opened': len(opened),
+        'renamed': engine.renamed_count,
+        'skipped': engine.skipped_count,
+        'conflicts': engine.conflict_count,
+        'errors': engine.error_count,
+    }
+
+
+def compare_backends(args, base, log=None):
+    """高延迟链路上逐个请求（1条连接）与流水线（--connections 条连接）的吞吐对比
+
+    每次运行使用新生成的同一棵树。
+    """
+    latency = args.backend_latency / 1000.0
+    tree_options = dict(depth=args.depth, fanout=args.fanout, files=args.files,
+                        rar_ratio=args.rar_ratio, rev_ratio=args.rev_ratio,
+                        volumes=args.volumes, seed=args.seed)
+    serial = 0
+    tree_info = None
+    results = []
+    for mode in args.modes:
+        for kind in args.runs:
+            dry_run = kind == 'dry'
+            baseline = None
+            for connections in (1, args.connections):
+                serial += 1
+                directory = os.path.join(base, f'backend{serial}')
+                tree_info = generate_tree(directory, **tree_options)
+                sample = run_backend(directory, mode, dry_run, latency, connections)
+                record = {'mode': mode, 'dry_run': dry_run, 'connections': connections}
+                record.update(sample)
+                record['seconds'] = round(sample['seconds'], 4)
+                record['files_per_sec'] = round(tree_info['files'] / max(sample['seconds'], 1e-9), 1)
+                if baseline is None:
+                    baseline = sample['seconds']
+                else:
+                    record['speedup'] = round(baseline / max(sample['seconds'], 1e-9), 2)
+                shutil.rmtree(directory, ignore_errors=True)
+                results.append(record)
+                if log is not None:
+                    log(record)
+    return tree_info, results
+
+
+def run_startup(env):
+    """在新进程中启动一次图形界面，返回启动耗时记录（process_ms 为含解释器启动和退出的进程总耗时）"""
+    start = perf_counter()
+    proc = subprocess.run([sys.executable, '-c', STARTUP_SCRIPT], env=env, capture_output=True,
+                          text=True, timeout=STARTUP_TIMEOUT)
+    process_ms = (perf_counter() - start) * 1000
+    if "No module named 'PyQt5'" in proc.stderr:
+        raise ImportError(proc.stderr.strip().splitlines()[-1])
+    lines = [line for line in proc.stdout.splitlines() if line.startswith('{')]
+    if proc.returncode != 0 or not lines:
+        raise RuntimeError(f"图形界面启动失败（退出码 {proc.returncode}）: {proc.stderr.strip()[-500:]}")
+    record = json.loads(lines[-1])
+    record['process_ms'] = round(process_ms, 1)
+    return record
+
+
+def measure_startup(repeat):
+    """重复启动图形界面（Qt offscreen 平台），汇总到首次绘制的耗时"""
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    package_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (package_root, env.get('PYTHONPATH'))))
+    try:
+        samples = [run_startup(env) for _ in range(max(1, repeat))]
+    except ImportError as e:
+        return {'skipped': f"PyQt5 不可用: {e}"}
+    totals = [sample['total_ms'] for sample in samples]
+    return {
+        'total_ms_median': round(statistics.median(totals), 1),
+        'total_ms_min': min(totals),
+        'process_ms_median': round(statistics.median(sample['process_ms'] for sample in samples), 1),
+        'phases_ms': {name: round(statistics.median(sample['phases'].get(name, 0) for sample in samples), 1)
+                      for name in samples[0]['phases']},
+        'modules': samples[0]['modules'],
+        'samples': totals,
+    }
+
+
+def check_startup(record, baseline, threshold, budget):
+    """启动耗时的退化检查：超过预算或比基线慢 threshold 倍
+
+    返回 (检查结果, 是否有退化)；未测量（PyQt5 不可用）时不算退化。
+    """
+    if 'skipped' in record:
+        return None, False
+    check = {}
+    regressed = False
+    if budget is not None:
+        check['budget_ms'] = budget
+        check['over_budget'] = regressed = record['total_ms_median'] > budget
+    before = (baseline or {}).get('startup', {}).get('total_ms_median')
+    if before:
+        ratio = record['total_ms_median'] / max(before, 1e-9)
+        check['baseline_ms'] = before
+        check['ratio'] = round(ratio, 3)
+        regressed = regressed or ratio > threshold
+    check['regressed'] = regressed
+    return check, regressed
+
+
+def write_report(report, output):
+    """输出结果JSON（写入文件或标准输出）"""
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+
+def run_dedupe(directory, mode, dry_run, dedupe):
+    """运行引擎，统计模拟/实际改名数和去重计数"""
+    engine = RenameEngine(directory, mode, True, dry_run, dedupe=dedupe)
+    start = perf_counter()
+    changed = sum(1 for result in engine.run() if result.status in (RENAMED, SIMULATED))
+    seconds = perf_counter() - start
+    return {'seconds': round(seconds, 4), 'changed': changed, 'errors': engine.error_count,
+            'dirs_scanned': engine.dirs_scanned, 'files_deduped': engine.files_deduped}
+
+
+def compare_dedupe(args, base, log=None):
+    """在原始树加 COPIES 份硬链接副本上比较不去重与去重（RenameEngine(dedupe=True)）的耗时
+
+    work_avoided 为去重后少做的改名数。
+    """
+    tree_options = dict(depth=args.depth, fanout=args.fanout, files=args.files,
+                        rar_ratio=args.rar_ratio, rev_ratio=args.rev_ratio,
+                        volumes=args.volumes, seed=args.seed)
+    serial = 0
+    tree_info = None
+    results = []
+    for mode in args.modes:
+        for kind in args.runs:
+            dry_run = kind == 'dry'
+            record = {'mode': mode, 'dry_run': dry_run, 'copies': args.dedupe}
+            for label, dedupe in (('unique', False), ('all_paths', False), ('dedupe', True)):
+                serial += 1
+                directory = os.path.join(base, f'dedupe{serial}')
+                original = os.path.join(directory, 'copy0')
+                tree_info = generate_tree(original, **tree_options)
+                if label != 'unique':
+                    for copy in range(1, args.dedupe + 1):
+                        link_tree(original, os.path.join(directory, f'copy{copy}'))
+                record[label] = run_dedupe(original if label == 'unique' else directory,
+                                           mode, dry_run, dedupe)
+                shutil.rmtree(directory, ignore_errors=True)
+            record['work_avoided'] = record['all_paths']['changed'] - record['dedupe']['changed']
+            results.append(record)
+            if log is not None:
+                log(record)
+    return tree_info, results
+
+
+def _csv(choices):
+    def parse(text):
+        values = [value.strip() for value in text.split(',') if value.strip()]
+        for value in values:
+            if value not in choices:
+                raise argparse.ArgumentTypeError(f"无效的取值: {value}（可选: {', '.join(choices)}）")
+        return values
+    return parse
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m rename_files.bench',
+                                     description='在合成目录树上测量重命名性能')
+    parser.add_argument('--depth', type=int, default=2, help='目录深度（默认2）')
+    parser.add_argument('--fanout', type=int, default=4, help='每个目录的子目录数（默认4）')
+    parser.add_argument('--files', type=int, default=10000, help='文件总数（默认10000）')
+    parser.add_argument('--rar-ratio', type=float, default=0.4, help='-partNN.rar 文件比例')
+    parser.add_argument('--rev-ratio', type=float, default=0.4, help='.partNN.rev 文件比例')
+    parser.add_argument('--volumes', type=int, default=5, help='每组分卷的文件数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    parser.add_argument('--modes', type=_csv(sorted(MODES)), default=sorted(MODES),
+                        help='逗号分隔的模式列表（默认全部）')
+    parser.add_argument('--runs', type=_csv(['dry', 'real']), default=['dry', 'real'],
+                        help='dry=模拟运行，real=实际重命名（默认两者）')
+    parser.add_argument('--paths', type=_csv(sorted(RUNNERS)), default=['headless', 'qt'],
+                        help='headless=直接调用引擎，qt=通过 RenameThread 信号（默认两者）')
+    parser.add_argument('--repeat', type=int, default=3, help='每项重复次数（默认3，报告最小值和中位数）')
+    parser.add_argument('--rename-workers', type=int, default=0, help='并行执行重命名的线程数')
+    parser.add_argument('--dir', help='生成测试树的位置（默认系统临时目录）')
+    parser.add_argument('--tmpfs', action='store_true', help='在 /dev/shm（tmpfs）上运行')
+    parser.add_argument('--latency', type=float, default=0, metavar='MS',
+                        help=f"模拟慢速文件系统：每次 {'/'.join(LATENCY_CALLS)} 调用增加的延迟（毫秒）")
+    parser.add_argument('--output', metavar='FILE', help='把结果JSON写入文件（默认输出到标准输出）')
+    parser.add_argument('--compare', metavar='BASELINE', help='与之前保存的结果JSON比较')
+    parser.add_argument('--threshold', type=float, default=1.2,
+                        help='中位耗时超过基线的倍数时视为退化（默认1.2），有退化时退出码为1')
+    parser.add_argument('--match', type=int, metavar='N',
+                        help='只测量匹配：N 个文件名的单个目录，比较整批匹配与逐个匹配的耗时')
+    parser.add_argument('--backend-latency', type=float, metavar='MS',
+                        help='只比较存储后端：在每个请求注入 MS 毫秒往返延迟的后端上，'
+                             '比较单连接逐个请求与多连接流水线的吞吐')
+    parser.add_argument('--connections', type=int, default=DEFAULT_CONNECTIONS,
+                        help=f'流水线后端的连接数（默认{DEFAULT_CONNECTIONS}）')
+    parser.add_argument('--dedupe', type=int, metavar='COPIES',
+                        help='只比较去重：在原始树加 COPIES 份硬链接副本上比较不去重与去重的耗时和改名数')
+    parser.add_argument('--startup', type=int, metavar='N',
+                        help='只测量图形界面启动耗时：在新进程中（Qt offscreen 平台）启动 N 次，报告到首次绘制的中位耗时；'
+                             '超过 --startup-budget 或比 --compare 基线慢 --threshold 倍时退出码为1')
+    parser.add_argument('--startup-budget', type=float, metavar='MS',
+                        help='启动耗时预算（毫秒），中位耗时超过时退出码为1')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.match is not None:
+        rows = time_matching(args.match, args.seed)
+        print(json.dumps({'match': rows}, ensure_ascii=False, indent=2))
+        return 0
+    if args.startup is not None:
+        record = measure_startup(args.startup)
+        baseline = None
+        if args.compare:
+            with open(args.compare, 'r', encoding='utf-8') as f:
+                baseline = json.load(f)
+        check, regressed = check_startup(record, baseline, args.threshold, args.startup_budget)
+        report = {'meta': {'commit': git_commit(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                           'python': platform.python_version(), 'platform': platform.platform(),
+                           'repeat': args.startup},
+                  'startup': record}
+        if check is not None:
+            report['check'] = check
+        write_report(report, args.output)
+        return 1 if regressed else 0
+    parent = '/dev/shm' if args.tmpfs else args.dir
+    base = tempfile.mkdtemp(prefix='rename_files-bench-', dir=parent)
+
+    def log(record):
+        print(json.dumps(record, ensure_ascii=False), file=sys.stderr)
+
+    if args.dedupe is not None:
+        try:
+            with isolated_cache(os.path.join(base, 'cache')):
+                tree_info, results = compare_dedupe(args, base, log)
+        finally:
+            shutil.rmtree(base, ignore_errors=True)
+        print(json.dumps({'meta': {'commit': git_commit(), 'copies': args.dedupe, 'tree': tree_info},
+                          'results': results}, ensure_ascii=False, indent=2))
+        return 0
+
+    if args.backend_latency is not None:
+        try:
+            with isolated_cache(os.path.join(base, 'cache')):
+                tree_info, results = compare_backends(args, base, log)
+        finally:
+            shutil.rmtree(base, ignore_errors=True)
+        print(json.dumps({'meta': {'commit': git_commit(), 'backend_latency_ms': args.backend_latency,
+                                   'connections': args.connections, 'tree': tree_info},
+                          'results': results}, ensure_ascii=False, indent=2))
+        return 0
+
+    try:
+        with isolated_cache(os.path.join(base, 'cache')):
+            tree_info, results = run_benchmarks(args, base, log)
+        report = {
+            'meta': {
+                'commit': git_commit(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'fs_type': fs_type(base),
+                'latency_ms': args.latency,
+                'repeat': args.repeat,
+                'rename_workers': args.rename_workers,
+                'tree': tree_info,
+            },
+            'results': results,
+        }
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+    exit_code = 0
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows, regressed = compare(results, baseline, args.threshold)
+        report['compare'] = {'baseline': baseline.get('meta', {}).get('commit'), 'rows': rows}
+        if regressed:
+            exit_code = 1
+
+    write_report(report, args.output)
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,152 @@
+"""目录状态缓存：记录未发生变化且无需重命名的目录，增量运行时直接跳过"""
+import hashlib
+import os
+import sqlite3
+import sys
+import threading
+
+from .scan import DirListing, scan_dir
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    path TEXT PRIMARY KEY,
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    skipped INTEGER NOT NULL,
+    subdirs TEXT NOT NULL
+)
+"""
+
+
+def default_cache_dir():
+    """默认缓存目录（Windows 为 %LOCALAPPDATA%，其余系统遵循 XDG 规范）"""
+    if sys.platform == 'win32' and os.environ.get('LOCALAPPDATA'):
+        base = os.environ['LOCALAPPDATA']
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'rename_files')
+
+
+def run_key(directory, ruleset, extra=None):
+    """目标目录 + 规则链（+ 其他影响结果的条件）的短哈希，用作缓存、断点等文件名"""
+    digest = hashlib.sha1()
+    digest.update(os.path.abspath(directory).encode('utf-8', 'surrogateescape'))
+    digest.update(b'\0')
+    digest.update(ruleset.key().encode('utf-8'))
+    if extra:
+        digest.update(b'\0')
+        digest.update(extra.encode('utf-8', 'surrogateescape'))
+    return digest.hexdigest()[:20]
+
+
+def cache_path_for(directory, ruleset, cache_dir=None, extra=None):
+    """根据目标目录和规则链计算缓存文件路径，规则或过滤条件变化时自动使用新缓存"""
+    return os.path.join(cache_dir or default_cache_dir(),
+                        run_key(directory, ruleset, extra) + '.sqlite')
+
+
+class DirCache:
+    """基于 SQLite 的目录缓存
+
+    只缓存“所有文件都被跳过”的目录：目录的 mtime/inode 未变化时，
+    其中的文件名也不会变化，下次运行无需重新列举和匹配。
+    子目录名同样被缓存，因此未变化的目录连 scandir 都可以省去。
+    preload 为False时不把整表读入内存，每个目录单独查询（限制内存模式）。
+    backend 为存储后端（backends 模块），为None时直接访问本地文件系统。
+    """
+    def __init__(self, path, full_rescan=False, top='', preload=True, backend=None):
+        self.path = path
+        self._stat = backend.stat if backend is not None else os.stat
+        self._list_dir = backend.list_dir if backend is not None else scan_dir
+        self.full_rescan = full_rescan
+        self.preload = preload
+        self._lock = threading.Lock()
+        # 记录相对于遍历起点的路径，绝对/相对路径参数共用同一份缓存
+        self.prefix_len = len(top)
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute(_SCHEMA)
+        # 整表读入内存，并行扫描线程只读字典，不直接访问数据库
+        if full_rescan:
+            with self.conn:
+                self.conn.execute("DELETE FROM dirs")
+            self.entries = {}
+        elif preload:
+            self.entries = {row[0]: row[1:] for row in self.conn.execute(
+                "SELECT path, dev, ino, mtime_ns, skipped, subdirs FROM dirs")}
+        else:
+            self.entries = None
+        self.pending = {}
+        self.clean = []
+        self.dirty = []
+
+    @classmethod
+    def for_run(cls, directory, ruleset, cache_dir=None, full_rescan=False, preload=True,
+                extra=None, backend=None):
+        """为一次运行打开对应的缓存（extra 为过滤条件等影响结果的附加标识）"""
+        return cls(cache_path_for(directory, ruleset, cache_dir, extra), full_rescan, directory,
+                   preload, backend)
+
+    def _lookup(self, rel_path):
+        """查找目录的缓存记录 (dev, ino, mtime_ns, skipped, subdirs)，没有时返回None"""
+        if self.entries is not None:
+            return self.entries.get(rel_path)
+        with self._lock:
+            return self.conn.execute(
+                "SELECT dev, ino, mtime_ns, skipped, subdirs FROM dirs WHERE path = ?",
+                (rel_path,)).fetchone()
+
+    def scan(self, path):
+        """列举目录；目录未变化时返回缓存结果（cached_skipped 不为None）"""
+        try:
+            st = self._stat(path)
+        except OSError:
+            return None
+        entry = self._lookup(path[self.prefix_len:])
+        if entry is not None and entry[:3] == (st.st_dev, st.st_ino, st.st_mtime_ns):
+            subdirs = entry[4].split('\n') if entry[4] else []
+            return DirListing(path, [], subdirs, entry[3])
+        listing = self._list_dir(path)
+        if listing is not None:
+            # 先 stat 后列举：若列举期间目录发生变化，下次运行 mtime 不同会重新扫描
+            self.pending[path] = (st.st_dev, st.st_ino, st.st_mtime_ns)
+        return listing
+
+    def record(self, listing, clean, skipped=None):
+        """记录目录的处理结果，clean 表示目录中没有需要重命名的文件
+
+        skipped 为该目录中被跳过的文件数，默认为全部文件（设置了文件过滤时只计通过过滤的文件）。
+        """
+        key = self.pending.pop(listing.path, None)
+        if key is None:
+            return
+        rel_path = listing.path[self.prefix_len:]
+        if clean:
+            if skipped is None:
+                skipped = len(listing.files)
+            self.clean.append((rel_path,) + key + (skipped, '\n'.join(listing.dirs)))
+        elif self.entries is None or rel_path in self.entries:
+            # 不预加载时无法确定是否有旧记录，直接删除（不存在时无影响）
+            self.dirty.append((rel_path,))
+        if len(self.clean) + len(self.dirty) >= 10000:
+            self.flush()
+
+    def flush(self):
+        """批量写入数据库"""
+        with self._lock, self.conn:
+            if self.clean:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO dirs (path, dev, ino, mtime_ns, skipped, subdirs) "
+                    "VALUES (?, ?, ?, ?, ?, ?)", self.clean)
+            if self.dirty:
+                self.conn.executemany("DELETE FROM dirs WHERE path = ?", self.dirty)
+        self.clean = []
+        self.dirty = []
+
+    def close(self):
+        """写入剩余记录并关闭数据库"""
+        if self.conn is not None:
+            self.flush()
+            self.conn.close()
+            self.conn = None
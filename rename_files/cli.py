@@ -0,0 +1,340 @@
+"""命令行入口：以JSON Lines格式流式输出重命名结果，不导入PyQt5"""
+import argparse
+import json
+import os
+import signal
+import sys
+
+from .control import Checkpoint, RunControl
+from .engine import MODES, SKIPPED, RenameEngine, UndoRun
+from .filters import ScanFilter, parse_size
+from .journal import Journal, latest_journal
+from .metrics import PROFILE_MODES, RunMetrics, write_prometheus_textfile
+from .rules import load_rules, resolve_ruleset
+
+# 监视模式不支持的选项 (选项, 参数名)：目录缓存会跳过列举（目录不会被加入监视），
+# 并行扫描、分卷组、去重和网络流水线只作用于完整处理，监视期间的批处理不使用；
+# 监视模式没有断点和内存上限，也不输出进度和剖析结果。取值与默认值不同即视为指定
+WATCH_UNSUPPORTED = (('--workers', 'workers'), ('--rename-workers', 'rename_workers'),
+                     ('--cache', 'cache'), ('--full-rescan', 'full_rescan'),
+                     ('--cache-dir', 'cache_dir'),
+                     ('--volume-sets', 'volume_sets'), ('--dedupe', 'dedupe'),
+                     ('--connections', 'connections'),
+                     ('--bounded-memory', 'bounded_memory'), ('--memory-limit', 'memory_limit'),
+                     ('--resume', 'resume'), ('--checkpoint-interval', 'checkpoint_interval'),
+                     ('--no-checkpoint', 'no_checkpoint'),
+                     ('--progress-interval', 'progress_interval'),
+                     ('--prometheus-textfile', 'prometheus_textfile'),
+                     ('--profile', 'profile'), ('--profile-dir', 'profile_dir'))
+
+
+def build_parser():
+    """创建命令行参数解析器"""
+    parser = argparse.ArgumentParser(
+        prog='python -m rename_files',
+        description='分卷压缩包文件重命名工具（命令行模式，结果以JSON Lines输出）')
+    parser.add_argument('directory', nargs='?', help='要处理的目录')
+    parser.add_argument('-m', '--mode', choices=sorted(MODES), default='to-dot',
+                        help='重命名模式（默认: to-dot）')
+    parser.add_argument('--rules', metavar='FILE', help='从JSON配置文件加载规则链（代替 --mode）')
+    parser.add_argument('-r', '--recursive', action='store_true', help='递归处理子目录')
+    parser.add_argument('-n', '--dry-run', action='store_true', help='模拟运行，不实际修改文件')
+    parser.add_argument('--max-depth', type=int, default=None, help='最大递归深度（0表示仅顶层目录）')
+    filters = parser.add_argument_group(
+        '过滤', '模式默认为通配符，以 "re:" 开头时为正则表达式；各选项可重复指定')
+    filters.add_argument('--exclude-dir', action='append', default=[], metavar='PATTERN',
+                         help='不进入名称匹配的子目录（如 .git、node_modules），其中的内容不会被列举')
+    filters.add_argument('--include-dir', action='append', default=[], metavar='PATTERN',
+                         help='只进入名称匹配的子目录')
+    filters.add_argument('--exclude', action='append', default=[], metavar='PATTERN',
+                         help='忽略名称匹配的文件')
+    filters.add_argument('--include', action='append', default=[], metavar='PATTERN',
+                         help='只处理名称匹配的文件')
+    filters.add_argument('--ext', action='append', default=[], metavar='EXT[,EXT...]',
+                         help='只处理指定扩展名的文件（如 rar,rev）')
+    filters.add_argument('--min-size', type=_size, metavar='SIZE', help='只处理不小于 SIZE 的文件（如 1M）')
+    filters.add_argument('--max-size', type=_size, metavar='SIZE', help='只处理不大于 SIZE 的文件')
+    parser.add_argument('-j', '--workers', type=int, default=0, help='并行扫描子目录的线程数')
+    parser.add_argument('--rename-workers', type=int, default=0,
+                        help='并行执行重命名的线程数（按目录分片，同一目录内保持顺序）')
+    parser.add_argument('--connections', type=int, default=0, metavar='N',
+                        help='网络共享流水线：通过 N 条连接同时发出列举和改名请求，掩盖 SMB/NFS 挂载点的往返延迟'
+                             '（默认0，直接访问本地文件系统）')
+    parser.add_argument('--volume-sets', action='store_true',
+                        help='按分卷组整体改名：编号不完整的组跳过，组内任一分卷失败则整组回滚')
+    parser.add_argument('--verify', action='store_true',
+                        help='改名前读取文件头，跳过不是真正 RAR/REV 分卷的文件（结果按 inode/mtime/大小缓存）')
+    parser.add_argument('--verify-workers', type=int, default=8, metavar='N',
+                        help='并行读取文件头的线程数（默认8）')
+    parser.add_argument('--dedupe', action='store_true',
+                        help='按 (设备, inode) 去重：硬链接、绑定挂载的重复目录不再列举，多个硬链接的文件只改名一次')
+    parser.add_argument('--cache', action='store_true',
+                        help='使用目录缓存，跳过上次运行后未变化且无需重命名的目录')
+    parser.add_argument('--full-rescan', action='store_true', help='忽略已有缓存，强制完全重新扫描')
+    parser.add_argument('--cache-dir', help='缓存文件目录（默认使用用户缓存目录）')
+    parser.add_argument('--bounded-memory', action='store_true',
+                        help='限制内存模式：目录缓存按需查询，不整表读入内存')
+    parser.add_argument('--memory-limit', type=float, default=None, metavar='MB',
+                        help='常驻内存上限（MB），超出时在目录边界停止并保存断点，可用 --resume 继续')
+    parser.add_argument('--resume', action='store_true', help='从上次中断的断点继续运行')
+    parser.add_argument('--checkpoint-interval', type=float, default=30.0, metavar='SECONDS',
+                        help='断点保存间隔（秒，默认30）')
+    parser.add_argument('--no-checkpoint', action='store_true', help='不保存断点')
+    parser.add_argument('--progress-interval', type=float, default=0, metavar='SECONDS',
+                        help='每隔指定秒数向标准错误输出一行进度JSON（默认不输出）')
+    parser.add_argument('--prometheus-textfile', metavar='FILE',
+                        help='按进度间隔把指标写入 Prometheus textfile（默认间隔10秒）')
+    parser.add_argument('--profile', nargs='?', const=PROFILE_MODES[0], choices=PROFILE_MODES,
+                        help='性能剖析：记录各阶段耗时并写出 Chrome trace；cprofile/sample 另外使用 cProfile '
+                             '或采样剖析器（speedscope 格式），结束时输出一行 "event": "profile" 的热点摘要')
+    parser.add_argument('--profile-dir', metavar='DIR', help='剖析结果目录（默认位于用户缓存目录）')
+    parser.add_argument('--no-journal', action='store_true', help='不写撤销日志')
+    parser.add_argument('--journal-dir', help='撤销日志目录（默认位于用户缓存目录）')
+    parser.add_argument('--undo', nargs='?', const='last', metavar='JOURNAL',
+                        help='撤销上次运行（或指定的撤销日志文件）')
+    parser.add_argument('--watch', action='store_true',
+                        help='监视模式：处理一遍后持续处理新建或移入的文件，按 Ctrl+C 结束')
+    parser.add_argument('--debounce', type=float, default=1.0, metavar='SECONDS',
+                        help='监视模式下事件静止多少秒后作为一批处理（默认1）')
+    parser.add_argument('--poll', action='store_true', help='监视模式下不使用 inotify，改为定期检查目录')
+    parser.add_argument('--poll-interval', type=float, default=2.0, metavar='SECONDS',
+                        help='轮询间隔（秒，默认2）')
+    parser.add_argument('--show-skipped', action='store_true', help='同时输出未修改的文件')
+    parser.add_argument('--gui', action='store_true', help='启动图形界面')
+    parser.add_argument('--startup-time', action='store_true',
+                        help='启动图形界面，窗口首次绘制后输出启动耗时 JSON 并退出')
+    return parser
+
+
+def _size(text):
+    try:
+        return parse_size(text)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def build_filter(parser, args):
+    """根据命令行参数创建 ScanFilter，没有任何过滤条件时返回None"""
+    extensions = [ext for value in args.ext for ext in value.split(',')]
+    try:
+        scan_filter = ScanFilter(args.include, args.exclude, args.include_dir, args.exclude_dir,
+                                 extensions, args.min_size, args.max_size)
+    except ValueError as e:
+        parser.error(str(e))
+    return scan_filter if scan_filter else None
+
+
+def write_json(out, record):
+    """输出一行JSON"""
+    out.write(json.dumps(record, ensure_ascii=False))
+    out.write('\n')
+
+
+def main(argv=None, out=None):
+    """命令行主函数，返回进程退出码"""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    if args.gui or args.startup_time:
+        # 仅在显式请求时才加载图形界面
+        from .startup import PHASE_IMPORT, StartupTimer
+        startup = StartupTimer()
+        from .gui import main as gui_main
+        startup.mark(PHASE_IMPORT)
+        return gui_main(startup, exit_after_paint=args.startup_time)
+
+    out = out or sys.stdout
+    if args.undo:
+        return run_undo(parser, args, out)
+
+    if args.directory is None:
+        parser.error('缺少目录参数')
+    if not os.path.isdir(args.directory):
+        parser.error(f'指定的目录不存在: {args.directory}')
+
+    mode = args.mode
+    if args.rules:
+        try:
+            mode = load_rules(args.rules)
+        except (OSError, ValueError) as e:
+            parser.error(f'无法加载规则文件 {args.rules}: {e}')
+
+    scan_filter = build_filter(parser, args)
+    if args.watch:
+        unsupported = [option for option, name in WATCH_UNSUPPORTED
+                       if getattr(args, name) != parser.get_default(name)]
+        if unsupported:
+            parser.error(f"监视模式不支持以下选项: {', '.join(unsupported)}")
+        return run_watch(args, out, mode, scan_filter)
+
+    checkpoint = None
+    if not args.no_checkpoint:
+        checkpoint = Checkpoint.for_run(args.directory, resolve_ruleset(mode),
+                                        interval=args.checkpoint_interval)
+    journal = None
+    if not args.dry_run and not args.no_journal:
+        journal = Journal.create(args.directory, engine_mode_name(mode), args.journal_dir)
+    control = RunControl()
+    profiler = None
+    if args.profile:
+        from .profiling import Profiler
+        profiler = Profiler(args.profile, args.profile_dir)
+    metrics, on_progress = progress_reporter(args, engine_mode_name(mode),
+                                             profiler.tracer if profiler is not None else None)
+    backend = None
+    if args.connections > 0:
+        from .backends import PipelinedBackend
+        backend = PipelinedBackend(connections=args.connections)
+    engine = RenameEngine(args.directory, mode, args.recursive, args.dry_run,
+                          max_depth=args.max_depth, workers=args.workers,
+                          use_cache=args.cache or args.full_rescan, full_rescan=args.full_rescan,
+                          cache_dir=args.cache_dir, report_skipped=args.show_skipped,
+                          rename_workers=args.rename_workers, journal=journal,
+                          control=control, checkpoint=checkpoint, resume=args.resume,
+                          metrics=metrics, on_progress=on_progress,
+                          volume_sets=args.volume_sets, bounded_memory=args.bounded_memory,
+                          memory_limit=args.memory_limit, scan_filter=scan_filter,
+                          verify=args.verify, verify_workers=args.verify_workers,
+                          backend=backend, dedupe=args.dedupe)
+    previous_handler = install_cancel_handler(control)
+    if profiler is not None:
+        profiler.start()
+    try:
+        status = write_results(out, engine.run(), args.show_skipped)
+    finally:
+        if profiler is not None:
+            profiler.stop()
+        signal.signal(signal.SIGINT, previous_handler)
+        if journal is not None:
+            journal.close()
+        if backend is not None:
+            backend.close()
+    if status is not None:
+        return status
+
+    if profiler is not None:
+        profiler.write(engine_mode_name(mode))
+        write_json(out, dict({'event': 'profile'}, **profiler.summary()))
+
+    write_json(out, dict({'event': 'summary'}, **engine.summary(),
+                         journal=journal.path if journal is not None and journal.count else None))
+    if engine.cancelled:
+        return 130
+    return 1 if engine.error_count else 0
+
+
+def progress_reporter(args, mode_name, tracer=None):
+    """根据命令行参数创建 (RunMetrics, on_progress)，未启用进度输出时 on_progress 为None"""
+    interval = args.progress_interval
+    if args.prometheus_textfile and interval <= 0:
+        interval = 10.0
+    metrics = RunMetrics(interval, tracer)
+    if interval <= 0:
+        return metrics, None
+
+    def on_progress(snapshot):
+        if args.progress_interval > 0:
+            write_json(sys.stderr, dict({'event': 'progress'}, **snapshot))
+            sys.stderr.flush()
+        if args.prometheus_textfile:
+            write_prometheus_textfile(args.prometheus_textfile, snapshot, {'mode': mode_name})
+    return metrics, on_progress
+
+
+def install_cancel_handler(control):
+    """第一次 Ctrl+C 协作式取消（保存断点后退出），第二次立即中断"""
+    def handler(signum, frame):
+        control.cancel()
+        signal.signal(signal.SIGINT, signal.default_int_handler)
+    return signal.signal(signal.SIGINT, handler)
+
+
+def engine_mode_name(mode):
+    """模式名或规则链名称"""
+    return getattr(mode, 'name', mode)
+
+
+def write_results(out, results, show_skipped=False):
+    """逐行输出结果；正常结束返回None，被中断时返回退出码"""
+    try:
+        for result in results:
+            if result.status == SKIPPED and not show_skipped:
+                continue
+            write_json(out, {
+                'event': 'result',
+                'status': result.status,
+                'dir': result.root,
+                'old': result.old_name,
+                'new': result.new_name,
+                'error': result.error,
+            })
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # 输出管道被关闭（例如接了 head），静默退出
+        sys.stdout = None
+        return 1
+    return None
+
+
+def run_watch(args, out, mode, scan_filter=None):
+    """监视模式：每批处理结束后输出一行 batch 统计，Ctrl+C 结束后输出 summary"""
+    from .watch import WatchSession
+
+    journal = None
+    if not args.dry_run and not args.no_journal:
+        journal = Journal.create(args.directory, engine_mode_name(mode), args.journal_dir)
+    control = RunControl()
+
+    def on_ready(stats):
+        write_json(out, dict({'event': 'watching', 'watcher': session.kind}, **stats))
+        out.flush()
+
+    def on_batch(stats):
+        write_json(out, dict({'event': 'batch'}, **stats))
+        out.flush()
+
+    session = WatchSession(args.directory, mode, args.recursive, args.dry_run,
+                           max_depth=args.max_depth, journal=journal, control=control,
+                           debounce=args.debounce, polling=args.poll,
+                           poll_interval=args.poll_interval, on_ready=on_ready,
+                           on_batch=on_batch, scan_filter=scan_filter, verify=args.verify,
+                           verify_workers=args.verify_workers)
+    previous_handler = install_cancel_handler(control)
+    try:
+        status = write_results(out, session.run(), args.show_skipped)
+    finally:
+        signal.signal(signal.SIGINT, previous_handler)
+        if journal is not None:
+            journal.close()
+    if status is not None and status != 130:
+        return status
+
+    write_json(out, dict({'event': 'summary'}, **session.engine.summary(),
+                         batches=session.batches,
+                         journal=journal.path if journal is not None and journal.count else None))
+    return 1 if session.engine.error_count else 0
+
+
+def run_undo(parser, args, out):
+    """撤销上次运行（或指定的日志）"""
+    path = latest_journal(args.journal_dir) if args.undo == 'last' else args.undo
+    if path is None:
+        parser.error('没有可撤销的运行记录')
+    try:
+        undo = UndoRun(path, args.rename_workers)
+    except (OSError, ValueError) as e:
+        parser.error(f'无法读取撤销日志 {path}: {e}')
+
+    status = write_results(out, undo.run())
+    if status is not None:
+        return status
+    write_json(out, {
+        'event': 'summary',
+        'undo': path,
+        'directory': undo.directory,
+        'renamed': undo.renamed_count,
+        'errors': undo.error_count,
+        'conflicts': undo.conflict_count,
+    })
+    return 1 if undo.error_count or undo.conflict_count else 0
@@ -0,0 +1,106 @@
+"""运行控制：协作式取消、暂停/继续，以及断点保存与续跑"""
+import json
+import os
+import threading
+import time
+
+from .cache import default_cache_dir, run_key
+
+
+class Cancelled(Exception):
+    """运行被取消"""
+
+
+class RunControl:
+    """在线程之间共享的运行控制开关
+
+    引擎在安全点（目录之间、每批文件之后）调用 checkpoint()：
+    暂停时在此阻塞，取消时抛出 Cancelled。
+    """
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self):
+        return not self._running.is_set()
+
+    def cancel(self):
+        self._cancelled.set()
+        # 唤醒处于暂停状态的线程
+        self._running.set()
+
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def wait(self):
+        """暂停时阻塞直到继续或取消（不抛出异常，可在目录处理中途调用）"""
+        if not self._running.is_set():
+            self._running.wait()
+
+    def checkpoint(self):
+        """安全点：暂停时等待继续，已取消时抛出 Cancelled"""
+        self.wait()
+        if self._cancelled.is_set():
+            raise Cancelled()
+
+
+def default_checkpoint_dir():
+    """默认断点文件目录"""
+    return os.path.join(default_cache_dir(), 'checkpoints')
+
+
+class Checkpoint:
+    """断点文件：记录待处理的目录栈和计数，每隔 interval 秒保存一次
+
+    文件以“写临时文件再替换”的方式保存，进程崩溃时也不会留下损坏的断点。
+    """
+    def __init__(self, path, interval=30.0):
+        self.path = path
+        self.interval = interval
+        self.last_save = time.monotonic()
+
+    @classmethod
+    def for_run(cls, directory, ruleset, checkpoint_dir=None, interval=30.0):
+        """为一次运行定位断点文件（同一目录和规则链共用一个断点）"""
+        checkpoint_dir = checkpoint_dir or default_checkpoint_dir()
+        return cls(os.path.join(checkpoint_dir, run_key(directory, ruleset) + '.json'), interval)
+
+    def due(self):
+        """距上次保存是否已超过保存间隔"""
+        return time.monotonic() - self.last_save >= self.interval
+
+    def load(self):
+        """读取断点，不存在或已损坏时返回None"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save(self, state):
+        """原子地保存断点"""
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.last_save = time.monotonic()
+
+    def clear(self):
+        """运行完整结束后删除断点"""
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
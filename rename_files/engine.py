@@ -0,0 +1,613 @@
+"""文件重命名引擎（纯Python实现，不依赖PyQt5，可在无显示环境下使用）"""
+import gc
+import os
+import time
+from collections import namedtuple
+from functools import partial
+from time import perf_counter
+
+from .cache import DirCache
+from .control import Cancelled
+from .executor import ShardExecutor, execute_shard, iter_shard
+from .inodes import InodeIndex
+from .journal import mark_undone, read_journal, undo_shards
+from .metrics import RunMetrics, current_rss, peak_rss, to_mb
+from .planner import RenamePlan, OP_TO_TEMP, TARGET_EXISTS
+from .rules import BUILTIN_RULES, resolve_ruleset
+from .scan import TreeWalker, scan_dir
+from .verify import VolumeVerifier
+from .volumes import volume_group
+
+# 支持的内置重命名模式及其说明
+MODES = {name: rule.description for name, rule in BUILTIN_RULES.items()}
+
+# 单个文件的处理结果状态
+RENAMED = 'renamed'
+SIMULATED = 'simulated'
+SKIPPED = 'skipped'
+ERROR = 'error'
+CONFLICT = 'conflict'
+
+# 检查内存上限的最短间隔（秒），避免每个目录都读取 /proc
+MEMORY_CHECK_INTERVAL = 0.1
+
+# 超大目录分块整批匹配，每块之间响应暂停并输出进度
+MATCH_CHUNK = 16384
+
+RenameResult = namedtuple('RenameResult', ['status', 'root', 'old_name', 'new_name', 'error'])
+
+
+def new_filename_for(mode, filename):
+    """根据模式（或规则链）计算新文件名，不需要重命名时返回None"""
+    return resolve_ruleset(mode).apply(filename)
+
+
+def format_result(result):
+    """将处理结果格式化为日志文本，跳过的文件返回None"""
+    if result.status == SIMULATED:
+        return f"模拟: 将 '{result.old_name}' 重命名为 '{result.new_name}'"
+    if result.status == RENAMED:
+        return f"已重命名: {result.old_name} -> {result.new_name}"
+    if result.status == ERROR:
+        return f"错误: 无法重命名 '{result.old_name}': {result.error}"
+    if result.status == CONFLICT:
+        return f"冲突: 跳过 '{result.old_name}' -> '{result.new_name}': {result.error}"
+    return None
+
+
+def collect_results(results, stats):
+    """把执行结果转换为 RenameResult，并累计到 stats 的 renamed_count/error_count/conflict_count
+
+    执行时发现目标已存在（no_replace）的报告为冲突；始终在调用方线程中执行，多线程执行时计数也不会出错。
+    """
+    for root, old, new, error in results:
+        if error is None:
+            stats.renamed_count += 1
+            yield RenameResult(RENAMED, root, old, new, None)
+        elif error == TARGET_EXISTS:
+            stats.conflict_count += 1
+            yield RenameResult(CONFLICT, root, old, new, error)
+        else:
+            stats.error_count += 1
+            yield RenameResult(ERROR, root, old, new, error)
+
+
+def _hooked_lister(lister, hook):
+    def list_dir(path):
+        hook(path)
+        return lister(path)
+    return list_dir
+
+
+class RenameEngine:
+    """重命名引擎，逐个产出处理结果并统计数量"""
+    def __init__(self, directory, mode, recursive=False, dry_run=True,
+                 max_depth=None, workers=0, use_cache=False, full_rescan=False,
+                 cache_dir=None, report_skipped=False, rename_workers=0, journal=None,
+                 control=None, checkpoint=None, resume=False, metrics=None, on_progress=None,
+                 before_list=None, volume_sets=False, bounded_memory=False, memory_limit=None,
+                 scan_filter=None, verify=False, verify_workers=8, backend=None, dedupe=False):
+        # mode 可以是内置模式名，也可以是 Rule/RuleSet
+        self.ruleset = resolve_ruleset(mode)
+        self.directory = directory
+        self.mode = self.ruleset.name
+        self.recursive = recursive
+        self.dry_run = dry_run
+        self.max_depth = max_depth
+        self.workers = workers
+        self.use_cache = use_cache
+        self.full_rescan = full_rescan
+        self.cache_dir = cache_dir
+        # 是否为未修改的文件逐个产出 SKIPPED 结果
+        self.report_skipped = report_skipped
+        # 大于1时使用线程池按目录分片并行执行重命名
+        self.rename_workers = rename_workers
+        # 撤销日志（journal.Journal），为None时不记录
+        self.journal = journal
+        self._on_renamed = journal.record if journal is not None else None
+        # 运行控制（control.RunControl）与断点（control.Checkpoint）
+        self.control = control
+        self.checkpoint = checkpoint
+        # 运行指标（metrics.RunMetrics），on_progress(快照) 按固定间隔被调用
+        self.metrics = metrics or RunMetrics()
+        self.on_progress = on_progress
+        # 每个目录列举之前调用 before_list(路径)，例如先添加文件系统监视再列举
+        self.before_list = before_list
+        # 按分卷组整体改名：不完整的组跳过，组内失败整组回滚
+        self.volume_sets = volume_sets
+        self._group_of = volume_group if volume_sets else None
+        # 限制内存模式：目录缓存不整表读入内存；memory_limit 为常驻内存上限（MB），
+        # 超出时在目录边界停止并保存断点
+        self.bounded_memory = bounded_memory
+        self.memory_limit = memory_limit
+        self.memory_exceeded = False
+        self._memory_checked = 0.0
+        # 遍历过滤（filters.ScanFilter）：被排除的子目录不会被列举，被排除的文件不参与匹配
+        self.scan_filter = scan_filter if scan_filter else None
+        # 内容校验：改名前读取文件头，不是真正的 RAR/REV 分卷的文件作为冲突跳过
+        self.verify = verify
+        self.verify_workers = verify_workers
+        # 校验使用的线程池（concurrent.futures.Executor），为None时校验器自建线程池；
+        # 异步接口设为共享的 RenamePool，校验不再额外占用线程
+        self.verify_executor = None
+        self.verified = 0
+        self.verify_cache_hits = 0
+        # 存储后端（backends 模块），为None时直接访问本地文件系统（使用目录文件描述符等快速路径）；
+        # 流水线后端的并发数同时作为默认的扫描和改名线程数
+        self.backend = backend
+        # 按 (设备, inode) 去重：硬链接、绑定挂载的重复目录不再列举，多链接文件只改名一次
+        self.dedupe = dedupe
+        self.inode_index = None
+        if dedupe:
+            self.inode_index = (InodeIndex() if backend is None
+                                else InodeIndex(backend.stat, backend.stat))
+        self.mode_desc = self.ruleset.description
+
+        self.renamed_count = 0
+        self.skipped_count = 0
+        self.error_count = 0
+        self.conflict_count = 0
+        # 目录缓存统计：命中缓存的目录数 / 实际扫描的目录数
+        self.dirs_cached = 0
+        self.dirs_scanned = 0
+        # 运行是否被取消、是否从断点继续，以及最后一个处理完毕的目录
+        self.cancelled = False
+        self.resumed = False
+        self.last_dir = None
+        self.walker = None
+
+        self._resume_from = None
+        if resume and checkpoint is not None:
+            state = checkpoint.load()
+            if state is not None and state.get('options') == self._options():
+                self._restore(state)
+
+    def _options(self):
+        """影响运行结果的选项，断点只在选项一致时才能继续"""
+        return {
+            'directory': os.path.abspath(self.directory),
+            'mode': self.mode,
+            'recursive': self.recursive,
+            'max_depth': self.max_depth,
+            'dry_run': self.dry_run,
+            'volume_sets': self.volume_sets,
+            'filters': self.scan_filter.key() if self.scan_filter is not None else None,
+            'verify': self.verify,
+            'dedupe': self.dedupe,
+        }
+
+    def _counters(self):
+        return {
+            'renamed': self.renamed_count,
+            'skipped': self.skipped_count,
+            'errors': self.error_count,
+            'conflicts': self.conflict_count,
+            'dirs_cached': self.dirs_cached,
+            'dirs_scanned': self.dirs_scanned,
+            'dirs_pruned': self.dirs_pruned,
+            'files_filtered': self.files_filtered,
+            'dirs_deduped': self.dirs_deduped,
+            'files_deduped': self.files_deduped,
+        }
+
+    def _restore(self, state):
+        counters = state.get('counters', {})
+        self.renamed_count = counters.get('renamed', 0)
+        self.skipped_count = counters.get('skipped', 0)
+        self.error_count = counters.get('errors', 0)
+        self.conflict_count = counters.get('conflicts', 0)
+        self.dirs_cached = counters.get('dirs_cached', 0)
+        self.dirs_scanned = counters.get('dirs_scanned', 0)
+        if self.scan_filter is not None:
+            self.scan_filter.dirs_pruned = counters.get('dirs_pruned', 0)
+            self.scan_filter.files_filtered = counters.get('files_filtered', 0)
+        # 索引本身不保存在断点中：继续运行时之前处理过的重复路径会再列举一次，其中的文件已经改名，不会重复改名
+        if self.inode_index is not None:
+            self.inode_index.dirs_deduped = counters.get('dirs_deduped', 0)
+            self.inode_index.files_deduped = counters.get('files_deduped', 0)
+        self.last_dir = state.get('last_dir')
+        self._resume_from = [tuple(item) for item in state.get('pending', [])]
+        self.resumed = True
+
+    def save_checkpoint(self):
+        """保存断点：剩余待处理的目录栈 + 当前计数"""
+        if self.checkpoint is None or self.walker is None:
+            return
+        self.checkpoint.save({
+            'options': self._options(),
+            'last_dir': self.last_dir,
+            'pending': self.walker.pending(),
+            'counters': self._counters(),
+            'time': time.time(),
+        })
+
+    @property
+    def dirs_pruned(self):
+        """被过滤条件剪掉（未列举）的子目录数"""
+        return self.scan_filter.dirs_pruned if self.scan_filter is not None else 0
+
+    @property
+    def files_filtered(self):
+        """被过滤条件排除的文件数（不计入未修改数量）"""
+        return self.scan_filter.files_filtered if self.scan_filter is not None else 0
+
+    @property
+    def dirs_deduped(self):
+        """因 (设备, inode) 重复而未列举的目录数（每个目录代表其整个子树）"""
+        return self.inode_index.dirs_deduped if self.inode_index is not None else 0
+
+    @property
+    def files_deduped(self):
+        """已通过其他硬链接处理、因而未改名的文件数（不计入未修改数量）"""
+        return self.inode_index.files_deduped if self.inode_index is not None else 0
+
+    def report_progress(self, force=False):
+        """到达输出间隔（或 force 为True）时把指标快照交给 on_progress"""
+        if self.on_progress is not None and (force or self.metrics.due()):
+            self.on_progress(self.metrics.snapshot(self))
+
+    def walk(self, lister=scan_dir):
+        """遍历目录，产出 DirListing"""
+        prune = self.scan_filter.prune_dirs if self.scan_filter is not None else None
+        self.walker = TreeWalker(self.directory, self.recursive, self.max_depth,
+                                 self._parallelism(self.workers), lister,
+                                 start=self._resume_from, prune=prune, index=self.inode_index)
+        return iter(self.walker)
+
+    def _open_cache(self):
+        # 按大小过滤时不使用目录缓存：文件被追加写入或截断不改变目录的 mtime，
+        # 缓存中“无需处理”的目录里可能出现新进入大小范围的文件
+        if not self.use_cache or (self.scan_filter is not None and self.scan_filter.filters_size):
+            return None
+        return DirCache.for_run(self.directory, self.ruleset, self.cache_dir, self.full_rescan,
+                                preload=not self.bounded_memory,
+                                extra=self.scan_filter.key() if self.scan_filter else None,
+                                backend=self.backend)
+
+    def _check_memory(self, cache):
+        """超过内存上限时先写出缓冲再回收，仍然超出则像取消一样停止运行"""
+        if self.memory_limit is None:
+            return
+        now = time.monotonic()
+        if now - self._memory_checked < MEMORY_CHECK_INTERVAL:
+            return
+        self._memory_checked = now
+        limit = self.memory_limit * 1024 * 1024
+        rss = current_rss()
+        if rss is None or rss <= limit:
+            return
+        if cache is not None:
+            cache.flush()
+        if self.journal is not None:
+            self.journal.flush()
+        gc.collect()
+        if current_rss() > limit:
+            self.memory_exceeded = True
+            raise Cancelled()
+
+    def open_verifier(self):
+        """创建内容校验器（未启用校验时返回None），由调用方负责关闭"""
+        if not self.verify:
+            return None
+        return VolumeVerifier(self.verify_workers, preload=not self.bounded_memory,
+                              executor=self.verify_executor, backend=self.backend)
+
+    def _iter_matches(self, cache):
+        """扫描并匹配，产出 (DirListing, [(旧文件名, 新文件名), ...], 跳过的文件名或None,
+        未通过内容校验的旧文件名集合或None)"""
+        verifier = self.open_verifier()
+        try:
+            yield from self._scan_and_match(cache, verifier)
+        finally:
+            if verifier is not None:
+                self.verified += verifier.checked
+                self.verify_cache_hits += verifier.cache_hits
+                verifier.close()
+
+    def _scan_and_match(self, cache, verifier):
+        match_batch = self.ruleset.match_batch
+        filter_files = None
+        if self.scan_filter is not None:
+            filter_files = self.scan_filter.filter_files
+            if self.backend is not None:
+                filter_files = partial(filter_files, stat=self.backend.stat)
+        report_skipped = self.report_skipped
+        index = self.inode_index
+        control = self.control
+        metrics = self.metrics
+        if cache is not None:
+            lister = cache.scan
+        elif self.backend is not None:
+            lister = self.backend.list_dir
+        else:
+            lister = scan_dir
+        if self.before_list is not None:
+            lister = _hooked_lister(lister, self.before_list)
+        tracer = metrics.tracer
+        if tracer is not None:
+            # 实际的列举调用（可能在并行扫描线程中），区别于等待列举结果的 scan 阶段
+            lister = tracer.wrap('list_dir', lister)
+        listings = self.walk(lister)
+        for listing in metrics.timed(listings, 'scan'):
+            if listing.cached_skipped is not None:
+                # 目录未变化且上次全部跳过，直接计入未修改数量
+                self.dirs_cached += 1
+                self.skipped_count += listing.cached_skipped
+                self.report_progress()
+                continue
+            self.dirs_scanned += 1
+            metrics.files_scanned += len(listing.files)
+
+            # 过滤只影响参与匹配的文件；冲突检测仍使用目录中的全部名称
+            files = listing.files
+            if filter_files is not None:
+                files = filter_files(listing.path, files)
+            matches = []
+            skipped = [] if report_skipped else None
+            match_start = perf_counter()
+            for start in range(0, len(files), MATCH_CHUNK):
+                # 超大目录中途也响应暂停并输出进度
+                if start:
+                    if control is not None:
+                        control.wait()
+                    self.report_progress()
+                chunk = files[start:start + MATCH_CHUNK]
+                chunk_matches = match_batch(chunk)
+                # 不匹配或新旧文件名相同则跳过
+                self.skipped_count += len(chunk) - len(chunk_matches)
+                if skipped is not None:
+                    renamed = {old for old, _ in chunk_matches}
+                    skipped.extend(name for name in chunk if name not in renamed)
+                matches.extend(chunk_matches)
+            # 目录缓存按去重之前的结果记录：重复的硬链接在其他运行中仍可能需要改名
+            needs_work = bool(matches)
+            if index is not None and matches:
+                matches = index.unique_matches(listing.path, matches, self._group_of)
+            match_end = perf_counter()
+            metrics.match_seconds += match_end - match_start
+            if tracer is not None:
+                tracer.add('match', match_start, match_end,
+                           {'dir': listing.path, 'files': len(files)})
+            rejected = None
+            if verifier is not None and matches:
+                rejected = verifier.rejected(listing.path, matches)
+                if tracer is not None:
+                    tracer.add('verify', match_end, perf_counter(),
+                               {'dir': listing.path, 'files': len(matches)})
+            self.report_progress()
+            # 未通过校验的文件仍视为需要处理，目录不记入缓存，文件内容变化后还会重新校验
+            if cache is not None:
+                cache.record(listing, not needs_work, len(files))
+            yield listing, matches, skipped, rejected
+
+    def directory_plans(self, cache=None):
+        """逐个目录扫描并生成该目录的计划，产出 (目录, RenamePlan 或None, 跳过的文件名或None)"""
+        tracer = self.metrics.tracer
+        for listing, matches, skipped, rejected in self._iter_matches(cache):
+            plan = None
+            if matches:
+                start = perf_counter()
+                plan = RenamePlan()
+                plan.add_directory(listing.path, listing.files + listing.dirs, matches,
+                                   self.volume_sets, rejected)
+                if tracer is not None:
+                    tracer.add('plan', start, perf_counter(), {'dir': listing.path})
+            yield listing.path, plan, skipped
+
+    def iter_work(self):
+        """扫描并生成计划，产出已确定的结果（RenameResult）或待执行的分片 (目录, 操作列表)
+
+        供 run() 以外的执行方式（如 aio 模块）把分片交给自己的线程池执行，
+        分片用 rename_shard 执行；计数方式与 run() 相同。
+        """
+        cache = self._open_cache()
+        try:
+            for root, plan, skipped in self.directory_plans(cache):
+                if skipped:
+                    for filename in skipped:
+                        yield RenameResult(SKIPPED, root, filename, None, None)
+                if plan is not None:
+                    yield from self._conflicts(plan)
+                    if self.dry_run:
+                        yield from self._simulate(plan)
+                    else:
+                        yield root, list(plan.operations())
+                self.last_dir = root
+                if self.control is not None:
+                    self.control.checkpoint()
+                self._check_memory(cache)
+        except Cancelled:
+            self.cancelled = True
+        finally:
+            if cache is not None:
+                cache.close()
+
+    def rename_shard(self, root, operations):
+        """执行一个分片，返回 (目录, 旧名, 新名, 错误) 列表（可在任意线程中调用）"""
+        return execute_shard(root, operations, on_renamed=self._on_renamed,
+                             group_of=self._group_of, backend=self.backend)
+
+    def summary(self):
+        """运行统计（命令行 summary 与异步接口共用）"""
+        return {
+            'mode': self.mode,
+            'dry_run': self.dry_run,
+            'renamed': self.renamed_count,
+            'skipped': self.skipped_count,
+            'errors': self.error_count,
+            'conflicts': self.conflict_count,
+            'dirs_cached': self.dirs_cached,
+            'dirs_scanned': self.dirs_scanned,
+            'dirs_pruned': self.dirs_pruned,
+            'files_filtered': self.files_filtered,
+            'dirs_deduped': self.dirs_deduped,
+            'files_deduped': self.files_deduped,
+            'verified': self.verified,
+            'verify_cache_hits': self.verify_cache_hits,
+            'resumed': self.resumed,
+            'cancelled': self.cancelled,
+            'memory_exceeded': self.memory_exceeded,
+            'peak_rss_mb': to_mb(peak_rss()),
+        }
+
+    def plan(self):
+        """第一阶段：扫描整棵目录树，生成完整的重命名计划（不修改任何文件）"""
+        plan = RenamePlan()
+        cache = self._open_cache()
+        tracer = self.metrics.tracer
+        try:
+            for listing, matches, _, rejected in self._iter_matches(cache):
+                if matches:
+                    start = perf_counter()
+                    plan.add_directory(listing.path, listing.files + listing.dirs, matches,
+                                       self.volume_sets, rejected)
+                    if tracer is not None:
+                        tracer.add('plan', start, perf_counter(), {'dir': listing.path})
+                if self.control is not None:
+                    self.control.checkpoint()
+        except Cancelled:
+            self.cancelled = True
+        finally:
+            if cache is not None:
+                cache.close()
+        return plan
+
+    def _collect(self, results):
+        return collect_results(self.metrics.timed(results, 'rename'), self)
+
+    def _conflicts(self, plan):
+        for root, old, new, reason in plan.conflicts():
+            self.conflict_count += 1
+            yield RenameResult(CONFLICT, root, old, new, reason)
+
+    def _simulate(self, plan):
+        for root, kind, old, new, origin in plan.operations():
+            if kind != OP_TO_TEMP:
+                yield RenameResult(SIMULATED, root, origin, new, None)
+
+    def _parallelism(self, workers):
+        """线程数未指定（不大于1）时使用存储后端的并发数"""
+        if workers <= 1 and self.backend is not None and self.backend.concurrency > 1:
+            return self.backend.concurrency
+        return workers
+
+    def _executor(self, no_replace=False):
+        workers = self._parallelism(self.rename_workers)
+        if self.dry_run or workers <= 1:
+            return None
+        return ShardExecutor(workers, on_renamed=self._on_renamed,
+                             group_of=self._group_of, backend=self.backend,
+                             tracer=self.metrics.tracer, no_replace=no_replace)
+
+    def execute(self, plan, no_replace=False):
+        """第二阶段：执行计划（模拟运行时只产出模拟结果），逐个产出 RenameResult
+
+        no_replace 为True时执行前逐个确认目标仍不存在，计划生成之后才出现的目标报告为冲突
+        （执行较早生成的计划时使用，如图形界面的预览）。
+        """
+        yield from self._conflicts(plan)
+        if self.dry_run:
+            yield from self._simulate(plan)
+            return
+
+        executor = self._executor(no_replace)
+        if executor is None:
+            for root, operations in plan.shards():
+                yield from self._collect(iter_shard(root, operations,
+                                                    on_renamed=self._on_renamed,
+                                                    group_of=self._group_of,
+                                                    backend=self.backend,
+                                                    no_replace=no_replace))
+            return
+        with executor:
+            yield from self._collect(executor.map(plan.shards()))
+
+    def run(self):
+        """扫描并执行重命名，逐个产出 RenameResult
+
+        重命名不会跨目录，因此每个目录列举完毕即生成该目录的计划并执行，
+        在保证冲突检测完整的同时保持流式输出；启用多线程时各目录作为分片并行执行。
+        每处理完一个目录是一个安全点：可在此暂停、取消或保存断点。
+        """
+        cache = self._open_cache()
+        executor = self._executor()
+        control = self.control
+        checkpoint = self.checkpoint
+        try:
+            try:
+                for root, plan, skipped in self.directory_plans(cache):
+                    if skipped:
+                        for filename in skipped:
+                            yield RenameResult(SKIPPED, root, filename, None, None)
+                    if plan is not None:
+                        yield from self._conflicts(plan)
+                        if self.dry_run:
+                            yield from self._simulate(plan)
+                        elif executor is None:
+                            yield from self._collect(iter_shard(root, list(plan.operations()),
+                                                                on_renamed=self._on_renamed,
+                                                                group_of=self._group_of,
+                                                                backend=self.backend))
+                        else:
+                            yield from self._collect(executor.submit(root,
+                                                                     list(plan.operations())))
+                    self.last_dir = root
+
+                    if checkpoint is not None and checkpoint.due():
+                        # 断点只记录已完成的目录，先等待已提交的分片执行完毕
+                        if executor is not None:
+                            yield from self._collect(executor.drain())
+                        self.save_checkpoint()
+                    if control is not None:
+                        control.checkpoint()
+                    self._check_memory(cache)
+            except Cancelled:
+                self.cancelled = True
+            if executor is not None:
+                yield from self._collect(executor.drain())
+            if checkpoint is not None:
+                if self.cancelled:
+                    self.save_checkpoint()
+                else:
+                    checkpoint.clear()
+            self.report_progress(force=True)
+        finally:
+            if executor is not None:
+                executor.close()
+            if cache is not None:
+                cache.close()
+
+
+class UndoRun:
+    """按撤销日志回滚一次运行，使用与重命名相同的分片执行路径"""
+    def __init__(self, journal_path, rename_workers=0):
+        self.journal_path = journal_path
+        self.rename_workers = rename_workers
+        self.meta, self.records = read_journal(journal_path)
+        self.directory = self.meta.get('directory', '')
+        self.renamed_count = 0
+        self.error_count = 0
+        self.conflict_count = 0
+
+    def run(self):
+        """执行回滚，逐个产出 RenameResult；全部成功后日志被标记为已撤销
+
+        原文件名在运行后又被占用时不覆盖，以冲突报告（其余文件照常恢复），日志保持未撤销状态。
+        """
+        shards = undo_shards(self.records)
+        if self.rename_workers > 1:
+            with ShardExecutor(self.rename_workers, no_replace=True) as executor:
+                yield from self._collect(executor.map(shards))
+        else:
+            for root, operations in shards:
+                yield from self._collect(iter_shard(root, operations, no_replace=True))
+        if self.error_count == 0 and self.conflict_count == 0:
+            mark_undone(self.journal_path)
+
+    def _collect(self, results):
+        return collect_results(results, self)
+
+
+def iter_renames(directory, mode, recursive=False, dry_run=True, **options):
+    """便捷函数：直接产出重命名结果"""
+    return RenameEngine(directory, mode, recursive, dry_run, **options).run()
@@ -0,0 +1,152 @@
+"""多线程重命名执行器：按目录分片并行执行，同一目录内保持顺序"""
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from .planner import OP_RENAME, VOLUME_SET_FAILED, execute_operations, rename_in_dir
+
+# 当前平台是否支持基于目录文件描述符的 rename（Windows 不支持）
+HAVE_DIR_FD = os.rename in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+
+
+def independent(operations):
+    """操作之间是否互不依赖：都是普通改名，且没有操作的目标是另一个操作的原名（忽略大小写），可以同时执行"""
+    olds = set()
+    news = set()
+    for _, kind, old, new, _ in operations:
+        if kind != OP_RENAME:
+            return False
+        olds.add(old.casefold())
+        news.add(new.casefold())
+    return olds.isdisjoint(news)
+
+
+def execute_pipelined(root, operations, backend, on_renamed=None, group_of=None):
+    """通过 backend.rename_many 同时执行同一目录中互不依赖的操作（见 independent）
+
+    按组执行时，组内有改名失败则把该组已成功的改名改回原名，整组报告为失败，
+    与 execute_operations 的结果相同（组内其余改名已同时发出，不会被跳过，而是随后被回滚）。
+    """
+    errors = backend.rename_many(root, [(old, new) for _, _, old, new, _ in operations],
+                                 on_renamed)
+    failed_groups = set()
+    if group_of is not None:
+        failed_groups = {group_of(origin) for (_, _, _, _, origin), error
+                         in zip(operations, errors) if error is not None}
+        failed_groups.discard(None)
+    for (_, _, old, new, origin), error in zip(operations, errors):
+        if failed_groups and group_of(origin) in failed_groups and error is None:
+            error = VOLUME_SET_FAILED
+            if not backend.exists(root, old):
+                try:
+                    backend.rename(root, new, old)
+                except OSError:
+                    pass
+                else:
+                    if on_renamed is not None:
+                        on_renamed(root, new, old)
+        yield root, origin, new, error
+
+
+def iter_shard(root, operations, rename=None, on_renamed=None, group_of=None, backend=None,
+               no_replace=False):
+    """执行同一目录中的一组操作，逐个产出结果
+
+    支持时先打开目录文件描述符，后续 rename 使用相对名称，
+    避免每次调用都重新解析完整路径。group_of 见 execute_operations。
+    给出 backend（存储后端）时通过它改名；流水线后端同时发出互不依赖的改名。
+    no_replace 见 execute_operations（需要逐个检查目标，不使用流水线）。
+    """
+    if backend is not None:
+        if hasattr(backend, 'rename_many') and not no_replace and independent(operations):
+            yield from execute_pipelined(root, operations, backend, on_renamed, group_of)
+        else:
+            yield from execute_operations(operations, backend.rename, on_renamed, group_of,
+                                          backend.exists, no_replace)
+        return
+    if rename is not None:
+        yield from execute_operations(operations, rename, on_renamed, group_of,
+                                      no_replace=no_replace)
+        return
+    dir_fd = None
+    if HAVE_DIR_FD:
+        try:
+            dir_fd = os.open(root, os.O_RDONLY | os.O_DIRECTORY)
+        except OSError:
+            dir_fd = None
+    if dir_fd is None:
+        yield from execute_operations(operations, rename_in_dir, on_renamed, group_of,
+                                      no_replace=no_replace)
+        return
+    try:
+        def rename_at(_root, old, new):
+            os.rename(old, new, src_dir_fd=dir_fd, dst_dir_fd=dir_fd)
+
+        def exists_at(_root, name):
+            try:
+                os.lstat(name, dir_fd=dir_fd)
+            except OSError:
+                return False
+            return True
+        yield from execute_operations(operations, rename_at, on_renamed, group_of, exists_at,
+                                      no_replace)
+    finally:
+        os.close(dir_fd)
+
+
+def execute_shard(root, operations, rename=None, on_renamed=None, group_of=None, backend=None,
+                  no_replace=False):
+    """执行同一目录中的一组操作，返回结果列表（供线程池使用）"""
+    return list(iter_shard(root, operations, rename, on_renamed, group_of, backend, no_replace))
+
+
+class ShardExecutor:
+    """在线程池上执行按目录划分的重命名分片
+
+    同时排队的分片数不超过 max_pending，超出时 submit 会等待最早的分片完成，
+    实现背压；结果按提交顺序产出，输出顺序与单线程执行一致。
+    给出 tracer（profiling.Tracer）时记录每个分片在执行线程中的耗时（rename_shard 阶段）；
+    no_replace 见 execute_operations。
+    """
+    def __init__(self, workers=4, max_pending=None, rename=None, on_renamed=None, group_of=None,
+                 backend=None, tracer=None, no_replace=False):
+        self.workers = max(1, workers)
+        self.max_pending = max_pending or self.workers * 4
+        self.rename = rename
+        self.on_renamed = on_renamed
+        self.group_of = group_of
+        self.backend = backend
+        self.no_replace = no_replace
+        self.execute = execute_shard if tracer is None else tracer.wrap('rename_shard', execute_shard)
+        self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='rename')
+        self.pending = deque()
+
+    def submit(self, root, operations):
+        """提交一个目录的操作，产出因背压而必须先取回的已完成结果"""
+        self.pending.append(self.pool.submit(self.execute, root, operations,
+                                             self.rename, self.on_renamed, self.group_of,
+                                             self.backend, self.no_replace))
+        while len(self.pending) > self.max_pending:
+            yield from self.pending.popleft().result()
+
+    def drain(self):
+        """等待并产出所有剩余结果"""
+        while self.pending:
+            yield from self.pending.popleft().result()
+
+    def map(self, shards):
+        """执行 (目录, 操作列表) 序列并依次产出结果"""
+        for root, operations in shards:
+            yield from self.submit(root, operations)
+        yield from self.drain()
+
+    def close(self):
+        """关闭线程池，未开始的分片会被取消"""
+        self.pool.shutdown(wait=True, cancel_futures=True)
+        self.pending.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
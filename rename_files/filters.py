@@ -0,0 +1,142 @@
+"""遍历过滤：在遍历目录树时按名称、扩展名和大小排除目录与文件
+
+被排除的目录在入栈之前就被剪掉，其中的内容不会被列举；所有模式在创建过滤器时
+合并编译为一个正则，每个名称只匹配一次。模式默认为通配符（fnmatch），以 "re:" 开头时为正则表达式
+（re.search 语义）。
+"""
+import fnmatch
+import json
+import os
+import re
+
+REGEX_PREFIX = 're:'
+
+# 通配符在大小写不敏感的文件系统（Windows）上忽略大小写
+_GLOB_FLAGS = re.IGNORECASE if os.path.normcase('A') == 'a' else 0
+
+_SIZE_UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3, 'T': 1024 ** 4}
+
+
+def parse_size(text):
+    """解析大小，如 "512"、"10K"、"1.5M"、"2G"（也接受 KB/MB/GB 等写法）"""
+    m = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*([KMGT]?)I?B?\s*', text, re.IGNORECASE)
+    if m is None:
+        raise ValueError(f"无效的大小: {text}")
+    return int(float(m.group(1)) * _SIZE_UNITS[m.group(2).upper()])
+
+
+class NameMatcher:
+    """一组通配符/正则模式，任一模式匹配即为匹配；没有模式时为假值"""
+    def __init__(self, patterns=()):
+        self.patterns = tuple(patterns)
+        globs = []
+        regexes = []
+        for pattern in self.patterns:
+            if pattern.startswith(REGEX_PREFIX):
+                regexes.append(f"(?:{pattern[len(REGEX_PREFIX):]})")
+            else:
+                globs.append(fnmatch.translate(pattern))
+        try:
+            self._glob = re.compile('|'.join(globs), _GLOB_FLAGS).match if globs else None
+            self._regex = re.compile('|'.join(regexes)).search if regexes else None
+        except re.error as e:
+            raise ValueError(f"无效的过滤模式: {e}") from None
+
+    def __bool__(self):
+        return bool(self.patterns)
+
+    def __call__(self, name):
+        if self._glob is not None and self._glob(name) is not None:
+            return True
+        return self._regex is not None and self._regex(name) is not None
+
+
+class ScanFilter:
+    """遍历过滤器
+
+    include_dirs/exclude_dirs 作用于子目录名（遍历起点本身不受影响），
+    include/exclude 作用于文件名；设置了 include 时只保留匹配的名称，
+    exclude 优先于 include。extensions 为允许的扩展名（不含点，忽略大小写），
+    min_size/max_size 为文件大小范围（字节，需要额外 stat，只对通过名称过滤的文件进行）。
+
+    dirs_pruned/files_filtered 累计被剪掉的目录数和被过滤的文件数，只在遍历线程中更新。
+    """
+    def __init__(self, include=(), exclude=(), include_dirs=(), exclude_dirs=(),
+                 extensions=(), min_size=None, max_size=None):
+        self.include = NameMatcher(include)
+        self.exclude = NameMatcher(exclude)
+        self.include_dirs = NameMatcher(include_dirs)
+        self.exclude_dirs = NameMatcher(exclude_dirs)
+        self.extensions = frozenset(ext.lower().lstrip('.') for ext in extensions if ext)
+        self.min_size = min_size
+        self.max_size = max_size
+        self.dirs_pruned = 0
+        self.files_filtered = 0
+
+    @property
+    def filters_dirs(self):
+        return bool(self.include_dirs or self.exclude_dirs)
+
+    @property
+    def filters_size(self):
+        """是否按文件大小过滤（文件大小变化不会改变目录的 mtime，目录缓存无法感知）"""
+        return self.min_size is not None or self.max_size is not None
+
+    @property
+    def filters_files(self):
+        return bool(self.include or self.exclude or self.extensions or self.filters_size)
+
+    def __bool__(self):
+        return self.filters_dirs or self.filters_files
+
+    def key(self):
+        """过滤条件的唯一标识（缓存、断点只在过滤条件相同时复用）"""
+        return json.dumps({
+            'include': self.include.patterns,
+            'exclude': self.exclude.patterns,
+            'include_dirs': self.include_dirs.patterns,
+            'exclude_dirs': self.exclude_dirs.patterns,
+            'extensions': sorted(self.extensions),
+            'min_size': self.min_size,
+            'max_size': self.max_size,
+        }, sort_keys=True, ensure_ascii=False)
+
+    def prune_dirs(self, path, names):
+        """返回需要继续遍历的子目录名（保持原顺序）"""
+        if not self.filters_dirs:
+            return names
+        include = self.include_dirs
+        exclude = self.exclude_dirs
+        kept = [name for name in names
+                if (not include or include(name)) and not (exclude and exclude(name))]
+        self.dirs_pruned += len(names) - len(kept)
+        return kept
+
+    def filter_files(self, path, names, stat=os.stat):
+        """返回通过过滤的文件名（保持原顺序）；stat 用于按大小过滤（存储后端的 stat）"""
+        if not self.filters_files:
+            return names
+        kept = names
+        if self.include:
+            kept = [name for name in kept if self.include(name)]
+        if self.exclude:
+            exclude = self.exclude
+            kept = [name for name in kept if not exclude(name)]
+        if self.extensions:
+            extensions = self.extensions
+            splitext = os.path.splitext
+            kept = [name for name in kept if splitext(name)[1][1:].lower() in extensions]
+        if self.min_size is not None or self.max_size is not None:
+            kept = [name for name in kept if self._size_ok(os.path.join(path, name), stat)]
+        self.files_filtered += len(names) - len(kept)
+        return kept
+
+    def _size_ok(self, path, stat):
+        try:
+            size = stat(path).st_size
+        except OSError:
+            # 无法获取大小（例如失效的符号链接）时保留，由后续步骤处理
+            return True
+        if self.min_size is not None and size < self.min_size:
+            return False
+        return self.max_size is None or size <= self.max_size
@@ -0,0 +1,1396 @@
+import os
+import sys
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
+                            QHBoxLayout, QLabel, QLineEdit, QPushButton, 
+                            QRadioButton, QCheckBox, QFileDialog, QPlainTextEdit, 
+                            QStatusBar, QGroupBox, QMessageBox, QGraphicsBlurEffect,
+                            QProgressBar, QTableWidget, QTableWidgetItem, QSpinBox,
+                            QHeaderView, QAbstractItemView, QGridLayout, QDialog,
+                            QTableView)
+from functools import partial
+
+from PyQt5.QtCore import (Qt, QThread, pyqtSignal, QPoint, QTimer, QRect, QRectF,
+                          QAbstractTableModel, QModelIndex)
+from PyQt5.QtGui import (QFont, QColor, QPalette, QPainter, QPen, QBrush, 
+                        QIcon, QPixmap, QLinearGradient, QPainterPath, QRegion)
+
+from .jobs import JOB_CANCELLED, JOB_DONE, JOB_FAILED, JOB_RUNNING, Job, JobQueue
+from .startup import PHASE_APP, PHASE_FIRST_PAINT, PHASE_WINDOW, StartupTimer
+from .styles import APP_STYLESHEET
+
+# 快速启动：窗口首次绘制前只加载 PyQt5、任务队列和样式表。引擎、撤销日志、预览、剖析、监视等模块
+# （连同 SQLite、线程池）在各线程和按钮处理函数中首次使用时才导入
+
+# 日志窗口最多保留的行数，超出后自动丢弃最早的行
+LOG_MAX_LINES = 5000
+# 进度面板的刷新间隔（秒）
+PROGRESS_INTERVAL = 0.25
+# 任务队列默认同时运行的任务数
+QUEUE_MAX_RUNNING = 2
+# 首次绘制后自动退出（测量启动耗时）时的超时（毫秒），无法绘制窗口时避免一直等待
+STARTUP_TIMEOUT_MS = 30000
+# 任务队列表格的列
+JOB_COLUMNS = ["目录", "模式", "递归", "模拟", "状态", "已扫描", "已重命名", "未修改", "错误/冲突"]
+
+def get_real_exe_path():
+    """获取打包后的exe实际路径（解决PyInstaller临时目录问题）"""
+    if getattr(sys, 'frozen', False):
+        # 打包后的环境
+        return os.path.dirname(sys.executable)
+    else:
+        # 开发环境（包所在的项目目录）
+        return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class RenameThread(QThread):
+    """文件重命名线程，用于后台执行重命名操作，避免界面卡顿"""
+    # 日志按批次发送，每个信号携带多行日志
+    log_signal = pyqtSignal(list)
+    status_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(int, int)
+    # 运行指标快照，按固定的低频率发送
+    progress_signal = pyqtSignal(dict)
+    
+    def __init__(self, directory, mode, recursive, dry_run, use_cache=False, full_rescan=False,
+                 rename_workers=0, resume=False, volume_sets=False, bounded_memory=False,
+                 scan_filter=None, verify=False, connections=0, profile=False, dedupe=False):
+        super().__init__()
+        from .control import Checkpoint, RunControl
+        from .engine import MODES
+        from .rules import resolve_ruleset
+        self.directory = directory
+        self.mode = mode
+        self.recursive = recursive
+        self.dry_run = dry_run
+        self.use_cache = use_cache
+        self.full_rescan = full_rescan
+        self.volume_sets = volume_sets
+        # 限制内存模式：完整日志写入临时文件，界面只显示最近的日志
+        self.bounded_memory = bounded_memory
+        self.scan_filter = scan_filter
+        self.verify = verify
+        # 大于0时通过流水线后端访问网络共享，connections 为同时在途的请求数
+        self.connections = connections
+        # 按 (设备, inode) 去重，跳过硬链接和绑定挂载的重复路径
+        self.dedupe = dedupe
+        # 性能剖析：阶段计时 + 采样剖析器，结束时把热点摘要写入日志
+        self.profiler = None
+        if profile:
+            from .profiling import PROFILE_SAMPLE, Profiler
+            self.profiler = Profiler(PROFILE_SAMPLE)
+        self.rename_workers = rename_workers
+        self.resume = resume
+        self.mode_desc = MODES[mode]
+        # 界面线程通过 control 暂停/继续/取消，断点用于中断后继续
+        self.control = RunControl()
+        self.checkpoint = Checkpoint.for_run(directory, resolve_ruleset(mode))
+        # 实际重命名时的撤销日志路径（任务队列按批撤销时使用）
+        self.journal_path = None
+        
+    def run(self):
+        from .engine import RenameEngine, format_result
+        from .journal import Journal
+        from .logbuffer import LogBuffer, LogSpool
+        from .metrics import RunMetrics
+        profiler = self.profiler
+        tracer = profiler.tracer if profiler is not None else None
+        if profiler is not None:
+            profiler.start()
+        emit = self.log_signal.emit
+        if tracer is not None:
+            emit = tracer.wrap('emit', emit)
+        log = LogBuffer(emit)
+        log.append(f"\n开始在目录 '{self.directory}' 中执行重命名操作...")
+        log.append(f"模式: {self.mode_desc}")
+        log.append(f"递归: {self.recursive}")
+        log.append(f"模拟运行: {self.dry_run}")
+        log.append("-" * 50)
+        log.flush()
+        
+        def on_progress(snapshot):
+            # 扫描大量不匹配的目录时没有新的日志行，借进度回调按时间发送已缓冲的日志
+            log.poll()
+            self.progress_signal.emit(snapshot)
+        
+        journal = None
+        spool = None
+        backend = None
+        try:
+            if self.connections:
+                from .backends import PipelinedBackend
+                backend = PipelinedBackend(connections=self.connections)
+                log.append(f"网络共享模式: {self.connections} 个请求同时进行")
+            if self.bounded_memory:
+                spool = LogSpool()
+                log.append(f"限制内存模式，完整日志写入: {spool.path}")
+            # 实际重命名时写撤销日志，以便“撤销上次操作”
+            if not self.dry_run:
+                journal = Journal.create(self.directory, self.mode)
+                self.journal_path = journal.path
+            # 重命名逻辑由引擎完成，线程只负责转发结果
+            engine = RenameEngine(self.directory, self.mode, self.recursive, self.dry_run,
+                                  use_cache=self.use_cache or self.full_rescan,
+                                  full_rescan=self.full_rescan,
+                                  rename_workers=self.rename_workers,
+                                  volume_sets=self.volume_sets,
+                                  journal=journal,
+                                  control=self.control,
+                                  checkpoint=self.checkpoint,
+                                  resume=self.resume,
+                                  metrics=RunMetrics(PROGRESS_INTERVAL, tracer),
+                                  on_progress=on_progress,
+                                  bounded_memory=self.bounded_memory,
+                                  scan_filter=self.scan_filter,
+                                  verify=self.verify,
+                                  backend=backend,
+                                  dedupe=self.dedupe)
+            if engine.resumed:
+                log.append(f"从断点继续，上次处理到: {engine.last_dir}")
+            for result in engine.run():
+                message = format_result(result)
+                if message is not None:
+                    log.append(message)
+                    if spool is not None:
+                        spool.write(message)
+                else:
+                    log.poll()
+            renamed_count = engine.renamed_count
+            skipped_count = engine.skipped_count
+            
+            # 输出统计信息
+            log.append("-" * 50)
+            if engine.cancelled:
+                log.append("操作已取消，已保存断点，下次运行同一目录和模式时可从断点继续。")
+            log.append(f"{self.mode_desc}操作{'中止' if engine.cancelled else '完成'}:")
+            log.append(f"已重命名的文件: {renamed_count}")
+            log.append(f"未修改的文件: {skipped_count}")
+            if engine.conflict_count:
+                log.append(f"因冲突跳过的文件: {engine.conflict_count}")
+            if engine.use_cache:
+                log.append(f"目录: 缓存命中 {engine.dirs_cached} 个，重新扫描 {engine.dirs_scanned} 个")
+            if engine.scan_filter is not None:
+                log.append(f"被排除的目录: {engine.dirs_pruned} 个（未列举）")
+            if engine.dedupe:
+                log.append(f"跳过的重复: 目录 {engine.dirs_deduped} 个（未列举），硬链接文件 {engine.files_deduped} 个")
+            peak = engine.summary()['peak_rss_mb']
+            if peak is not None:
+                log.append(f"峰值内存: {peak} MB")
+            if spool is not None:
+                log.append(f"完整日志（{spool.count} 行）: {spool.path}")
+            if profiler is not None:
+                profiler.stop()
+                profiler.write(self.mode)
+                for line in profiler.report_lines():
+                    log.append(line)
+            
+            if self.dry_run:
+                log.append("\n提示: 当前为模拟运行模式，未实际修改任何文件。")
+                log.append("若要执行实际重命名，请取消'模拟运行'选项。")
+            log.flush()
+            
+            if engine.cancelled:
+                self.status_signal.emit(f"操作已取消: 重命名 {renamed_count} 个文件")
+            else:
+                self.status_signal.emit(f"操作完成: 重命名 {renamed_count} 个文件")
+                self.finished_signal.emit(renamed_count, skipped_count)
+            
+        except Exception as e:
+            log.append(f"错误: {str(e)}")
+            log.flush()
+            self.status_signal.emit(f"操作失败: {str(e)}")
+        finally:
+            if journal is not None:
+                journal.close()
+            if spool is not None:
+                spool.close()
+            if backend is not None:
+                backend.close()
+            if profiler is not None:
+                profiler.stop()
+
+class UndoThread(QThread):
+    """撤销线程：按撤销日志依次回滚（任务队列的一批运行有多个日志）"""
+    log_signal = pyqtSignal(list)
+    status_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(int, int, int)
+    
+    def __init__(self, journal_paths, rename_workers=0):
+        super().__init__()
+        self.journal_paths = journal_paths
+        self.rename_workers = rename_workers
+    
+    def run(self):
+        from .engine import UndoRun, format_result
+        from .logbuffer import LogBuffer
+        log = LogBuffer(self.log_signal.emit)
+        restored = errors = conflicts = 0
+        for journal_path in self.journal_paths:
+            # 一个日志无法撤销时继续撤销其余日志
+            try:
+                undo = UndoRun(journal_path, self.rename_workers)
+                log.append(f"\n开始撤销目录 '{undo.directory}' 中的上次操作...")
+                log.append(f"撤销日志: {journal_path}")
+                log.append("-" * 50)
+                for result in undo.run():
+                    log.append(format_result(result))
+                log.append("-" * 50)
+                log.append(f"已恢复的文件: {undo.renamed_count}")
+                log.append(f"恢复失败的文件: {undo.error_count}")
+                log.append(f"原文件名已被占用的文件: {undo.conflict_count}")
+                log.flush()
+                restored += undo.renamed_count
+                errors += undo.error_count
+                conflicts += undo.conflict_count
+            except Exception as e:
+                log.append(f"错误: 无法撤销 {journal_path}: {str(e)}")
+                log.flush()
+                errors += 1
+        
+        self.status_signal.emit(f"撤销完成: 恢复 {restored} 个文件")
+        self.finished_signal.emit(restored, errors, conflicts)
+
+class PreviewThread(QThread):
+    """预览线程：只扫描并生成重命名计划，不修改任何文件"""
+    log_signal = pyqtSignal(list)
+    status_signal = pyqtSignal(str)
+    progress_signal = pyqtSignal(dict)
+    
+    def __init__(self, directory, mode, recursive, use_cache=False, full_rescan=False,
+                 volume_sets=False, scan_filter=None, verify=False, connections=0, dedupe=False):
+        super().__init__()
+        from .control import RunControl
+        from .engine import MODES
+        self.directory = directory
+        self.mode = mode
+        self.recursive = recursive
+        self.use_cache = use_cache
+        self.full_rescan = full_rescan
+        self.volume_sets = volume_sets
+        self.scan_filter = scan_filter
+        self.verify = verify
+        self.connections = connections
+        self.dedupe = dedupe
+        self.mode_desc = MODES[mode]
+        self.control = RunControl()
+        # 线程结束后由主窗口取走计划显示预览
+        self.plan = None
+        self.skipped_count = 0
+    
+    def run(self):
+        from .engine import RenameEngine
+        from .logbuffer import LogBuffer
+        from .metrics import RunMetrics
+        log = LogBuffer(self.log_signal.emit)
+        log.append(f"\n正在扫描目录 '{self.directory}' 并生成预览...")
+        log.append(f"模式: {self.mode_desc}")
+        log.append(f"递归: {self.recursive}")
+        log.flush()
+        backend = None
+        try:
+            if self.connections:
+                from .backends import PipelinedBackend
+                backend = PipelinedBackend(connections=self.connections)
+            engine = RenameEngine(self.directory, self.mode, self.recursive, True,
+                                  use_cache=self.use_cache or self.full_rescan,
+                                  full_rescan=self.full_rescan,
+                                  control=self.control,
+                                  metrics=RunMetrics(PROGRESS_INTERVAL),
+                                  on_progress=self.progress_signal.emit,
+                                  volume_sets=self.volume_sets,
+                                  scan_filter=self.scan_filter,
+                                  verify=self.verify,
+                                  backend=backend,
+                                  dedupe=self.dedupe)
+            plan = engine.plan()
+            engine.report_progress(force=True)
+            if engine.cancelled:
+                log.append("预览已取消。")
+                log.flush()
+                self.status_signal.emit("预览已取消")
+                return
+            log.append(f"待重命名的文件: {plan.rename_count}")
+            log.append(f"因冲突跳过的文件: {plan.conflict_count}")
+            log.append(f"未修改的文件: {engine.skipped_count}")
+            if engine.scan_filter is not None:
+                log.append(f"被排除的目录: {engine.dirs_pruned} 个（未列举）")
+            if engine.dedupe:
+                log.append(f"跳过的重复: 目录 {engine.dirs_deduped} 个（未列举），硬链接文件 {engine.files_deduped} 个")
+            log.flush()
+            self.status_signal.emit(f"预览完成: {plan.rename_count} 个文件待重命名")
+            self.skipped_count = engine.skipped_count
+            self.plan = plan
+        except Exception as e:
+            log.append(f"错误: {str(e)}")
+            log.flush()
+            self.status_signal.emit(f"预览失败: {str(e)}")
+        finally:
+            if backend is not None:
+                backend.close()
+
+class ApplyThread(QThread):
+    """执行预览过的计划，不重新扫描目录树"""
+    log_signal = pyqtSignal(list)
+    status_signal = pyqtSignal(str)
+    finished_signal = pyqtSignal(int, int)
+    
+    def __init__(self, directory, mode, recursive, plan, skipped_count=0, volume_sets=False,
+                 connections=0):
+        super().__init__()
+        from .engine import MODES
+        self.directory = directory
+        self.mode = mode
+        self.recursive = recursive
+        self.plan = plan
+        self.skipped_count = skipped_count
+        self.volume_sets = volume_sets
+        self.connections = connections
+        self.mode_desc = MODES[mode]
+    
+    def run(self):
+        from .engine import RenameEngine, format_result
+        from .journal import Journal
+        from .logbuffer import LogBuffer
+        log = LogBuffer(self.log_signal.emit)
+        log.append(f"\n开始执行预览中的 {self.plan.rename_count} 项重命名...")
+        log.append("-" * 50)
+        journal = None
+        backend = None
+        try:
+            if self.connections:
+                from .backends import PipelinedBackend
+                backend = PipelinedBackend(connections=self.connections)
+            journal = Journal.create(self.directory, self.mode)
+            engine = RenameEngine(self.directory, self.mode, self.recursive, False,
+                                  journal=journal, volume_sets=self.volume_sets,
+                                  backend=backend)
+            # 预览之后目录可能已变化：执行前再确认目标不存在，新出现的同名文件报告为冲突而不覆盖
+            for result in engine.execute(self.plan, no_replace=True):
+                message = format_result(result)
+                if message is not None:
+                    log.append(message)
+            log.append("-" * 50)
+            log.append(f"{self.mode_desc}操作完成:")
+            log.append(f"已重命名的文件: {engine.renamed_count}")
+            if engine.error_count:
+                log.append(f"重命名失败的文件: {engine.error_count}")
+            if engine.conflict_count:
+                log.append(f"因冲突跳过的文件: {engine.conflict_count}（包括预览之后目标文件名已被占用的文件）")
+            log.flush()
+            status = f"操作完成: 重命名 {engine.renamed_count} 个文件"
+            if engine.conflict_count:
+                status += f"，{engine.conflict_count} 个冲突"
+            self.status_signal.emit(status)
+            self.finished_signal.emit(engine.renamed_count, self.skipped_count)
+        except Exception as e:
+            log.append(f"错误: {str(e)}")
+            log.flush()
+            self.status_signal.emit(f"操作失败: {str(e)}")
+        finally:
+            if journal is not None:
+                journal.close()
+            if backend is not None:
+                backend.close()
+
+class PlanTableModel(QAbstractTableModel):
+    """按需加载的预览表格模型：数据留在 PlanView 中，滚动到底部时再追加行"""
+    FETCH_BATCH = 1000
+    
+    def __init__(self, view, parent=None):
+        super().__init__(parent)
+        from .preview import PREVIEW_COLUMNS
+        self.view = view
+        self.columns = PREVIEW_COLUMNS
+        self.loaded = min(self.FETCH_BATCH, len(view))
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.loaded
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if role in (Qt.DisplayRole, Qt.ToolTipRole) and index.isValid():
+            return self.view.cell(index.row(), index.column())
+        return None
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section]
+        return None
+    
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self.loaded < len(self.view)
+    
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(self.FETCH_BATCH, len(self.view) - self.loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self.loaded, self.loaded + count - 1)
+        self.loaded += count
+        self.endInsertRows()
+    
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.beginResetModel()
+        self.view.sort(column, order == Qt.DescendingOrder)
+        self.loaded = min(self.FETCH_BATCH, len(self.view))
+        self.endResetModel()
+    
+    def set_filter(self, text):
+        self.beginResetModel()
+        self.view.set_filter(text)
+        self.loaded = min(self.FETCH_BATCH, len(self.view))
+        self.endResetModel()
+
+class PreviewDialog(QDialog):
+    """模拟运行的预览窗口：筛选、排序，确认后执行完全相同的计划"""
+    def __init__(self, plan, skipped_count, parent=None):
+        super().__init__(parent)
+        from .preview import PlanView
+        self.setWindowTitle("重命名预览")
+        self.resize(900, 600)
+        self.view = PlanView(plan)
+        self.skipped_count = skipped_count
+        self.model = PlanTableModel(self.view, self)
+        
+        layout = QVBoxLayout(self)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("筛选（文件名、目录或状态）")
+        # 输入停顿后再筛选，避免每个按键都遍历全部行
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(300)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_edit.textChanged.connect(self.filter_timer.start)
+        
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setWordWrap(False)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Interactive)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        for column, width in enumerate((260, 260, 220)):
+            self.table.setColumnWidth(column, width)
+        # 初始保持执行顺序，点击表头时才排序
+        self.table.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+        
+        self.count_label = QLabel()
+        self.apply_btn = QPushButton(f"应用（{self.view.rename_count} 项）")
+        self.apply_btn.setEnabled(self.view.rename_count > 0)
+        self.apply_btn.clicked.connect(self.accept)
+        self.close_btn = QPushButton("关闭")
+        self.close_btn.clicked.connect(self.reject)
+        
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.count_label, 1)
+        buttons_layout.addWidget(self.apply_btn)
+        buttons_layout.addWidget(self.close_btn)
+        
+        layout.addWidget(self.filter_edit)
+        layout.addWidget(self.table, 1)
+        layout.addLayout(buttons_layout)
+        self.update_count()
+    
+    def apply_filter(self):
+        self.model.set_filter(self.filter_edit.text())
+        self.update_count()
+    
+    def update_count(self):
+        self.count_label.setText(
+            f"待重命名 {self.view.rename_count} 项，冲突 {self.view.conflict_count} 项，"
+            f"未修改 {self.skipped_count} 项；当前显示 {len(self.view)} 项")
+
+class WatchThread(QThread):
+    """监视线程：处理一遍后持续处理新建或移入的文件，直到被取消"""
+    log_signal = pyqtSignal(list)
+    status_signal = pyqtSignal(str)
+    
+    def __init__(self, directory, mode, recursive, dry_run, scan_filter=None, verify=False):
+        super().__init__()
+        from .control import RunControl
+        from .engine import MODES
+        self.directory = directory
+        self.mode = mode
+        self.recursive = recursive
+        self.dry_run = dry_run
+        self.scan_filter = scan_filter
+        self.verify = verify
+        self.mode_desc = MODES[mode]
+        self.control = RunControl()
+    
+    def run(self):
+        from .engine import format_result
+        from .journal import Journal
+        from .logbuffer import LogBuffer
+        from .watch import WatchSession
+        log = LogBuffer(self.log_signal.emit)
+        log.append(f"\n开始监视目录 '{self.directory}'...")
+        log.append(f"模式: {self.mode_desc}")
+        log.append(f"递归: {self.recursive}")
+        log.append(f"模拟运行: {self.dry_run}")
+        log.append("-" * 50)
+        log.flush()
+        
+        def on_ready(stats):
+            log.append(f"初次处理完成: 已重命名 {stats['renamed']} 个文件，未修改 {stats['skipped']} 个")
+            log.append(f"正在监视新文件（{session.kind}），点击'取消'结束监视")
+            log.flush()
+            self.status_signal.emit("正在监视...")
+        
+        def on_batch(stats):
+            log.append(f"处理新文件 {stats['files']} 个: 重命名 {stats['renamed']} 个")
+            log.flush()
+        
+        journal = None
+        try:
+            if not self.dry_run:
+                journal = Journal.create(self.directory, self.mode)
+            session = WatchSession(self.directory, self.mode, self.recursive, self.dry_run,
+                                   journal=journal, control=self.control,
+                                   on_ready=on_ready, on_batch=on_batch,
+                                   scan_filter=self.scan_filter, verify=self.verify)
+            for result in session.run():
+                message = format_result(result)
+                if message is not None:
+                    log.append(message)
+            engine = session.engine
+            log.append("-" * 50)
+            log.append(f"监视已结束，共处理 {session.batches} 批新文件")
+            log.append(f"已重命名的文件: {engine.renamed_count}")
+            log.append(f"未修改的文件: {engine.skipped_count}")
+            log.flush()
+            self.status_signal.emit(f"监视已结束: 重命名 {engine.renamed_count} 个文件")
+        except Exception as e:
+            log.append(f"错误: {str(e)}")
+            log.flush()
+            self.status_signal.emit(f"监视失败: {str(e)}")
+        finally:
+            if journal is not None:
+                journal.close()
+
+class AcrylicWidget(QWidget):
+    """实现亚克力效果的基础窗口类"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setWindowFlags(self.windowFlags() | Qt.FramelessWindowHint)
+        
+        # 亚克力效果参数
+        self.blur_radius = 15
+        self.acrylic_color = QColor(240, 240, 240, 180)  # RGBA
+        self.border_radius = 15
+        
+        # 窗口拖动支持
+        self.dragging = False
+        self.drag_position = QPoint()
+    
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        
+        # 创建路径并绘制亚克力背景
+        path = QPainterPath()
+        # 使用QRectF替代QRect以解决类型错误
+        path.addRoundedRect(QRectF(0, 0, self.width(), self.height()), 
+                           self.border_radius, self.border_radius)
+        
+        # 绘制半透明背景
+        painter.fillPath(path, self.acrylic_color)
+        
+        # 绘制边框
+        pen = QPen(QColor(255, 255, 255, 100), 2)
+        painter.setPen(pen)
+        painter.drawPath(path)
+    
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton:
+            self.dragging = True
+            self.drag_position = event.globalPos() - self.frameGeometry().topLeft()
+            event.accept()
+    
+    def mouseMoveEvent(self, event):
+        if self.dragging and event.buttons() & Qt.LeftButton:
+            self.move(event.globalPos() - self.drag_position)
+            event.accept()
+    
+    def mouseReleaseEvent(self, event):
+        self.dragging = False
+        event.accept()
+
+class FileRenamerApp(AcrylicWidget):
+    """文件重命名工具主窗口"""
+    # 首次绘制窗口后发出（启动计时）
+    first_painted = pyqtSignal()
+    
+    def __init__(self, startup=None):
+        super().__init__()
+        # 启动计时，首次绘制时记录并写入日志
+        self.startup = startup
+        # 样式表设置在应用上（main 中已设置时不重复解析）
+        install_styles(QApplication.instance())
+        
+        # 设置窗口标题和大小
+        self.setWindowTitle("文件重命名工具")
+        self.resize(800, 700)
+        
+        # 设置中文字体
+        font = QFont()
+        font.setFamily("SimHei")
+        font.setPointSize(10)
+        self.setFont(font)
+        
+        # 创建主布局
+        self.main_layout = QVBoxLayout(self)
+        self.main_layout.setContentsMargins(20, 20, 20, 20)
+        self.main_layout.setSpacing(15)
+        
+        # 创建UI组件
+        self.create_title_bar()
+        self.create_directory_section()
+        self.create_mode_section()
+        self.create_options_section()
+        self.create_progress_section()
+        self.create_log_section()
+        self.create_queue_section()
+        self.create_buttons_section()
+        
+        # 初始化
+        self.rename_thread = None
+        # 任务队列：每个运行中的任务对应一个 RenameThread
+        self.job_queue = JobQueue(QUEUE_MAX_RUNNING)
+        self.job_threads = {}
+        self.queue_active = False
+        self.default_dir = get_real_exe_path()  # 使用新函数获取真实路径
+        self.dir_path.setText(self.default_dir)
+        self.log_text.appendPlainText("欢迎使用文件重命名工具")
+        self.log_text.appendPlainText(f"默认目录: {self.default_dir}")
+        self.log_text.appendPlainText("请选择重命名模式，然后点击'开始重命名'按钮")
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.startup is not None and not self.startup.has(PHASE_FIRST_PAINT):
+            self.startup.mark(PHASE_FIRST_PAINT)
+            # 绘制结束后再写日志，避免在绘制过程中修改控件
+            QTimer.singleShot(0, self.on_first_paint)
+    
+    def on_first_paint(self):
+        """窗口首次绘制完成：把启动耗时写入日志"""
+        self.log_text.appendPlainText(self.startup.format())
+        self.first_painted.emit()
+    
+    def create_title_bar(self):
+        """创建标题栏"""
+        title_layout = QHBoxLayout()
+        
+        self.title_label = QLabel("文件重命名工具")
+        self.title_label.setObjectName("titleLabel")
+        
+        # 关闭按钮
+        self.close_btn = QPushButton("×")
+        self.close_btn.setFixedSize(25, 25)
+        self.close_btn.setObjectName("closeBtn")
+        self.close_btn.clicked.connect(self.close)
+        
+        # 最小化按钮
+        self.minimize_btn = QPushButton("−")
+        self.minimize_btn.setFixedSize(25, 25)
+        self.minimize_btn.setObjectName("minimizeBtn")
+        self.minimize_btn.clicked.connect(self.showMinimized)
+        
+        title_layout.addWidget(self.title_label)
+        title_layout.addStretch(1)
+        title_layout.addWidget(self.minimize_btn)
+        title_layout.addWidget(self.close_btn)
+        
+        self.main_layout.addLayout(title_layout)
+    
+    def create_directory_section(self):
+        """创建目录选择部分"""
+        dir_layout = QHBoxLayout()
+        
+        self.dir_label = QLabel("选择目录:")
+        self.dir_label.setObjectName("dirLabel")
+        
+        self.dir_path = QLineEdit()
+        self.dir_path.setObjectName("dirPath")
+        
+        self.browse_btn = QPushButton("浏览...")
+        self.browse_btn.setObjectName("browseBtn")
+        self.browse_btn.clicked.connect(self.browse_directory)
+        
+        dir_layout.addWidget(self.dir_label)
+        dir_layout.addWidget(self.dir_path, 1)
+        dir_layout.addWidget(self.browse_btn)
+        
+        self.main_layout.addLayout(dir_layout)
+    
+    def create_mode_section(self):
+        """创建重命名模式选择部分"""
+        mode_group = QGroupBox("重命名模式")
+        mode_group.setObjectName("modeGroup")
+        
+        mode_layout = QVBoxLayout()
+        
+        self.to_dot_radio = QRadioButton("将 '-part' 替换为 '.part'")
+        self.to_dash_radio = QRadioButton("将 '.part' 替换为 '-part'")
+        self.rev_to_rar_radio = QRadioButton("将 '.partXX.rev' 替换为 '-partXX.rar'")
+        self.rar_to_rev_radio = QRadioButton("将 '-partXX.rar' 替换为 '.partXX.rev'")
+        
+        self.to_dot_radio.setChecked(True)
+        
+        mode_layout.addWidget(self.to_dot_radio)
+        mode_layout.addWidget(self.to_dash_radio)
+        mode_layout.addWidget(self.rev_to_rar_radio)
+        mode_layout.addWidget(self.rar_to_rev_radio)
+        
+        mode_group.setLayout(mode_layout)
+        self.main_layout.addWidget(mode_group)
+    
+    def create_options_section(self):
+        """创建选项部分"""
+        options_group = QGroupBox("选项")
+        options_group.setObjectName("optionsGroup")
+        
+        # 选项较多，分多行排列
+        options_layout = QGridLayout()
+        
+        self.recursive_check = QCheckBox("递归处理子目录")
+        self.dry_run_check = QCheckBox("模拟运行（不实际修改文件）")
+        self.dry_run_check.setChecked(True)
+        self.cache_check = QCheckBox("使用目录缓存")
+        self.full_rescan_check = QCheckBox("强制完全重新扫描")
+        self.watch_check = QCheckBox("监视新文件")
+        self.volume_sets_check = QCheckBox("分卷整组改名")
+        self.volume_sets_check.setToolTip("编号不完整的分卷组整组跳过，组内任一分卷改名失败则整组回滚")
+        self.verify_check = QCheckBox("校验文件头")
+        self.verify_check.setToolTip("改名前读取文件开头的几个字节，跳过不是真正 RAR/REV 分卷的文件")
+        self.network_check = QCheckBox("网络共享")
+        self.network_check.setToolTip("目录位于 SMB/NFS 等网络共享上时勾选：通过多条连接同时发出"
+                                      "列举和改名请求，掩盖每次调用的网络往返延迟")
+        self.profile_check = QCheckBox("性能剖析")
+        self.profile_check.setToolTip("记录扫描、匹配、改名和日志信号各阶段的耗时并采样调用栈，"
+                                      "结束时在日志中列出热点，并写出 Chrome trace / speedscope 文件")
+        self.dedupe_check = QCheckBox("跳过重复（硬链接）")
+        self.dedupe_check.setToolTip("按 (设备, inode) 去重：硬链接、绑定挂载的重复目录不再扫描，"
+                                     "同一文件的多个硬链接只改名第一个")
+        self.bounded_memory_check = QCheckBox("限制内存")
+        self.bounded_memory_check.setToolTip("用于数千万文件的目录树：模拟运行时不生成完整预览，"
+                                             "完整日志写入临时文件，目录缓存按需查询")
+        
+        options_layout.addWidget(self.recursive_check, 0, 0)
+        options_layout.addWidget(self.dry_run_check, 0, 1)
+        options_layout.addWidget(self.watch_check, 0, 2)
+        options_layout.addWidget(self.cache_check, 1, 0)
+        options_layout.addWidget(self.full_rescan_check, 1, 1)
+        options_layout.addWidget(self.volume_sets_check, 1, 2)
+        options_layout.addWidget(self.bounded_memory_check, 2, 0)
+        options_layout.addWidget(self.verify_check, 2, 1)
+        options_layout.addWidget(self.network_check, 2, 2)
+        
+        # 排除的子目录在遍历时直接跳过，其中的内容不会被列举
+        self.exclude_dirs_edit = QLineEdit()
+        self.exclude_dirs_edit.setPlaceholderText("例如: .git, node_modules, .snapshot（支持通配符，re: 开头为正则）")
+        self.exclude_dirs_edit.setToolTip("名称匹配的子目录不会被进入，逗号分隔多个模式")
+        options_layout.addWidget(QLabel("排除目录:"), 3, 0)
+        options_layout.addWidget(self.exclude_dirs_edit, 3, 1, 1, 2)
+        options_layout.addWidget(self.profile_check, 4, 0)
+        options_layout.addWidget(self.dedupe_check, 4, 1)
+        
+        options_group.setLayout(options_layout)
+        self.main_layout.addWidget(options_group)
+    
+    def create_progress_section(self):
+        """创建进度条和统计面板"""
+        progress_layout = QVBoxLayout()
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setValue(0)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedHeight(10)
+        self.progress_bar.setObjectName("progressBar")
+        
+        self.stats_label = QLabel("")
+        self.stats_label.setObjectName("statsLabel")
+        
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.stats_label)
+        
+        self.main_layout.addLayout(progress_layout)
+    
+    def create_log_section(self):
+        """创建日志显示部分"""
+        log_layout = QVBoxLayout()
+        
+        self.log_label = QLabel("操作日志:")
+        self.log_label.setObjectName("logLabel")
+        
+        # 使用限制行数的纯文本控件，日志再多渲染开销也保持不变
+        self.log_text = QPlainTextEdit()
+        self.log_text.setReadOnly(True)
+        self.log_text.setMaximumBlockCount(LOG_MAX_LINES)
+        self.log_text.setMinimumHeight(200)
+        self.log_text.setObjectName("logText")
+        
+        log_layout.addWidget(self.log_label)
+        log_layout.addWidget(self.log_text)
+        
+        self.main_layout.addLayout(log_layout)
+    
+    def create_queue_section(self):
+        """创建多目录任务队列部分：启动时只有一个展开按钮，表格和按钮在首次展开时才创建"""
+        self.queue_layout = QVBoxLayout()
+        self.queue_group = None
+        self.queue_toggle_btn = QPushButton("任务队列（多个目录） ▸")
+        self.queue_toggle_btn.setObjectName("queueToggleBtn")
+        self.queue_toggle_btn.setCheckable(True)
+        self.queue_toggle_btn.toggled.connect(self.toggle_queue_section)
+        self.queue_layout.addWidget(self.queue_toggle_btn, 0, Qt.AlignLeft)
+        self.main_layout.addLayout(self.queue_layout)
+    
+    def toggle_queue_section(self, checked):
+        """展开或收起任务队列"""
+        if checked and self.queue_group is None:
+            self.build_queue_section()
+        if self.queue_group is not None:
+            self.queue_group.setVisible(checked)
+        self.queue_toggle_btn.setText(f"任务队列（多个目录） {'▾' if checked else '▸'}")
+    
+    def build_queue_section(self):
+        """创建任务队列的表格和按钮（首次展开时调用一次）"""
+        queue_group = QGroupBox("任务队列")
+        queue_group.setObjectName("queueGroup")
+        queue_layout = QVBoxLayout()
+        
+        self.job_table = QTableWidget(0, len(JOB_COLUMNS))
+        self.job_table.setHorizontalHeaderLabels(JOB_COLUMNS)
+        self.job_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.job_table.verticalHeader().setVisible(False)
+        self.job_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.job_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.job_table.setMinimumHeight(120)
+        
+        controls_layout = QHBoxLayout()
+        self.add_job_btn = QPushButton("加入队列")
+        self.add_job_btn.setObjectName("addJobBtn")
+        self.add_job_btn.clicked.connect(self.add_job)
+        self.remove_job_btn = QPushButton("移除选中")
+        self.remove_job_btn.setObjectName("removeJobBtn")
+        self.remove_job_btn.clicked.connect(self.remove_jobs)
+        self.max_running_label = QLabel("同时运行:")
+        self.max_running_spin = QSpinBox()
+        self.max_running_spin.setRange(1, 8)
+        self.max_running_spin.setValue(self.job_queue.max_running)
+        self.max_running_spin.valueChanged.connect(self.set_max_running)
+        self.run_queue_btn = QPushButton("运行队列")
+        self.run_queue_btn.setObjectName("runQueueBtn")
+        self.run_queue_btn.clicked.connect(self.run_queue)
+        self.stop_queue_btn = QPushButton("停止队列")
+        self.stop_queue_btn.setObjectName("stopQueueBtn")
+        self.stop_queue_btn.setEnabled(False)
+        self.stop_queue_btn.clicked.connect(self.stop_queue)
+        
+        controls_layout.addWidget(self.add_job_btn)
+        controls_layout.addWidget(self.remove_job_btn)
+        controls_layout.addStretch(1)
+        controls_layout.addWidget(self.max_running_label)
+        controls_layout.addWidget(self.max_running_spin)
+        controls_layout.addWidget(self.run_queue_btn)
+        controls_layout.addWidget(self.stop_queue_btn)
+        
+        queue_layout.addWidget(self.job_table)
+        queue_layout.addLayout(controls_layout)
+        queue_group.setLayout(queue_layout)
+        self.queue_layout.addWidget(queue_group)
+        self.queue_group = queue_group
+    
+    def create_buttons_section(self):
+        """创建按钮部分"""
+        buttons_layout = QHBoxLayout()
+        
+        self.rename_btn = QPushButton("开始重命名")
+        self.rename_btn.setMinimumHeight(40)
+        self.rename_btn.setObjectName("renameBtn")
+        self.rename_btn.clicked.connect(self.start_rename)
+        
+        self.undo_btn = QPushButton("撤销上次操作")
+        self.undo_btn.setMinimumHeight(40)
+        self.undo_btn.setObjectName("undoBtn")
+        self.undo_btn.clicked.connect(self.undo_last_run)
+        
+        self.pause_btn = QPushButton("暂停")
+        self.pause_btn.setMinimumHeight(40)
+        self.pause_btn.setObjectName("pauseBtn")
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.clicked.connect(self.toggle_pause)
+        
+        self.cancel_btn = QPushButton("取消")
+        self.cancel_btn.setMinimumHeight(40)
+        self.cancel_btn.setObjectName("cancelBtn")
+        self.cancel_btn.setEnabled(False)
+        self.cancel_btn.clicked.connect(self.cancel_rename)
+        
+        self.exit_btn = QPushButton("退出")
+        self.exit_btn.setMinimumHeight(40)
+        self.exit_btn.setObjectName("exitBtn")
+        self.exit_btn.clicked.connect(self.close)
+        
+        buttons_layout.addStretch(1)
+        buttons_layout.addWidget(self.rename_btn)
+        buttons_layout.addWidget(self.pause_btn)
+        buttons_layout.addWidget(self.cancel_btn)
+        buttons_layout.addWidget(self.undo_btn)
+        buttons_layout.addWidget(self.exit_btn)
+        buttons_layout.addStretch(1)
+        
+        self.main_layout.addLayout(buttons_layout)
+    
+    def browse_directory(self):
+        """浏览并选择目录"""
+        directory = QFileDialog.getExistingDirectory(
+            self, "选择目录", self.dir_path.text(), QFileDialog.ShowDirsOnly
+        )
+        
+        if directory:
+            self.dir_path.setText(directory)
+    
+    def log_message(self, message):
+        """添加日志消息"""
+        self.log_text.appendPlainText(message)
+        # 滚动到底部
+        self.log_text.moveCursor(self.log_text.textCursor().End)
+    
+    def log_messages(self, messages):
+        """批量添加日志消息，整批只刷新一次界面"""
+        self.log_message("\n".join(messages))
+    
+    def update_progress(self, snapshot):
+        """根据指标快照更新进度条和统计面板"""
+        # 总量未知，用“已处理目录 / (已处理 + 待处理)”近似进度
+        done = snapshot['dirs_scanned'] + snapshot['dirs_cached']
+        pending = snapshot['dirs_pending']
+        if done + pending:
+            self.progress_bar.setValue(int(1000 * done / (done + pending)))
+        self.stats_label.setText(
+            f"已扫描 {snapshot['files_scanned']} 个文件 ({snapshot['files_per_sec']:.0f}/秒)  "
+            f"已重命名 {snapshot['renamed']} ({snapshot['renames_per_sec']:.0f}/秒)  "
+            f"待处理目录 {pending}  错误 {snapshot['errors']}\n"
+            f"耗时: 扫描 {snapshot['scan_seconds']:.1f}秒  匹配 {snapshot['match_seconds']:.1f}秒  "
+            f"重命名 {snapshot['rename_seconds']:.1f}秒  总计 {snapshot['elapsed']:.1f}秒"
+            + (f"  内存 {snapshot['rss_mb']} MB" if snapshot['rss_mb'] is not None else "")
+        )
+    
+    def update_status(self, message):
+        """更新状态栏消息"""
+        # 由于无边框窗口没有默认状态栏，这里可以考虑添加一个自定义状态栏
+        # 简化处理，使用日志显示
+        self.log_message(f"[状态] {message}")
+    
+    def selected_mode(self):
+        """根据选中的单选按钮确定重命名模式"""
+        if self.to_dash_radio.isChecked():
+            return 'to-dash'
+        if self.rev_to_rar_radio.isChecked():
+            return 'rev-to-rar'
+        if self.rar_to_rev_radio.isChecked():
+            return 'rar-to-rev'
+        return 'to-dot'
+    
+    def start_rename(self):
+        """开始重命名操作"""
+        from .control import Checkpoint
+        from .rules import resolve_ruleset
+        directory = self.dir_path.text()
+        mode = self.selected_mode()
+        
+        recursive = self.recursive_check.isChecked()
+        dry_run = self.dry_run_check.isChecked()
+        use_cache = self.cache_check.isChecked()
+        full_rescan = self.full_rescan_check.isChecked()
+        volume_sets = self.volume_sets_check.isChecked()
+        bounded_memory = self.bounded_memory_check.isChecked()
+        verify = self.verify_check.isChecked()
+        connections = 0
+        if self.network_check.isChecked():
+            from .backends import DEFAULT_CONNECTIONS
+            connections = DEFAULT_CONNECTIONS
+        profile = self.profile_check.isChecked()
+        dedupe = self.dedupe_check.isChecked()
+        
+        # 检查目录是否存在
+        if not os.path.isdir(directory):
+            QMessageBox.critical(self, "错误", f"指定的目录不存在: {directory}")
+            return
+        try:
+            scan_filter = self.make_scan_filter()
+        except ValueError as e:
+            QMessageBox.critical(self, "错误", str(e))
+            return
+        
+        if self.watch_check.isChecked():
+            self.start_watch(directory, mode, recursive, dry_run, scan_filter, verify)
+            return
+        
+        # 预览需要在内存中保存完整计划，限制内存时改为流式模拟运行；剖析时同样流式运行，剖析完整的重命名线程
+        if dry_run and not bounded_memory and not profile:
+            self.start_preview(directory, mode, recursive, use_cache, full_rescan, volume_sets,
+                               scan_filter, verify, connections, dedupe)
+            return
+        
+        # 发现未完成的运行时询问是否从断点继续
+        resume = False
+        state = Checkpoint.for_run(directory, resolve_ruleset(mode)).load()
+        if state is not None:
+            answer = QMessageBox.question(
+                self, "继续上次运行",
+                f"发现上次未完成的运行（最后处理的目录: {state.get('last_dir')}），是否从断点继续？"
+            )
+            resume = answer == QMessageBox.Yes
+        
+        # 清空日志
+        self.log_text.clear()
+        
+        # 创建并启动重命名线程
+        self.rename_thread = RenameThread(directory, mode, recursive, dry_run,
+                                          use_cache, full_rescan, resume=resume,
+                                          volume_sets=volume_sets,
+                                          bounded_memory=bounded_memory,
+                                          scan_filter=scan_filter,
+                                          verify=verify,
+                                          connections=connections,
+                                          profile=profile,
+                                          dedupe=dedupe)
+        log_messages = self.log_messages
+        if profile:
+            # 界面线程中处理日志的耗时同样计入剖析
+            log_messages = self.rename_thread.profiler.tracer.wrap('log_message', log_messages)
+        self.rename_thread.log_signal.connect(log_messages)
+        self.rename_thread.status_signal.connect(self.update_status)
+        self.rename_thread.finished_signal.connect(self.on_rename_finished)
+        self.rename_thread.progress_signal.connect(self.update_progress)
+        self.rename_thread.finished.connect(self.on_thread_stopped)
+        self.rename_thread.start()
+        
+        # 更新UI状态
+        self.progress_bar.setValue(0)
+        self.stats_label.setText("")
+        self.rename_btn.setEnabled(False)
+        self.undo_btn.setEnabled(False)
+        self.pause_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
+        self.update_status("正在处理...")
+    
+    def make_scan_filter(self):
+        """根据“排除目录”创建遍历过滤器（每次运行新建，计数互不影响），为空时返回None"""
+        from .filters import ScanFilter
+        patterns = [p.strip() for p in self.exclude_dirs_edit.text().split(',') if p.strip()]
+        return ScanFilter(exclude_dirs=patterns) if patterns else None
+    
+    def start_preview(self, directory, mode, recursive, use_cache, full_rescan, volume_sets,
+                      scan_filter=None, verify=False, connections=0, dedupe=False):
+        """模拟运行：生成计划后在预览窗口中显示，确认后执行同一计划"""
+        self.log_text.clear()
+        self.rename_thread = PreviewThread(directory, mode, recursive, use_cache, full_rescan,
+                                           volume_sets, scan_filter, verify, connections, dedupe)
+        self.rename_thread.log_signal.connect(self.log_messages)
+        self.rename_thread.status_signal.connect(self.update_status)
+        self.rename_thread.progress_signal.connect(self.update_progress)
+        self.rename_thread.finished.connect(self.on_thread_stopped)
+        self.rename_thread.start()
+        
+        self.progress_bar.setValue(0)
+        self.stats_label.setText("")
+        self.rename_btn.setEnabled(False)
+        self.undo_btn.setEnabled(False)
+        self.pause_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
+        self.update_status("正在生成预览...")
+    
+    def show_preview(self, thread):
+        """显示预览窗口，点击“应用”后执行预览中的计划（不重新扫描）"""
+        dialog = PreviewDialog(thread.plan, thread.skipped_count, self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        self.rename_thread = ApplyThread(thread.directory, thread.mode, thread.recursive,
+                                         thread.plan, thread.skipped_count, thread.volume_sets,
+                                         thread.connections)
+        self.rename_thread.log_signal.connect(self.log_messages)
+        self.rename_thread.status_signal.connect(self.update_status)
+        self.rename_thread.finished_signal.connect(self.on_rename_finished)
+        self.rename_thread.finished.connect(self.on_thread_stopped)
+        self.rename_thread.start()
+        
+        self.rename_btn.setEnabled(False)
+        self.undo_btn.setEnabled(False)
+        self.update_status("正在执行重命名...")
+    
+    def start_watch(self, directory, mode, recursive, dry_run, scan_filter=None, verify=False):
+        """开始监视模式，点击'取消'结束"""
+        self.log_text.clear()
+        self.rename_thread = WatchThread(directory, mode, recursive, dry_run, scan_filter, verify)
+        self.rename_thread.log_signal.connect(self.log_messages)
+        self.rename_thread.status_signal.connect(self.update_status)
+        self.rename_thread.finished.connect(self.on_thread_stopped)
+        self.rename_thread.start()
+        
+        self.progress_bar.setValue(0)
+        self.stats_label.setText("")
+        self.rename_btn.setEnabled(False)
+        self.undo_btn.setEnabled(False)
+        self.pause_btn.setEnabled(True)
+        self.cancel_btn.setEnabled(True)
+        self.update_status("正在处理...")
+    
+    def toggle_pause(self):
+        """暂停或继续当前的重命名"""
+        control = self.rename_thread.control
+        if control.paused:
+            control.resume()
+            self.pause_btn.setText("暂停")
+            self.update_status("继续处理...")
+        else:
+            control.pause()
+            self.pause_btn.setText("继续")
+            self.update_status("已暂停")
+    
+    def cancel_rename(self):
+        """取消当前的重命名（在下一个目录边界停止并保存断点）"""
+        self.rename_thread.control.cancel()
+        self.pause_btn.setEnabled(False)
+        self.cancel_btn.setEnabled(False)
+        self.update_status("正在取消...")
+    
+    def on_thread_stopped(self):
+        """后台线程结束（完成、取消或出错）后恢复按钮状态"""
+        self.rename_btn.setEnabled(True)
+        self.undo_btn.setEnabled(True)
+        self.pause_btn.setEnabled(False)
+        self.pause_btn.setText("暂停")
+        self.cancel_btn.setEnabled(False)
+        if (isinstance(self.rename_thread, (RenameThread, PreviewThread))
+                and not self.rename_thread.control.cancelled):
+            self.progress_bar.setValue(self.progress_bar.maximum())
+        if isinstance(self.rename_thread, PreviewThread) and self.rename_thread.plan is not None:
+            self.show_preview(self.rename_thread)
+    
+    def add_job(self):
+        """把当前选择的目录、模式和选项加入任务队列"""
+        directory = self.dir_path.text()
+        if not os.path.isdir(directory):
+            QMessageBox.critical(self, "错误", f"指定的目录不存在: {directory}")
+            return
+        job = self.job_queue.add(Job(directory, self.selected_mode(),
+                                     self.recursive_check.isChecked(),
+                                     self.dry_run_check.isChecked()))
+        self.job_table.insertRow(self.job_table.rowCount())
+        self.update_job_row(job)
+        if self.queue_active:
+            self.schedule_jobs()
+    
+    def remove_jobs(self):
+        """移除选中的未在运行的任务"""
+        rows = sorted({index.row() for index in self.job_table.selectedIndexes()}, reverse=True)
+        for row in rows:
+            job = self.job_queue.jobs[row]
+            if job.status != JOB_RUNNING:
+                self.job_queue.remove(job)
+                self.job_table.removeRow(row)
+    
+    def update_job_row(self, job):
+        """刷新任务在表格中的一行"""
+        row = self.job_queue.jobs.index(job)
+        values = (job.directory, job.mode, "是" if job.recursive else "否",
+                  "是" if job.dry_run else "否", job.status_text, job.files_scanned,
+                  job.renamed, job.skipped, job.errors + job.conflicts)
+        for column, value in enumerate(values):
+            item = self.job_table.item(row, column)
+            if item is None:
+                item = QTableWidgetItem()
+                self.job_table.setItem(row, column, item)
+            item.setText(str(value))
+        self.job_table.item(row, 0).setToolTip(job.message or job.directory)
+    
+    def set_max_running(self, value):
+        """修改同时运行的任务数，调大时立即启动等待中的任务"""
+        self.job_queue.max_running = value
+        if self.queue_active:
+            self.schedule_jobs()
+    
+    def run_queue(self):
+        """开始按队列顺序运行任务"""
+        self.job_queue.start_batch()
+        self.queue_active = True
+        self.run_queue_btn.setEnabled(False)
+        self.stop_queue_btn.setEnabled(True)
+        self.schedule_jobs()
+    
+    def stop_queue(self):
+        """取消等待中的任务，并取消正在运行的任务（保存断点）"""
+        self.job_queue.cancel_pending()
+        for thread in self.job_threads.values():
+            thread.control.cancel()
+        for job in self.job_queue.jobs:
+            self.update_job_row(job)
+        self.stop_queue_btn.setEnabled(False)
+    
+    def schedule_jobs(self):
+        """启动所有当前可以开始的任务；队列全部结束时恢复按钮"""
+        for job in self.job_queue.start_ready():
+            thread = RenameThread(job.directory, job.mode, job.recursive, job.dry_run)
+            thread.status_signal.connect(partial(self.on_job_status, job))
+            thread.progress_signal.connect(partial(self.on_job_progress, job))
+            thread.finished_signal.connect(partial(self.on_job_done, job))
+            thread.finished.connect(partial(self.on_job_stopped, job))
+            self.job_threads[job.id] = thread
+            thread.start()
+            self.update_job_row(job)
+        if self.job_queue.idle():
+            self.queue_active = False
+            self.run_queue_btn.setEnabled(True)
+            self.stop_queue_btn.setEnabled(False)
+            self.update_status("任务队列已全部结束")
+    
+    def on_job_status(self, job, message):
+        job.message = message
+        self.log_message(f"[任务 {job.id}] {message}")
+    
+    def on_job_progress(self, job, snapshot):
+        job.files_scanned = snapshot['files_scanned']
+        job.renamed = snapshot['renamed']
+        job.skipped = snapshot['skipped']
+        job.errors = snapshot['errors']
+        job.conflicts = snapshot['conflicts']
+        self.update_job_row(job)
+    
+    def on_job_done(self, job, renamed_count, skipped_count):
+        job.renamed = renamed_count
+        job.skipped = skipped_count
+        self.job_queue.finish(job, JOB_DONE)
+    
+    def on_job_stopped(self, job):
+        """任务线程结束：未正常完成的任务记为已取消或失败，然后调度下一个任务"""
+        thread = self.job_threads.pop(job.id)
+        job.journal_path = thread.journal_path
+        if job.status == JOB_RUNNING:
+            self.job_queue.finish(job, JOB_CANCELLED if thread.control.cancelled else JOB_FAILED)
+        self.update_job_row(job)
+        self.schedule_jobs()
+    
+    def closeEvent(self, event):
+        """关闭窗口时先取消并等待后台线程，避免中途强行终止"""
+        self.job_queue.cancel_pending()
+        threads = list(self.job_threads.values())
+        if self.rename_thread is not None and self.rename_thread.isRunning():
+            threads.append(self.rename_thread)
+        for thread in threads:
+            control = getattr(thread, 'control', None)
+            if control is not None:
+                control.cancel()
+        for thread in threads:
+            thread.wait()
+        event.accept()
+    
+    def undo_last_run(self):
+        """撤销上次实际执行的重命名；上次是任务队列时撤销这一批中的所有任务"""
+        from .journal import latest_journal, read_journal_meta
+        journal_path = latest_journal()
+        if journal_path is None:
+            QMessageBox.information(self, "撤销", "没有可撤销的运行记录。")
+            return
+        batch = self.job_queue.batch_journals()
+        batch_paths = [os.path.abspath(path) for _, path in batch]
+        if len(batch) > 1 and os.path.abspath(journal_path) in batch_paths:
+            # 最近的日志属于上一批任务（之后没有单独运行过）：整批按结束的相反顺序撤销
+            journal_paths = [path for _, path in batch]
+            directories = "\n".join(f"  任务 {job.id}: {job.directory}" for job, _ in batch)
+            question = f"将撤销上次任务队列中 {len(batch)} 个任务的重命名操作:\n{directories}\n\n是否继续？"
+        else:
+            try:
+                meta = read_journal_meta(journal_path)
+            except (OSError, ValueError) as e:
+                QMessageBox.critical(self, "错误", f"无法读取撤销日志: {e}")
+                return
+            journal_paths = [journal_path]
+            question = f"将撤销目录 '{meta.get('directory', '')}' 中的上次重命名操作，是否继续？"
+        answer = QMessageBox.question(self, "撤销上次操作", question)
+        if answer != QMessageBox.Yes:
+            return
+        
+        self.log_text.clear()
+        self.rename_thread = UndoThread(journal_paths)
+        self.rename_thread.log_signal.connect(self.log_messages)
+        self.rename_thread.status_signal.connect(self.update_status)
+        self.rename_thread.finished_signal.connect(self.on_undo_finished)
+        self.rename_thread.finished.connect(self.on_thread_stopped)
+        self.rename_thread.start()
+        
+        self.rename_btn.setEnabled(False)
+        self.undo_btn.setEnabled(False)
+        self.update_status("正在撤销...")
+    
+    def on_undo_finished(self, restored_count, error_count, conflict_count=0):
+        """撤销完成后的回调函数"""
+        result_msg = f"撤销完成!\n\n已恢复的文件: {restored_count}\n恢复失败的文件: {error_count}"
+        if conflict_count:
+            result_msg += f"\n原文件名已被占用（未覆盖）的文件: {conflict_count}"
+        if error_count == 0 and conflict_count == 0:
+            QMessageBox.information(self, "撤销完成", result_msg)
+        else:
+            QMessageBox.warning(self, "撤销完成", result_msg)
+    
+    def on_rename_finished(self, renamed_count, skipped_count):
+        """重命名完成后的回调函数"""
+        # 显示操作结果对话框
+        result_msg = f"操作完成!\n\n已重命名的文件: {renamed_count}\n未修改的文件: {skipped_count}"
+        if renamed_count > 0:
+            QMessageBox.information(self, "操作完成", result_msg)
+        else:
+            QMessageBox.warning(self, "操作完成", result_msg + "\n\n未找到需要重命名的文件。")
+
+def install_styles(app):
+    """把共享样式表设置到应用上；同一个应用只设置一次，所有窗口共用解析结果"""
+    if app.property('rename_files_styles'):
+        return
+    app.setStyleSheet(app.styleSheet() + APP_STYLESHEET)
+    app.setProperty('rename_files_styles', True)
+
+def main(startup=None, exit_after_paint=False):
+    """启动图形界面
+
+    startup 为启动脚本创建的 StartupTimer（为None时从这里开始计时）；
+    exit_after_paint 为True时窗口首次绘制后输出启动耗时 JSON 并退出（用于测量启动耗时）。
+    """
+    if startup is None:
+        startup = StartupTimer()
+    
+    # 确保中文显示正常
+    os.environ["QT_FONT_DPI"] = "96"
+    
+    # 启用高DPI支持
+    QApplication.setHighDpiScaleFactorRoundingPolicy(Qt.HighDpiScaleFactorRoundingPolicy.PassThrough)
+    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling)
+    QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps)
+    
+    app = QApplication(sys.argv)
+    # 设置应用全局样式（所有控件的样式表只解析一次）
+    install_styles(app)
+    startup.mark(PHASE_APP)
+    
+    window = FileRenamerApp(startup)
+    startup.mark(PHASE_WINDOW)
+    if exit_after_paint:
+        window.first_painted.connect(app.quit)
+        QTimer.singleShot(STARTUP_TIMEOUT_MS, app.quit)
+    window.show()
+    code = app.exec_()
+    if exit_after_paint:
+        import json
+        print(json.dumps(startup.report(), ensure_ascii=False), flush=True)
+        # 超时仍未绘制时视为失败
+        return code if startup.has(PHASE_FIRST_PAINT) else 1
+    return code
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""按 (设备, inode) 去重：同一个物理目录或文件在一次运行中只处理一次
+
+硬链接、绑定挂载（bind mount）会让同一份分卷出现在多个路径下，逐个路径遍历时工作量随路径数增长；
+把父目录绑定挂载到子目录下还会形成环，遍历永远不会结束。InodeIndex 记录已处理的 (st_dev, st_ino)：
+遍历进入目录前先查询，已处理过的目录（连同其整个子树）不再列举；待改名的文件中有多个硬链接
+（st_nlink > 1）的，只改名第一次遇到的路径，其余路径保持原名；按分卷组处理时以整组为单位去重。
+
+索引只保存在内存中，按设备分组，每个条目只是集合中的一个整数；普通文件（只有一个链接）不进入索引。
+指向目录的符号链接本来就不会被递归（与 os.walk 相同），不需要额外处理。
+"""
+import os
+
+
+class InodeIndex:
+    """已处理的目录和多链接文件的 (设备, inode) 集合
+
+    stat 用于目录（跟随符号链接，与列举一致），file_stat 用于待改名的文件（不跟随符号链接，
+    符号链接与其目标是不同的目录项）；使用存储后端时两者都为后端的 stat。
+    claim_dir/unique_matches 只在遍历线程中调用；seen 可在预取线程中调用。
+    dirs_deduped/files_deduped 为跳过的重复目录数和重复文件数。
+    """
+    def __init__(self, stat=os.stat, file_stat=os.lstat):
+        self.stat = stat
+        self.file_stat = file_stat
+        # 设备号 -> inode 号集合
+        self._seen = {}
+        self.dirs_deduped = 0
+        self.files_deduped = 0
+
+    def __len__(self):
+        return sum(len(inodes) for inodes in self._seen.values())
+
+    def key(self, path):
+        """目录的 (设备, inode)；无法访问时返回None（由列举报告错误）"""
+        try:
+            st = self.stat(path)
+        except OSError:
+            return None
+        return st.st_dev, st.st_ino
+
+    def seen(self, key):
+        """key 是否已经处理过"""
+        if key is None:
+            return False
+        inodes = self._seen.get(key[0])
+        return inodes is not None and key[1] in inodes
+
+    def _claim(self, dev, ino):
+        inodes = self._seen.get(dev)
+        if inodes is None:
+            inodes = self._seen[dev] = set()
+        elif ino in inodes:
+            return False
+        inodes.add(ino)
+        return True
+
+    def claim_dir(self, key):
+        """第一次遇到该目录时返回True；已处理过（重复路径）时计数并返回False"""
+        if key is None or self._claim(*key):
+            return True
+        self.dirs_deduped += 1
+        return False
+
+    def unique_matches(self, root, matches, group_of=None):
+        """去掉 matches [(旧名, 新名), ...] 中已经通过其他硬链接处理过的文件（保持原顺序）
+
+        group_of 不为None时按分卷组整体去重：组内所有分卷都已处理过才去掉整组，
+        否则整组保留，避免只改名组内的一部分分卷。
+        """
+        file_stat = self.file_stat
+        join = os.path.join
+        fresh = []
+        for match in matches:
+            try:
+                st = file_stat(join(root, match[0]))
+            except OSError:
+                fresh.append(True)
+                continue
+            fresh.append(st.st_nlink <= 1 or self._claim(st.st_dev, st.st_ino))
+        if group_of is not None:
+            # 组内还有未处理过的分卷时，组内已处理过的分卷也保留
+            live = {group_of(old) for (old, _), keep in zip(matches, fresh) if keep}
+            live.discard(None)
+            if live:
+                fresh = [keep or group_of(old) in live for (old, _), keep in zip(matches, fresh)]
+        kept = [match for match, keep in zip(matches, fresh) if keep]
+        self.files_deduped += len(matches) - len(kept)
+        return kept
@@ -0,0 +1,122 @@
+"""多目录任务队列：限制同时运行的任务数，同一物理设备上的任务串行执行
+
+调度逻辑与执行方式无关（图形界面用 RenameThread 执行），只在调用方线程中使用。
+"""
+import itertools
+import os
+
+# 任务状态
+JOB_PENDING = 'pending'
+JOB_RUNNING = 'running'
+JOB_DONE = 'done'
+JOB_FAILED = 'failed'
+JOB_CANCELLED = 'cancelled'
+
+JOB_STATUS_TEXT = {
+    JOB_PENDING: '等待中',
+    JOB_RUNNING: '运行中',
+    JOB_DONE: '已完成',
+    JOB_FAILED: '失败',
+    JOB_CANCELLED: '已取消',
+}
+
+_job_ids = itertools.count(1)
+
+
+def device_of(path):
+    """目录所在的设备号，无法访问时返回None（不参与串行约束）"""
+    try:
+        return os.stat(path).st_dev
+    except OSError:
+        return None
+
+
+class Job:
+    """一个目录的重命名任务及其运行结果"""
+    def __init__(self, directory, mode, recursive=False, dry_run=True):
+        self.id = next(_job_ids)
+        self.directory = directory
+        self.mode = mode
+        self.recursive = recursive
+        self.dry_run = dry_run
+        self.device = device_of(directory)
+        self.status = JOB_PENDING
+        self.renamed = 0
+        self.skipped = 0
+        self.errors = 0
+        self.conflicts = 0
+        self.files_scanned = 0
+        self.message = ''
+        # 实际重命名时写入的撤销日志路径（没有改名时日志文件会被删除）
+        self.journal_path = None
+
+    @property
+    def status_text(self):
+        return JOB_STATUS_TEXT[self.status]
+
+
+class JobQueue:
+    """按加入顺序调度任务
+
+    同时运行的任务不超过 max_running 个；与正在运行的任务位于同一设备的任务
+    继续等待（避免多个任务争抢同一块磁盘），后面其他设备上的任务可以先开始。
+    """
+    def __init__(self, max_running=2):
+        self.max_running = max(1, max_running)
+        self.jobs = []
+        # 最近一次运行队列时结束的任务（按结束顺序），撤销时整批回滚
+        self.batch = []
+
+    def add(self, job):
+        self.jobs.append(job)
+        return job
+
+    def remove(self, job):
+        """移除未在运行的任务"""
+        if job.status != JOB_RUNNING:
+            self.jobs.remove(job)
+
+    def running(self):
+        return [job for job in self.jobs if job.status == JOB_RUNNING]
+
+    def start_ready(self):
+        """选出现在可以开始的任务，将其标记为运行中并返回"""
+        running = self.running()
+        busy = {job.device for job in running if job.device is not None}
+        started = []
+        for job in self.jobs:
+            if len(running) + len(started) >= self.max_running:
+                break
+            if job.status != JOB_PENDING:
+                continue
+            if job.device is not None and job.device in busy:
+                continue
+            job.status = JOB_RUNNING
+            if job.device is not None:
+                busy.add(job.device)
+            started.append(job)
+        return started
+
+    def start_batch(self):
+        """开始运行队列：此后结束的任务组成新的一批"""
+        self.batch = []
+
+    def finish(self, job, status):
+        """任务结束（JOB_DONE/JOB_FAILED/JOB_CANCELLED）"""
+        job.status = status
+        self.batch.append(job)
+
+    def batch_journals(self):
+        """最近一批任务中仍可撤销的日志 [(任务, 日志路径), ...]，后结束的在前（撤销顺序）"""
+        return [(job, job.journal_path) for job in reversed(self.batch)
+                if job.journal_path is not None and os.path.exists(job.journal_path)]
+
+    def cancel_pending(self):
+        """取消所有尚未开始的任务"""
+        for job in self.jobs:
+            if job.status == JOB_PENDING:
+                job.status = JOB_CANCELLED
+
+    def idle(self):
+        """没有等待或运行中的任务"""
+        return all(job.status not in (JOB_PENDING, JOB_RUNNING) for job in self.jobs)
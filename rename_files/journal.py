@@ -0,0 +1,222 @@
+"""撤销日志：追加写入每次实际执行的重命名，可按相反顺序整批回滚
+
+文件格式（二进制，紧凑且可在崩溃后读取已写入的部分）:
+    b'RFJ1' + u32 元数据长度 + 元数据JSON
+    b'D' + u32 路径长度 + 目录绝对路径      （目录按出现顺序编号）
+    b'R' + u32 目录编号 + u16 旧名长度 + 旧名 + u16 新名长度 + 新名
+"""
+import json
+import os
+import struct
+import threading
+import time
+
+from .cache import default_cache_dir
+from .planner import OP_RENAME
+
+MAGIC = b'RFJ1'
+JOURNAL_SUFFIX = '.rfj'
+UNDONE_SUFFIX = '.undone'
+
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_RENAME = struct.Struct('<IH')
+
+
+def _encode(text):
+    return os.fsencode(text) if isinstance(text, str) else text
+
+
+def default_journal_dir():
+    """默认撤销日志目录"""
+    return os.path.join(default_cache_dir(), 'journal')
+
+
+class Journal:
+    """追加写入的撤销日志，按批次 fsync 以免写日志成为新的瓶颈
+
+    每累计 sync_every 条记录或距上次同步超过 sync_interval 秒时写盘并 fsync；
+    多个执行线程可以同时调用 record。
+    """
+    def __init__(self, path, meta=None, sync_every=1000, sync_interval=1.0):
+        self.path = path
+        self.sync_every = sync_every
+        self.sync_interval = sync_interval
+        self.count = 0
+        self._dir_ids = {}
+        self._buffer = bytearray()
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'xb')
+        meta_bytes = json.dumps(meta or {}, ensure_ascii=False).encode('utf-8')
+        self._file.write(MAGIC + _U32.pack(len(meta_bytes)) + meta_bytes)
+
+    @classmethod
+    def create(cls, directory, mode, journal_dir=None, **options):
+        """为一次运行创建新的日志文件"""
+        journal_dir = journal_dir or default_journal_dir()
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        meta = {'directory': os.path.abspath(directory), 'mode': mode, 'time': time.time()}
+        # 同一进程一秒内多次运行时加序号区分
+        for n in range(1000):
+            suffix = f"-{n}" if n else ''
+            path = os.path.join(journal_dir, f"{stamp}-{os.getpid()}{suffix}{JOURNAL_SUFFIX}")
+            try:
+                return cls(path, meta, **options)
+            except FileExistsError:
+                continue
+        raise FileExistsError(f"无法创建撤销日志: {path}")
+
+    def record(self, root, old, new):
+        """记录一次成功的重命名"""
+        with self._lock:
+            buf = self._buffer
+            dir_id = self._dir_ids.get(root)
+            if dir_id is None:
+                dir_id = self._dir_ids[root] = len(self._dir_ids)
+                # 保存绝对路径：撤销可能在其他工作目录中进行
+                root_bytes = _encode(os.path.abspath(root))
+                buf += b'D' + _U32.pack(len(root_bytes)) + root_bytes
+            old_bytes = _encode(old)
+            new_bytes = _encode(new)
+            buf += (b'R' + _RENAME.pack(dir_id, len(old_bytes)) + old_bytes
+                    + _U16.pack(len(new_bytes)) + new_bytes)
+            self.count += 1
+            self._unsynced += 1
+            if (self._unsynced >= self.sync_every
+                    or time.monotonic() - self._last_sync >= self.sync_interval):
+                self._sync()
+
+    def flush(self):
+        """立即写入并同步已缓冲的记录（长时间运行的监视模式在每批之后调用）"""
+        with self._lock:
+            if self._file is not None and self._unsynced:
+                self._sync()
+
+    def _sync(self):
+        if self._buffer:
+            self._file.write(self._buffer)
+            self._buffer = bytearray()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """写入剩余记录并关闭；没有任何记录的日志会被删除"""
+        with self._lock:
+            if self._file is None:
+                return
+            self._sync()
+            self._file.close()
+            self._file = None
+        if self.count == 0:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _read_meta(data, path):
+    if data[:4] != MAGIC:
+        raise ValueError(f"不是有效的撤销日志: {path}")
+    (meta_len,) = _U32.unpack_from(data, 4)
+    meta = json.loads(data[8:8 + meta_len].decode('utf-8'))
+    return meta, 8 + meta_len
+
+
+def read_journal_meta(path):
+    """只读取日志的元数据（目录、模式、时间）"""
+    with open(path, 'rb') as f:
+        head = f.read(8)
+        if len(head) == 8 and head[:4] == MAGIC:
+            head += f.read(_U32.unpack_from(head, 4)[0])
+    return _read_meta(head, path)[0]
+
+
+def read_journal(path):
+    """读取日志，返回 (元数据, [(目录, 旧名, 新名), ...])；末尾不完整的记录会被忽略"""
+    with open(path, 'rb') as f:
+        data = f.read()
+    meta, pos = _read_meta(data, path)
+
+    dirs = []
+    records = []
+    size = len(data)
+    fsdecode = os.fsdecode
+    try:
+        while pos < size:
+            tag = data[pos:pos + 1]
+            pos += 1
+            if tag == b'D':
+                (n,) = _U32.unpack_from(data, pos)
+                pos += 4
+                if pos + n > size:
+                    break
+                dirs.append(fsdecode(data[pos:pos + n]))
+                pos += n
+            elif tag == b'R':
+                dir_id, n = _RENAME.unpack_from(data, pos)
+                pos += _RENAME.size
+                old = data[pos:pos + n]
+                pos += n
+                (m,) = _U16.unpack_from(data, pos)
+                pos += 2
+                if pos + m > size:
+                    break
+                new = data[pos:pos + m]
+                pos += m
+                records.append((dirs[dir_id], fsdecode(old), fsdecode(new)))
+            else:
+                break
+    except struct.error:
+        # 崩溃时最后一条记录可能只写了一半
+        pass
+    return meta, records
+
+
+def list_journals(journal_dir=None):
+    """按时间从新到旧列出尚未撤销的日志文件"""
+    journal_dir = journal_dir or default_journal_dir()
+    try:
+        names = [name for name in os.listdir(journal_dir) if name.endswith(JOURNAL_SUFFIX)]
+    except OSError:
+        return []
+    paths = [os.path.join(journal_dir, name) for name in names]
+    paths.sort(key=lambda p: (os.path.getmtime(p), p), reverse=True)
+    return paths
+
+
+def latest_journal(journal_dir=None):
+    """最近一次运行的日志文件，没有时返回None"""
+    journals = list_journals(journal_dir)
+    return journals[0] if journals else None
+
+
+def undo_shards(records):
+    """把日志记录转换为回滚用的分片 [(目录, [操作, ...]), ...]
+
+    每个目录内按相反顺序执行 新名 -> 旧名，包括循环改名时使用的临时名。
+    """
+    by_dir = {}
+    for root, old, new in records:
+        by_dir.setdefault(root, []).append((root, OP_RENAME, new, old, new))
+    shards = []
+    for root in reversed(list(by_dir)):
+        operations = by_dir[root]
+        operations.reverse()
+        shards.append((root, operations))
+    return shards
+
+
+def mark_undone(path):
+    """回滚完成后标记日志，避免重复撤销"""
+    os.replace(path, path + UNDONE_SUFFIX)
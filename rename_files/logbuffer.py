@@ -0,0 +1,66 @@
+"""日志缓冲：按条数或时间间隔把日志合并成批次，减少跨线程信号数量"""
+import os
+import tempfile
+import time
+
+
+class LogBuffer:
+    """收集日志行，满 max_lines 条或距上次发送超过 interval 秒时整批发送
+
+    emit 为接收一个字符串列表的回调（例如 Qt 信号的 emit）。
+    """
+    def __init__(self, emit, max_lines=500, interval=0.05, clock=time.monotonic):
+        self.emit = emit
+        self.max_lines = max_lines
+        self.interval = interval
+        self.clock = clock
+        self.lines = []
+        self.last_flush = clock()
+
+    def append(self, line):
+        """追加一行日志，必要时触发发送"""
+        self.lines.append(line)
+        if len(self.lines) >= self.max_lines:
+            self.flush()
+        else:
+            self.poll()
+
+    def poll(self):
+        """检查时间间隔，到期则发送已缓冲的日志"""
+        if self.lines and self.clock() - self.last_flush >= self.interval:
+            self.flush()
+
+    def flush(self):
+        """立即发送所有已缓冲的日志"""
+        self.last_flush = self.clock()
+        if self.lines:
+            lines, self.lines = self.lines, []
+            self.emit(lines)
+
+
+class LogSpool:
+    """把全部日志行写入临时文件（限制内存模式下界面只保留最近的日志）
+
+    写入经过缓冲，内存占用与日志行数无关；文件在运行结束后保留供查看。
+    """
+    def __init__(self, directory=None, prefix='rename_files-'):
+        fd, self.path = tempfile.mkstemp(prefix=prefix, suffix='.log', dir=directory)
+        self._file = os.fdopen(fd, 'w', encoding='utf-8', errors='surrogateescape',
+                               buffering=1 << 16)
+        self.count = 0
+
+    def write(self, line):
+        self._file.write(line)
+        self._file.write('\n')
+        self.count += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
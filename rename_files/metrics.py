@@ -0,0 +1,157 @@
+"""运行指标：吞吐量、待处理目录数以及扫描/匹配/重命名各阶段耗时"""
+import json
+import os
+import sys
+import time
+from time import perf_counter
+
+try:
+    import resource
+except ImportError:
+    # Windows 没有 resource 模块，内存指标不可用
+    resource = None
+
+_MB = 1024 * 1024
+
+# 剖析模式（profiling 模块）：trace 只做阶段计时；cprofile 另外用 cProfile 剖析运行线程；
+# sample 另外采样所有线程的调用栈。定义在这里，命令行不必为了参数取值导入剖析模块
+PROFILE_TRACE = 'trace'
+PROFILE_CPROFILE = 'cprofile'
+PROFILE_SAMPLE = 'sample'
+PROFILE_MODES = (PROFILE_TRACE, PROFILE_CPROFILE, PROFILE_SAMPLE)
+
+
+def peak_rss():
+    """进程的峰值常驻内存（字节），无法获取时返回None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def current_rss():
+    """进程当前的常驻内存（字节）；没有 /proc 时退回峰值，都无法获取时返回None"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss()
+
+
+def to_mb(size):
+    """字节数转换为MB（保留一位小数），None 保持不变"""
+    return None if size is None else round(size / _MB, 1)
+
+
+class RunMetrics:
+    """由引擎在目录粒度上更新的运行指标
+
+    计时只在目录边界和结果迭代时进行，每个文件不额外调用计时函数，开销可以忽略。
+    tracer（profiling.Tracer）不为None时同时记录每一步的阶段事件，用于性能剖析。
+    """
+    def __init__(self, interval=0.5, tracer=None):
+        self.interval = interval
+        self.tracer = tracer
+        self.start = perf_counter()
+        self.files_scanned = 0
+        self.scan_seconds = 0.0
+        self.match_seconds = 0.0
+        self.rename_seconds = 0.0
+        self._last_emit = self.start
+        self._last_files = 0
+        self._last_renamed = 0
+
+    def timed(self, iterator, phase):
+        """包装迭代器，把每次取下一个元素的耗时累加到 phase（scan/match/rename）"""
+        attr = phase + '_seconds'
+        iterator = iter(iterator)
+        tracer = self.tracer
+        while True:
+            t0 = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                setattr(self, attr, getattr(self, attr) + perf_counter() - t0)
+                return
+            t1 = perf_counter()
+            setattr(self, attr, getattr(self, attr) + t1 - t0)
+            if tracer is not None:
+                tracer.add(phase, t0, t1)
+            yield item
+
+    def due(self):
+        """距上次输出是否已超过输出间隔"""
+        return perf_counter() - self._last_emit >= self.interval
+
+    def snapshot(self, engine):
+        """生成当前指标（速率为距上次快照的瞬时值）"""
+        now = perf_counter()
+        window = max(now - self._last_emit, 1e-9)
+        walker = engine.walker
+        snap = {
+            'elapsed': round(now - self.start, 3),
+            'files_scanned': self.files_scanned,
+            'files_per_sec': round((self.files_scanned - self._last_files) / window, 1),
+            'renamed': engine.renamed_count,
+            'renames_per_sec': round((engine.renamed_count - self._last_renamed) / window, 1),
+            'skipped': engine.skipped_count,
+            'errors': engine.error_count,
+            'conflicts': engine.conflict_count,
+            'dirs_scanned': engine.dirs_scanned,
+            'dirs_cached': engine.dirs_cached,
+            'dirs_pruned': engine.dirs_pruned,
+            'dirs_deduped': engine.dirs_deduped,
+            'files_deduped': engine.files_deduped,
+            'dirs_pending': len(walker.stack) if walker is not None else 0,
+            'scan_seconds': round(self.scan_seconds, 3),
+            'match_seconds': round(self.match_seconds, 3),
+            'rename_seconds': round(self.rename_seconds, 3),
+            'rss_mb': to_mb(current_rss()),
+            'peak_rss_mb': to_mb(peak_rss()),
+        }
+        self._last_emit = now
+        self._last_files = self.files_scanned
+        self._last_renamed = engine.renamed_count
+        return snap
+
+
+# Prometheus textfile 中的指标：(快照字段, 指标名, 类型, 说明)
+_PROMETHEUS_METRICS = (
+    ('files_scanned', 'rename_files_files_scanned_total', 'counter', 'Files listed'),
+    ('renamed', 'rename_files_renamed_total', 'counter', 'Files renamed'),
+    ('skipped', 'rename_files_skipped_total', 'counter', 'Files left unchanged'),
+    ('errors', 'rename_files_errors_total', 'counter', 'Failed renames'),
+    ('conflicts', 'rename_files_conflicts_total', 'counter', 'Renames skipped due to conflicts'),
+    ('dirs_scanned', 'rename_files_dirs_scanned_total', 'counter', 'Directories listed'),
+    ('dirs_cached', 'rename_files_dirs_cached_total', 'counter', 'Directories served from cache'),
+    ('dirs_pending', 'rename_files_dirs_pending', 'gauge', 'Directories waiting to be listed'),
+    ('files_per_sec', 'rename_files_files_per_second', 'gauge', 'Current listing throughput'),
+    ('renames_per_sec', 'rename_files_renames_per_second', 'gauge', 'Current rename throughput'),
+    ('elapsed', 'rename_files_elapsed_seconds', 'gauge', 'Run time so far'),
+)
+
+
+def write_prometheus_textfile(path, snapshot, labels=None):
+    """以 Prometheus node_exporter textfile 格式原子地写入指标"""
+    label_text = ''
+    if labels:
+        label_text = '{' + ','.join(f'{k}={json.dumps(str(v))}' for k, v in labels.items()) + '}'
+    lines = []
+    for key, name, kind, help_text in _PROMETHEUS_METRICS:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        lines.append(f"{name}{label_text} {snapshot[key]}")
+    name = 'rename_files_phase_seconds_total'
+    lines.append(f"# HELP {name} Time spent per phase")
+    lines.append(f"# TYPE {name} counter")
+    for phase in ('scan', 'match', 'rename'):
+        phase_labels = dict(labels or {}, phase=phase)
+        phase_text = '{' + ','.join(f'{k}={json.dumps(str(v))}' for k, v in phase_labels.items()) + '}'
+        lines.append(f"{name}{phase_text} {snapshot[phase + '_seconds']}")
+    lines.append(f"rename_files_last_update_timestamp_seconds{label_text} {time.time():.3f}")
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(tmp_path, path)
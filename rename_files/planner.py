@@ -0,0 +1,381 @@
+"""两阶段重命名：先在内存中生成完整计划（检测冲突、链式依赖和循环），再批量执行"""
+import os
+from array import array
+
+from .volumes import index_volumes, is_complete, volume_group
+
+# 操作类型
+OP_RENAME = 0
+OP_TO_TEMP = 1      # 打破循环：先改为临时名
+OP_FROM_TEMP = 2    # 打破循环：再由临时名改为目标名
+
+# 冲突原因
+CONFLICT_EXISTS = 0
+CONFLICT_DUPLICATE = 1
+CONFLICT_BLOCKED = 2
+CONFLICT_INCOMPLETE = 3
+CONFLICT_VOLUME_SET = 4
+CONFLICT_NOT_VOLUME = 5
+
+CONFLICT_REASONS = (
+    "目标文件已存在",
+    "多个文件将被重命名为同一名称",
+    "目标文件无法先行改名",
+    "分卷不完整或编号不连续",
+    "同组的其他分卷存在冲突",
+    "文件头不是有效的RAR/REV分卷",
+)
+
+# 执行时同组分卷失败而回滚/跳过的说明
+VOLUME_SET_FAILED = "同组的其他分卷改名失败，整组已回滚"
+# 执行时（no_replace）发现目标已存在的说明，结果报告为冲突而不是错误
+TARGET_EXISTS = CONFLICT_REASONS[CONFLICT_EXISTS]
+
+
+class RenamePlan:
+    """紧凑的重命名计划
+
+    所有操作按执行顺序保存在平行数组中，目录路径只保存一次，
+    避免为每个文件创建字典或对象；百万级计划也只占用少量内存。
+    重命名只发生在同一目录内，因此冲突检测和排序都按目录独立进行。
+    """
+    def __init__(self):
+        self.dirs = []
+        self._dir_index = {}
+        # 操作表
+        self.op_dir = array('I')
+        self.op_kind = array('b')
+        self.op_old = []
+        self.op_new = []
+        # 临时名操作对应的原始文件名 {操作序号: 原文件名}
+        self.op_origin = {}
+        # 冲突表
+        self.conflict_dir = array('I')
+        self.conflict_reason = array('b')
+        self.conflict_old = []
+        self.conflict_new = []
+        self.rename_count = 0
+
+    def __len__(self):
+        return len(self.op_old)
+
+    def _dir_id(self, root):
+        idx = self._dir_index.get(root)
+        if idx is None:
+            idx = self._dir_index[root] = len(self.dirs)
+            self.dirs.append(root)
+        return idx
+
+    def _add_op(self, dir_id, kind, old, new, origin=None):
+        if origin is not None:
+            self.op_origin[len(self.op_old)] = origin
+        self.op_dir.append(dir_id)
+        self.op_kind.append(kind)
+        self.op_old.append(old)
+        self.op_new.append(new)
+        if kind != OP_TO_TEMP:
+            self.rename_count += 1
+
+    def _add_conflict(self, dir_id, reason, old, new):
+        self.conflict_dir.append(dir_id)
+        self.conflict_reason.append(reason)
+        self.conflict_old.append(old)
+        self.conflict_new.append(new)
+
+    def add_directory(self, root, existing, matches, volume_sets=False, rejected=None):
+        """将一个目录中的匹配结果加入计划
+
+        existing 为目录中现有的全部名称（文件和子目录），
+        matches 为 [(旧文件名, 新文件名), ...]。
+        volume_sets 为True时按分卷组处理：不完整的组整组跳过，组内任一分卷冲突则整组跳过。
+        rejected 为未通过内容校验的旧文件名集合，这些文件不改名（按分卷组处理时整组跳过）。
+        """
+        if not matches:
+            return
+        dir_id = self._dir_id(root)
+        key = os.path.normcase
+
+        groups = None
+        if volume_sets:
+            index = index_volumes(existing)
+            groups = {}
+            kept = []
+            for old, new in matches:
+                group = volume_group(old)
+                if group is not None:
+                    if not is_complete(index[group]):
+                        self._add_conflict(dir_id, CONFLICT_INCOMPLETE, old, new)
+                        continue
+                    groups[key(old)] = group
+                kept.append((old, new))
+            matches = kept
+
+        failed_groups = set()
+        if rejected:
+            kept = []
+            for old, new in matches:
+                if old in rejected:
+                    self._add_conflict(dir_id, CONFLICT_NOT_VOLUME, old, new)
+                    if groups is not None and key(old) in groups:
+                        failed_groups.add(groups[key(old)])
+                else:
+                    kept.append((old, new))
+            matches = kept
+
+        # 按目标名建立哈希索引，检测多个文件改为同一名称
+        by_target = {}
+        for old, new in matches:
+            by_target.setdefault(key(new), []).append(old)
+        sources = {}
+        for old, new in matches:
+            if len(by_target[key(new)]) > 1:
+                self._add_conflict(dir_id, CONFLICT_DUPLICATE, old, new)
+                if groups is not None and key(old) in groups:
+                    failed_groups.add(groups[key(old)])
+            else:
+                sources[key(old)] = (old, new)
+
+        # 目标已存在且不会被移走的视为冲突；冲突会沿依赖链向上传递
+        existing_keys = {key(name) for name in existing}
+        matched_keys = {key(old) for old, _ in matches}
+        by_new = {key(new): src_key for src_key, (old, new) in sources.items()}
+        pending = []
+        for src_key, (old, new) in sources.items():
+            new_key = key(new)
+            if new_key in existing_keys and new_key not in sources and new_key != src_key:
+                # 目标本身也要改名但已冲突时，属于被阻塞
+                reason = CONFLICT_BLOCKED if new_key in matched_keys else CONFLICT_EXISTS
+                pending.append((src_key, reason))
+        members = {}
+        if groups:
+            for src_key in sources:
+                group = groups.get(src_key)
+                if group is not None:
+                    members.setdefault(group, []).append(src_key)
+            for group in failed_groups:
+                pending.extend((src_key, CONFLICT_VOLUME_SET) for src_key in members.get(group, ()))
+        while pending:
+            src_key, reason = pending.pop()
+            if src_key not in sources:
+                continue
+            old, new = sources.pop(src_key)
+            self._add_conflict(dir_id, reason, old, new)
+            # 占用当前文件名的操作也无法执行
+            blocked = by_new.get(src_key)
+            if blocked is not None:
+                pending.append((blocked, CONFLICT_BLOCKED))
+            # 同组分卷整组跳过
+            group = groups.get(src_key) if groups else None
+            if group is not None and group not in failed_groups:
+                failed_groups.add(group)
+                pending.extend((mate, CONFLICT_VOLUME_SET) for mate in members[group])
+
+        # 剩余的映射中每个目标最多被一个源占用，图由若干条链和环组成
+        targeted = {key(new) for _, new in sources.values()}
+        done = set()
+        # 链：从不被任何操作占用的源出发，倒序执行
+        for src_key in list(sources):
+            if src_key in targeted or src_key in done:
+                continue
+            chain = []
+            cur = src_key
+            while cur in sources and cur not in done:
+                done.add(cur)
+                chain.append(cur)
+                cur = key(sources[cur][1])
+            for k in reversed(chain):
+                old, new = sources[k]
+                self._add_op(dir_id, OP_RENAME, old, new)
+        # 环：借助临时名打破
+        serial = 0
+        for src_key in list(sources):
+            if src_key in done:
+                continue
+            cycle = []
+            cur = src_key
+            while cur not in done:
+                done.add(cur)
+                cycle.append(cur)
+                cur = key(sources[cur][1])
+            first_old, first_new = sources[cycle[0]]
+            while True:
+                temp = f".{first_old}.rename-tmp-{os.getpid()}-{serial}"
+                serial += 1
+                if key(temp) not in existing_keys and key(temp) not in targeted:
+                    break
+            self._add_op(dir_id, OP_TO_TEMP, first_old, temp)
+            for k in reversed(cycle[1:]):
+                old, new = sources[k]
+                self._add_op(dir_id, OP_RENAME, old, new)
+            self._add_op(dir_id, OP_FROM_TEMP, temp, first_new, origin=first_old)
+
+    def operations(self):
+        """按执行顺序产出 (目录, 操作类型, 旧名, 新名, 原始文件名)"""
+        dirs = self.dirs
+        origin = self.op_origin
+        for i, (dir_id, kind, old, new) in enumerate(zip(self.op_dir, self.op_kind,
+                                                         self.op_old, self.op_new)):
+            yield dirs[dir_id], kind, old, new, origin.get(i, old)
+
+    def conflicts(self):
+        """产出 (目录, 旧名, 新名, 冲突原因说明)"""
+        dirs = self.dirs
+        for dir_id, reason, old, new in zip(self.conflict_dir, self.conflict_reason,
+                                            self.conflict_old, self.conflict_new):
+            yield dirs[dir_id], old, new, CONFLICT_REASONS[reason]
+
+    def shards(self):
+        """按目录分组产出 (目录, [操作, ...])，同一目录的操作保持原有顺序"""
+        shard = []
+        current = None
+        for op in self.operations():
+            if op[0] != current:
+                if shard:
+                    yield current, shard
+                current = op[0]
+                shard = []
+            shard.append(op)
+        if shard:
+            yield current, shard
+
+    @property
+    def conflict_count(self):
+        return len(self.conflict_old)
+
+
+def rename_in_dir(root, old, new):
+    """在目录 root 中把 old 改名为 new"""
+    os.rename(os.path.join(root, old), os.path.join(root, new))
+
+
+def name_exists(root, name):
+    """目录 root 中是否存在 name（不跟随符号链接）"""
+    return os.path.lexists(os.path.join(root, name))
+
+
+def execute_operations(operations, rename=rename_in_dir, on_renamed=None, group_of=None,
+                       exists=name_exists, no_replace=False):
+    """按顺序执行计划中的操作，产出 (目录, 原文件名, 新名, 错误信息或None)
+
+    rename 为 rename(目录, 旧名, 新名) 形式的函数，exists(目录, 名称) 用于回滚前检查原名是否已被占用；
+    on_renamed(目录, 旧名, 新名) 在每次实际改名成功后调用（包括临时名），用于撤销日志。
+    某个文件改名失败时，仍占用着它名字的依赖操作会被跳过，
+    避免后续操作覆盖尚未移走的文件。
+
+    给出 group_of(原文件名) 时按组原子执行（返回None的文件不属于任何组）：
+    同一组的结果缓存到该组全部操作执行完才产出；组内任一操作失败时，
+    已完成的操作按相反顺序改回原名，其余操作不再执行，整组都报告为失败。
+
+    no_replace 为True时每次改名前检查目标是否已存在，存在时不改名并以 TARGET_EXISTS 报告
+    （计划生成后目录可能已经变化，如撤销时原文件名又被占用、预览确认前新建了同名文件）。
+    """
+    remaining = {}
+    if group_of is not None:
+        operations = list(operations)
+        for root, kind, old, new, origin in operations:
+            group = group_of(origin)
+            if group is not None:
+                remaining[root, group] = remaining.get((root, group), 0) + 1
+    done = {}
+    buffered = {}
+    failed_groups = set()
+
+    failed = set()
+    temp_errors = {}
+    current_root = None
+
+    def fail_group(slot, results):
+        """组内有操作失败：回滚已完成的操作，之前的成功结果改为失败"""
+        failed_groups.add(slot)
+        root = slot[0]
+        for old, new in reversed(done.pop(slot, [])):
+            if exists(root, old):
+                continue
+            try:
+                rename(root, new, old)
+            except OSError:
+                continue
+            if on_renamed is not None:
+                on_renamed(root, new, old)
+            failed.add(old)
+        results[:] = [(r, o, n, VOLUME_SET_FAILED if err is None else err)
+                      for r, o, n, err in results]
+
+    for root, kind, old, new, origin in operations:
+        if root != current_root:
+            current_root = root
+            failed.clear()
+            temp_errors.clear()
+        group = group_of(origin) if group_of is not None else None
+        slot = (root, group) if group is not None else None
+        results = buffered.setdefault(slot, []) if slot is not None else []
+
+        if slot in failed_groups:
+            failed.add(old)
+            if kind == OP_FROM_TEMP and old in temp_errors:
+                results.append((root, origin, new, temp_errors.pop(old)))
+            elif kind != OP_TO_TEMP:
+                results.append((root, origin, new, VOLUME_SET_FAILED))
+        elif kind == OP_FROM_TEMP and old in temp_errors:
+            # 改为临时名时已失败，原文件仍在原处
+            failed.add(old)
+            results.append((root, origin, new, temp_errors.pop(old)))
+            if slot is not None:
+                fail_group(slot, results)
+        elif new in failed:
+            failed.add(old)
+            if slot is not None:
+                # 临时名由回滚恢复
+                results.append((root, origin, new, CONFLICT_REASONS[CONFLICT_BLOCKED]))
+                fail_group(slot, results)
+            else:
+                error = CONFLICT_REASONS[CONFLICT_BLOCKED]
+                if kind == OP_FROM_TEMP:
+                    # 无法完成循环时把临时名恢复为原文件名；原文件名已被循环中的
+                    # 其他文件占用时保留临时名，不能覆盖
+                    if exists(root, origin):
+                        error = f"{error}，原文件名已被占用，文件保留为 '{old}'"
+                    else:
+                        try:
+                            rename(root, old, origin)
+                        except OSError as e:
+                            error = f"{error}，无法恢复原文件名，文件保留为 '{old}': {e}"
+                        else:
+                            if on_renamed is not None:
+                                on_renamed(root, old, origin)
+                if kind != OP_TO_TEMP:
+                    results.append((root, origin, new, error))
+        else:
+            error = None
+            # 只改大小写时目标就是文件自身（不区分大小写的文件系统上 exists 为True）
+            if (no_replace and os.path.normcase(new) != os.path.normcase(old)
+                    and exists(root, new)):
+                error = TARGET_EXISTS
+            else:
+                try:
+                    rename(root, old, new)
+                except OSError as e:
+                    error = str(e)
+            if error is not None:
+                failed.add(old)
+                if kind == OP_TO_TEMP:
+                    temp_errors[new] = error
+                else:
+                    results.append((root, origin, new, error))
+                if slot is not None:
+                    fail_group(slot, results)
+            else:
+                if on_renamed is not None:
+                    on_renamed(root, old, new)
+                if slot is not None:
+                    done.setdefault(slot, []).append((old, new))
+                if kind != OP_TO_TEMP:
+                    results.append((root, origin, new, None))
+
+        if slot is None:
+            yield from results
+            continue
+        remaining[slot] -= 1
+        if not remaining[slot]:
+            done.pop(slot, None)
+            yield from buffered.pop(slot)
@@ -0,0 +1,85 @@
+"""重命名计划的预览视图：在 RenamePlan 的平行数组上筛选和排序，不复制文件名
+
+每一行用一个整数引用计划中的数据：非负数为操作序号，负数 -(i+1) 为第 i 个冲突；
+筛选和排序只生成新的引用数组，百万行的预览也只多占用几 MB 内存。
+"""
+from array import array
+
+from .planner import CONFLICT_REASONS, OP_TO_TEMP
+
+# 预览表格的列
+PREVIEW_COLUMNS = ("原文件名", "新文件名", "目录", "状态")
+COL_OLD, COL_NEW, COL_DIR, COL_STATUS = range(4)
+
+STATUS_PENDING = "待重命名"
+
+
+class PlanView:
+    """RenamePlan 的只读表格视图"""
+    def __init__(self, plan):
+        self.plan = plan
+        refs = array('i', (i for i, kind in enumerate(plan.op_kind) if kind != OP_TO_TEMP))
+        refs.extend(range(-1, -plan.conflict_count - 1, -1))
+        # _ordered 为排序后的全部行，rows 为筛选后实际显示的行
+        self._all = refs
+        self._ordered = refs
+        self._filter = ''
+        self.rows = refs
+        self.rename_count = plan.rename_count
+        self.conflict_count = plan.conflict_count
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _cell(self, ref, column):
+        plan = self.plan
+        if ref >= 0:
+            if column == COL_OLD:
+                return plan.op_origin.get(ref, plan.op_old[ref])
+            if column == COL_NEW:
+                return plan.op_new[ref]
+            if column == COL_DIR:
+                return plan.dirs[plan.op_dir[ref]]
+            return STATUS_PENDING
+        i = -ref - 1
+        if column == COL_OLD:
+            return plan.conflict_old[i]
+        if column == COL_NEW:
+            return plan.conflict_new[i]
+        if column == COL_DIR:
+            return plan.dirs[plan.conflict_dir[i]]
+        return "冲突: " + CONFLICT_REASONS[plan.conflict_reason[i]]
+
+    def cell(self, row, column):
+        """第 row 行（筛选、排序后）第 column 列的文本"""
+        return self._cell(self.rows[row], column)
+
+    def row(self, row):
+        """第 row 行的 (原文件名, 新文件名, 目录, 状态)"""
+        ref = self.rows[row]
+        return tuple(self._cell(ref, column) for column in range(len(PREVIEW_COLUMNS)))
+
+    def sort(self, column, descending=False):
+        """按列排序；column 小于0时恢复计划中的执行顺序"""
+        if column < 0:
+            self._ordered = self._all
+        else:
+            cell = self._cell
+            self._ordered = array('i', sorted(self._all, key=lambda ref: cell(ref, column),
+                                              reverse=descending))
+        self._apply_filter()
+
+    def set_filter(self, text):
+        """只显示原文件名、新文件名、目录或状态中包含 text 的行（不区分大小写）"""
+        self._filter = text.lower()
+        self._apply_filter()
+
+    def _apply_filter(self):
+        text = self._filter
+        if not text:
+            self.rows = self._ordered
+            return
+        cell = self._cell
+        columns = range(len(PREVIEW_COLUMNS))
+        self.rows = array('i', (ref for ref in self._ordered
+                                if any(text in cell(ref, column).lower() for column in columns)))
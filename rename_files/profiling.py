@@ -0,0 +1,328 @@
+"""性能剖析：按阶段计时并导出 Chrome trace，可选 cProfile 或采样剖析器
+
+阶段计时（Tracer）记录列举、匹配、校验、生成计划、改名以及界面日志信号各自的耗时，
+导出的 trace JSON 可在 chrome://tracing、Perfetto 或 speedscope 中打开；
+采样剖析器每隔几毫秒记录所有线程的调用栈，导出 speedscope 格式。
+只在启用剖析时创建这些对象，未启用时调用方持有None，运行路径上只多一次 None 判断。
+"""
+import cProfile
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from time import perf_counter
+
+from .cache import default_cache_dir
+from .metrics import PROFILE_CPROFILE, PROFILE_MODES, PROFILE_SAMPLE, PROFILE_TRACE
+
+# 单个事件写入 trace 的上限，超出后只累计各阶段的总耗时
+MAX_TRACE_EVENTS = 200000
+DEFAULT_SAMPLE_INTERVAL = 0.005
+# 日志中列出的热点数
+DEFAULT_TOP = 15
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+# 采样时视为空闲的栈顶函数（线程池等待任务、等待锁等），不计入样本
+_IDLE_FUNCTIONS = frozenset((
+    ('threading.py', 'wait'),
+    ('threading.py', '_wait_for_tstate_lock'),
+    ('queue.py', 'get'),
+    ('selectors.py', 'select'),
+))
+
+
+def default_profile_dir():
+    """默认的剖析结果目录"""
+    return os.path.join(default_cache_dir(), 'profiles')
+
+
+def _format_seconds(seconds):
+    return f"{seconds:.3f}s" if seconds >= 0.001 else f"{seconds * 1e6:.0f}us"
+
+
+def _location(filename, line, name):
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+class Tracer:
+    """线程安全的阶段计时，记录 (阶段, 线程, 开始时间, 时长, 参数)
+
+    超过 max_events 后不再保存单个事件（dropped 计数），但各阶段的次数、总耗时和最慢一次仍然准确。
+    """
+    def __init__(self, max_events=MAX_TRACE_EVENTS):
+        self.origin = perf_counter()
+        self.max_events = max_events
+        self.events = []
+        self.dropped = 0
+        # 阶段名 -> [次数, 总耗时, 最长一次, 最长一次的参数]
+        self.totals = {}
+        self.threads = {}
+        self._lock = threading.Lock()
+
+    def add(self, name, start, end, args=None):
+        """记录一个阶段事件（start/end 为 perf_counter 时间）"""
+        duration = end - start
+        tid = threading.get_ident()
+        with self._lock:
+            if tid not in self.threads:
+                self.threads[tid] = threading.current_thread().name
+            total = self.totals.get(name)
+            if total is None:
+                total = self.totals[name] = [0, 0.0, 0.0, None]
+            total[0] += 1
+            total[1] += duration
+            if duration > total[2]:
+                total[2] = duration
+                total[3] = args
+            if len(self.events) < self.max_events:
+                self.events.append((name, tid, start, duration, args))
+            else:
+                self.dropped += 1
+
+    @contextmanager
+    def span(self, name, args=None):
+        """计时一个代码块"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, perf_counter(), args)
+
+    def wrap(self, name, func):
+        """返回计时每次调用的包装函数"""
+        add = self.add
+
+        def traced(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                add(name, start, perf_counter())
+        return traced
+
+    def chrome_trace(self):
+        """Chrome trace 格式（完整事件 "X"，时间单位为微秒）"""
+        pid = os.getpid()
+        origin = self.origin
+        events = [{'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': tid,
+                   'args': {'name': name}} for tid, name in self.threads.items()]
+        for name, tid, start, duration, args in self.events:
+            event = {'name': name, 'cat': 'phase', 'ph': 'X', 'pid': pid, 'tid': tid,
+                     'ts': round((start - origin) * 1e6, 1), 'dur': round(duration * 1e6, 1)}
+            if args:
+                event['args'] = args
+            events.append(event)
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'dropped_events': self.dropped}}
+
+    def summary_lines(self):
+        """按总耗时排列的各阶段统计"""
+        lines = []
+        for name, (count, seconds, longest, args) in sorted(
+                self.totals.items(), key=lambda item: item[1][1], reverse=True):
+            line = (f"  {name}: 共 {_format_seconds(seconds)}，{count} 次，"
+                    f"最长 {_format_seconds(longest)}")
+            if args:
+                line += f"（{', '.join(f'{k}={v}' for k, v in args.items())}）"
+            lines.append(line)
+        return lines
+
+
+class Sampler:
+    """采样剖析器：后台线程每隔 interval 秒记录其他所有线程的调用栈（只用标准库）
+
+    栈顶位于等待锁、等待队列等空闲函数中的样本不计入。
+    """
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        # (线程ID, 调用栈) -> 样本数，调用栈为 ((文件, 行号, 函数名), ...)，根在前
+        self.samples = Counter()
+        self.threads = {}
+        self.total = 0
+        self.started = None
+        self.stopped = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started = perf_counter()
+        self._thread = threading.Thread(target=self._run, name='profile-sampler', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.stopped = perf_counter()
+
+    def _run(self):
+        own = threading.get_ident()
+        samples = self.samples
+        while not self._stop.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == own:
+                    continue
+                if tid not in self.threads:
+                    self.threads.update((thread.ident, thread.name)
+                                        for thread in threading.enumerate())
+                    self.threads.setdefault(tid, str(tid))
+                code = frame.f_code
+                if (os.path.basename(code.co_filename), code.co_name) in _IDLE_FUNCTIONS:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append((code.co_filename, code.co_firstlineno, code.co_name))
+                    frame = frame.f_back
+                stack.reverse()
+                samples[tid, tuple(stack)] += 1
+                self.total += 1
+
+    def speedscope(self, name='rename_files'):
+        """speedscope 文件格式，每个线程一个 sampled 剖面，权重单位为秒"""
+        frames = []
+        frame_index = {}
+        profiles = {}
+        for (tid, stack), count in self.samples.items():
+            indexes = []
+            for key in stack:
+                index = frame_index.get(key)
+                if index is None:
+                    index = frame_index[key] = len(frames)
+                    frames.append({'name': key[2], 'file': key[0], 'line': key[1]})
+                indexes.append(index)
+            profile = profiles.setdefault(tid, ([], []))
+            profile[0].append(indexes)
+            profile[1].append(count * self.interval)
+        end = (self.stopped or perf_counter()) - self.started
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'rename_files',
+            'shared': {'frames': frames},
+            'profiles': [{'type': 'sampled', 'name': self.threads.get(tid, str(tid)),
+                          'unit': 'seconds', 'startValue': 0, 'endValue': end,
+                          'samples': samples, 'weights': weights}
+                         for tid, (samples, weights) in profiles.items()],
+        }
+
+    def hot_spots(self, top=DEFAULT_TOP):
+        """自身样本最多的函数：[(函数位置, 自身秒数, 包含子调用的秒数), ...]"""
+        own = Counter()
+        inclusive = Counter()
+        for (_, stack), count in self.samples.items():
+            own[stack[-1]] += count
+            for key in set(stack):
+                inclusive[key] += count
+        return [(_location(*key), count * self.interval, inclusive[key] * self.interval)
+                for key, count in own.most_common(top)]
+
+
+class Profiler:
+    """一次运行的剖析：阶段计时总是启用，mode 为 cprofile/sample 时另外运行对应的剖析器
+
+    start()/stop() 应在被剖析的运行线程中调用（cProfile 只剖析调用 start 的线程，
+    采样剖析器覆盖所有线程）；write() 把结果写入 output_dir，report_lines() 生成写入日志的摘要。
+    """
+    def __init__(self, mode=PROFILE_TRACE, output_dir=None, sample_interval=DEFAULT_SAMPLE_INTERVAL,
+                 top=DEFAULT_TOP):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"未知的剖析方式: {mode}")
+        self.mode = mode
+        self.output_dir = output_dir or default_profile_dir()
+        self.top = top
+        self.tracer = Tracer()
+        self.sampler = Sampler(sample_interval) if mode == PROFILE_SAMPLE else None
+        self.cprofile = cProfile.Profile() if mode == PROFILE_CPROFILE else None
+        self.paths = {}
+        self.seconds = None
+        self._start = None
+
+    def start(self):
+        self._start = perf_counter()
+        if self.sampler is not None:
+            self.sampler.start()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+
+    def stop(self):
+        if self._start is None:
+            return
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        if self.sampler is not None:
+            self.sampler.stop()
+        self.seconds = perf_counter() - self._start
+        self._start = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def write(self, name='rename'):
+        """写出 trace（以及 speedscope / cProfile 数据），返回 {种类: 路径}"""
+        os.makedirs(self.output_dir, exist_ok=True)
+        base = os.path.join(self.output_dir,
+                            f"{name}-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}")
+        paths = {'trace': base + '.trace.json'}
+        with open(paths['trace'], 'w', encoding='utf-8') as f:
+            json.dump(self.tracer.chrome_trace(), f, ensure_ascii=False)
+        if self.sampler is not None:
+            paths['speedscope'] = base + '.speedscope.json'
+            with open(paths['speedscope'], 'w', encoding='utf-8') as f:
+                json.dump(self.sampler.speedscope(name), f, ensure_ascii=False)
+        if self.cprofile is not None:
+            paths['pstats'] = base + '.prof'
+            self.cprofile.dump_stats(paths['pstats'])
+        self.paths = paths
+        return paths
+
+    def hot_spots(self):
+        """热点函数 [(函数位置, 自身秒数, 包含子调用的秒数), ...]，只做阶段计时时为空"""
+        if self.sampler is not None:
+            return self.sampler.hot_spots(self.top)
+        if self.cprofile is not None:
+            stats = pstats.Stats(self.cprofile).stats
+            ranked = sorted(stats.items(), key=lambda item: item[1][2], reverse=True)
+            return [(_location(*key), tt, ct) for key, (_, _, tt, ct, _) in ranked[:self.top]]
+        return []
+
+    def report_lines(self):
+        """写入日志的摘要：各阶段耗时、热点函数和输出文件"""
+        lines = ["性能剖析:"]
+        if self.seconds is not None:
+            lines.append(f"  总耗时 {_format_seconds(self.seconds)}")
+        lines.append("各阶段耗时:")
+        lines.extend(self.tracer.summary_lines())
+        if self.tracer.dropped:
+            lines.append(f"  （超过 {self.tracer.max_events} 个事件，trace 中省略了 {self.tracer.dropped} 个）")
+        spots = self.hot_spots()
+        if spots:
+            lines.append(f"热点函数（前 {len(spots)} 个，按自身耗时）:")
+            lines.extend(f"  {own:8.3f}s  {total:8.3f}s  {where}" for where, own, total in spots)
+        for kind, path in self.paths.items():
+            lines.append(f"{kind}: {path}")
+        return lines
+
+    def summary(self):
+        """供命令行输出的结构化摘要"""
+        return {
+            'mode': self.mode,
+            'seconds': None if self.seconds is None else round(self.seconds, 4),
+            'phases': {name: {'count': count, 'seconds': round(seconds, 4),
+                              'max_seconds': round(longest, 6)}
+                       for name, (count, seconds, longest, _) in self.tracer.totals.items()},
+            'hot_spots': [{'function': where, 'self_seconds': round(own, 4),
+                           'total_seconds': round(total, 4)}
+                          for where, own, total in self.hot_spots()],
+            'files': self.paths,
+        }
@@ -0,0 +1,230 @@
+"""重命名规则：预编译的匹配正则 + 替换模板，可从配置文件加载规则链"""
+import json
+import os
+import re
+
+
+class Rule:
+    """单条重命名规则
+
+    pattern 为正则表达式，template 为 re.sub 风格的替换模板；
+    count 为最多替换次数（0表示全部替换，与 str.replace 相同）；
+    literal 为匹配前必须包含的子串，用于快速过滤不相关的文件名。
+    """
+    def __init__(self, name, pattern, template, description=None, count=0,
+                 literal=None, ignore_case=False):
+        self.name = name
+        self.pattern = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+        self.template = template
+        self.description = description or name
+        self.count = count
+        self.literal = literal
+        self.ignore_case = ignore_case
+        # 忽略大小写时子串过滤不再可靠
+        if ignore_case:
+            self.literal = None
+
+    def apply(self, filename):
+        """返回新文件名，不匹配时返回None"""
+        if self.literal is not None and self.literal not in filename:
+            return None
+        new_filename, n = self.pattern.subn(self.template, filename, count=self.count)
+        return new_filename if n else None
+
+    def to_dict(self):
+        """转换为配置文件中的字典格式"""
+        return {
+            'name': self.name,
+            'pattern': self.pattern.pattern,
+            'replace': self.template,
+            'description': self.description,
+            'count': self.count,
+            'literal': self.literal,
+            'ignore_case': self.ignore_case,
+        }
+
+    def __repr__(self):
+        return f"Rule({self.name!r}, {self.pattern.pattern!r}, {self.template!r})"
+
+
+def _lines_containing(text, literals):
+    """在换行拼接的文件名列表中找出包含任一子串的行，按出现顺序产出
+
+    查找由 str.find / 正则在C中完成，Python循环只针对命中的行。
+    """
+    find = text.find
+    rfind = text.rfind
+    size = len(text)
+    if len(literals) == 1:
+        literal = literals[0]
+        pos = find(literal)
+        while pos >= 0:
+            start = rfind('\n', 0, pos) + 1
+            end = find('\n', pos)
+            if end < 0:
+                end = size
+            yield text[start:end]
+            pos = find(literal, end)
+        return
+    # 较长的子串在前，避免被其前缀抢先匹配（只影响命中位置，不影响命中哪一行）
+    search = re.compile('|'.join(re.escape(lit) for lit in
+                                 sorted(literals, key=len, reverse=True))).search
+    m = search(text)
+    while m is not None:
+        pos = m.start()
+        start = rfind('\n', 0, pos) + 1
+        end = find('\n', pos)
+        if end < 0:
+            end = size
+        yield text[start:end]
+        m = search(text, end)
+
+
+class RuleSet:
+    """有序规则链：按顺序尝试每条规则，第一条匹配的规则生效
+
+    多条规则时先用合并后的单个正则（或公共子串）过滤，
+    绝大多数不匹配的文件名只需匹配一次。
+    """
+    def __init__(self, rules, name=None, description=None):
+        self.rules = list(rules)
+        if not self.rules:
+            raise ValueError("规则链不能为空")
+        self.name = name or '+'.join(rule.name for rule in self.rules)
+        self.description = description or '；'.join(rule.description for rule in self.rules)
+        self._prefilter = self._build_prefilter()
+        self._batch_literals = self._build_batch_literals()
+
+    def _build_prefilter(self):
+        """构造预过滤器，返回 filename -> bool 的函数或None"""
+        if len(self.rules) == 1:
+            return None
+        literals = [rule.literal for rule in self.rules]
+        if all(literals):
+            literals = tuple(set(literals))
+            return lambda filename: any(lit in filename for lit in literals)
+        # 每条规则放在独立的非捕获组中合并为一个正则
+        parts = []
+        for rule in self.rules:
+            flags = 'i' if rule.ignore_case else '-i'
+            parts.append(f"(?{flags}:{rule.pattern.pattern})")
+        try:
+            combined = re.compile('|'.join(parts))
+        except re.error:
+            # 含反向引用等无法合并的规则时退回逐条匹配
+            return None
+        search = combined.search
+        return lambda filename: search(filename) is not None
+
+    def _build_batch_literals(self):
+        """整批匹配使用的子串；有规则没有子串过滤时返回None（只能逐个匹配）"""
+        literals = [rule.literal for rule in self.rules]
+        if not all(literals) or any('\n' in lit for lit in literals):
+            return None
+        return tuple(dict.fromkeys(literals))
+
+    def match_batch(self, filenames):
+        """一次匹配整个目录列表，返回 [(旧文件名, 新文件名), ...]（按列表顺序）
+
+        把文件名用换行拼接后在C中查找规则子串，只对包含子串的行调用 apply，
+        大多数文件不匹配的超大目录不再逐个文件执行Python代码。结果与逐个调用 apply
+        完全相同（不匹配或新旧文件名相同的不返回）；规则没有子串、文件名中含换行符时
+        退回逐个匹配。
+        """
+        literals = self._batch_literals
+        if literals is None or not filenames:
+            return self._match_each(filenames)
+        text = '\n'.join(filenames)
+        if text.count('\n') != len(filenames) - 1:
+            return self._match_each(filenames)
+        return self._match_each(_lines_containing(text, literals))
+
+    def _match_each(self, filenames):
+        apply = self.apply
+        matches = []
+        for filename in filenames:
+            new_filename = apply(filename)
+            if new_filename is not None and new_filename != filename:
+                matches.append((filename, new_filename))
+        return matches
+
+    def apply(self, filename):
+        """返回新文件名，所有规则都不匹配时返回None"""
+        prefilter = self._prefilter
+        if prefilter is not None and not prefilter(filename):
+            return None
+        for rule in self.rules:
+            new_filename = rule.apply(filename)
+            if new_filename is not None:
+                return new_filename
+        return None
+
+    def key(self):
+        """规则链的唯一标识（用于缓存等场景）"""
+        return json.dumps([rule.to_dict() for rule in self.rules], sort_keys=True,
+                          ensure_ascii=False)
+
+    def __repr__(self):
+        return f"RuleSet({self.name!r}, {self.rules!r})"
+
+
+# 内置的四种重命名模式
+BUILTIN_RULES = {
+    'to-dot': Rule('to-dot', re.escape('-part'), '.part',
+                   "将 '-part' 替换为 '.part'", literal='-part'),
+    'to-dash': Rule('to-dash', re.escape('.part'), '-part',
+                    "将 '.part' 替换为 '-part'", literal='.part'),
+    'rev-to-rar': Rule('rev-to-rar', r'(.+)(\.part)(\d+)(\.rev)$', r'\g<1>-part\g<3>.rar',
+                       "将 '.partXX.rev' 替换为 '-partXX.rar'", count=1, literal='.part'),
+    'rar-to-rev': Rule('rar-to-rev', r'(.+)(-part)(\d+)(\.rar)$', r'\g<1>.part\g<3>.rev',
+                       "将 '-partXX.rar' 替换为 '.partXX.rev'", count=1, literal='-part'),
+}
+
+
+def builtin_ruleset(mode):
+    """获取内置模式对应的规则链"""
+    if mode not in BUILTIN_RULES:
+        raise ValueError(f"未知的重命名模式: {mode}")
+    rule = BUILTIN_RULES[mode]
+    return RuleSet([rule], name=mode, description=rule.description)
+
+
+def rule_from_dict(data):
+    """根据配置字典创建规则，可用 "builtin" 引用内置规则"""
+    if 'builtin' in data:
+        if data['builtin'] not in BUILTIN_RULES:
+            raise ValueError(f"未知的内置规则: {data['builtin']}")
+        return BUILTIN_RULES[data['builtin']]
+    try:
+        return Rule(data['name'], data['pattern'], data['replace'],
+                    description=data.get('description'),
+                    count=data.get('count', 0),
+                    literal=data.get('literal'),
+                    ignore_case=data.get('ignore_case', False))
+    except KeyError as e:
+        raise ValueError(f"规则缺少字段: {e.args[0]}") from None
+    except re.error as e:
+        raise ValueError(f"规则 '{data.get('name')}' 的正则表达式无效: {e}") from None
+
+
+def load_rules(path):
+    """从JSON配置文件加载规则链
+
+    文件内容为规则列表，或形如 {"name": ..., "description": ..., "rules": [...]} 的对象。
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        data = {'rules': data}
+    name = data.get('name') or os.path.splitext(os.path.basename(path))[0]
+    rules = [rule_from_dict(item) for item in data.get('rules', [])]
+    return RuleSet(rules, name=name, description=data.get('description'))
+
+
+def resolve_ruleset(mode):
+    """将模式名或规则链统一转换为 RuleSet"""
+    if isinstance(mode, RuleSet):
+        return mode
+    if isinstance(mode, Rule):
+        return RuleSet([mode], name=mode.name, description=mode.description)
+    return builtin_ruleset(mode)
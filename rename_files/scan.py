@@ -0,0 +1,138 @@
+"""基于 os.scandir 的目录遍历，可选使用线程池并行扫描子目录"""
+import os
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# 一个目录的列举结果：files 为文件名，dirs 为需要继续遍历的子目录名；
+# cached_skipped 不为None时表示结果来自目录缓存，值为该目录中被跳过的文件数
+DirListing = namedtuple('DirListing', ['path', 'files', 'dirs', 'cached_skipped'],
+                        defaults=(None,))
+
+
+def scan_dir(path):
+    """列举单个目录，利用 DirEntry 自带的类型信息区分文件和子目录
+
+    与 os.walk 一致：指向目录的符号链接既不算文件也不会被递归；
+    无法访问的目录返回None。
+    """
+    files = []
+    dirs = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry.name)
+                elif not entry.is_symlink():
+                    dirs.append(entry.name)
+    except OSError:
+        return None
+    return DirListing(path, files, dirs)
+
+
+class TreeWalker:
+    """按 os.walk(topdown=True) 的顺序产出 DirListing
+
+    recursive 为False时只列举顶层目录；max_depth 限制递归深度（0表示仅顶层）；
+    workers 大于1时使用线程池并行预取子目录列表；
+    lister 为列举单个目录的函数（默认 scan_dir，目录缓存会替换它）；
+    start 为断点续跑时保存的待处理目录栈 [(路径, 深度), ...]；
+    prune(路径, 子目录名列表) 返回需要继续遍历的子目录名，被剪掉的子目录不会入栈，也就不会被列举；
+    index 为 inodes.InodeIndex 时按 (设备, inode) 去重，已处理过的目录（硬链接、绑定挂载的重复路径）
+    连同其子树都不列举。哪条路径先被处理只取决于遍历顺序，并行预取时也与单线程相同。
+
+    子目录在产出当前目录之前入栈，因此处理完一个目录后，
+    pending() 返回的正好是剩余的全部工作，可用于保存断点。
+    """
+    def __init__(self, top, recursive=True, max_depth=None, workers=0, lister=scan_dir,
+                 start=None, prune=None, index=None):
+        self.top = top
+        self.max_depth = max_depth if recursive else 0
+        self.workers = workers
+        self.lister = lister
+        self.prune = prune
+        self.index = index
+        # 栈元素: [路径, 深度, future]
+        self.stack = [[path, depth, None] for path, depth in (start if start is not None else [(top, 0)])]
+
+    def pending(self):
+        """尚未处理的目录 [(路径, 深度), ...]（栈底在前）"""
+        return [(item[0], item[1]) for item in self.stack]
+
+    def __iter__(self):
+        if self.workers and self.workers > 1 and self.max_depth != 0:
+            return self._parallel_walk()
+        return self._serial_walk()
+
+    def _push_children(self, listing, depth):
+        if self.max_depth is None or depth < self.max_depth:
+            join = os.path.join
+            path = listing.path
+            names = listing.dirs
+            if self.prune is not None:
+                names = self.prune(path, names)
+            self.stack.extend([join(path, name), depth + 1, None]
+                              for name in reversed(names))
+
+    def _serial_walk(self):
+        """单线程深度优先遍历"""
+        stack = self.stack
+        lister = self.lister
+        index = self.index
+        while stack:
+            path, depth, _ = stack.pop()
+            if index is not None and not index.claim_dir(index.key(path)):
+                continue
+            listing = lister(path)
+            if listing is None:
+                continue
+            self._push_children(listing, depth)
+            yield listing
+
+    def _fetch(self, path):
+        """（预取线程中）列举目录，返回 (目录的设备和inode或None, DirListing)
+
+        去重时先取目录的 (设备, inode)，确定已处理过的目录不再列举；是否处理由遍历线程按出栈顺序决定。
+        """
+        index = self.index
+        if index is None:
+            return None, self.lister(path)
+        key = index.key(path)
+        if index.seen(key):
+            return key, None
+        return key, self.lister(path)
+
+    def _parallel_walk(self):
+        """多线程预取子目录列表，产出顺序与单线程遍历完全相同"""
+        # 只预取栈顶附近的目录，避免一次性提交整棵树导致内存无限增长
+        prefetch = self.workers * 2
+        stack = self.stack
+        fetch = self._fetch
+        index = self.index
+        pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='scan')
+        try:
+            while stack:
+                for item in stack[-prefetch:]:
+                    if item[2] is None:
+                        item[2] = pool.submit(fetch, item[0])
+                path, depth, future = stack.pop()
+                key, listing = future.result()
+                if index is not None and not index.claim_dir(key):
+                    continue
+                if listing is None:
+                    continue
+                self._push_children(listing, depth)
+                yield listing
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            for item in stack:
+                item[2] = None
+
+
+def walk_tree(top, recursive=True, max_depth=None, workers=0, lister=scan_dir, prune=None,
+              index=None):
+    """按 os.walk(topdown=True) 的顺序产出 DirListing（参数见 TreeWalker）"""
+    return iter(TreeWalker(top, recursive, max_depth, workers, lister, prune=prune, index=index))
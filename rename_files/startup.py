@@ -0,0 +1,59 @@
+"""启动计时：记录图形界面从启动脚本开始到窗口首次绘制的各阶段耗时
+
+启动脚本在导入 PyQt5 和图形界面模块之前创建 StartupTimer，之后在每个阶段结束时调用 mark()。
+窗口首次绘制后把耗时写入日志窗口；bench --startup 用同样的方式启动并比较耗时。
+"""
+import sys
+import time
+
+# 启动阶段（按先后顺序）及其显示名称
+PHASE_IMPORT = 'import'
+PHASE_APP = 'app'
+PHASE_WINDOW = 'window'
+PHASE_FIRST_PAINT = 'first_paint'
+PHASE_NAMES = {
+    PHASE_IMPORT: '导入',
+    PHASE_APP: '创建应用',
+    PHASE_WINDOW: '创建窗口',
+    PHASE_FIRST_PAINT: '首次绘制',
+}
+
+
+class StartupTimer:
+    """按顺序记录各阶段结束的时刻；每个阶段的耗时从上一个阶段结束（或 origin）开始计算"""
+    def __init__(self, origin=None):
+        self.origin = time.perf_counter() if origin is None else origin
+        self.marks = []
+
+    def mark(self, name):
+        """记录阶段 name 结束"""
+        self.marks.append((name, time.perf_counter()))
+
+    def has(self, name):
+        return any(mark == name for mark, _ in self.marks)
+
+    def phases(self):
+        """[(阶段, 耗时毫秒), ...]"""
+        result = []
+        last = self.origin
+        for name, at in self.marks:
+            result.append((name, (at - last) * 1000))
+            last = at
+        return result
+
+    def total_ms(self):
+        return (self.marks[-1][1] - self.origin) * 1000 if self.marks else 0.0
+
+    def report(self):
+        """JSON 记录：总耗时、各阶段耗时和当前已加载的本包模块"""
+        return {
+            'event': 'startup',
+            'total_ms': round(self.total_ms(), 1),
+            'phases': {name: round(ms, 1) for name, ms in self.phases()},
+            'modules': sorted(name for name in sys.modules if name.startswith('rename_files.')),
+        }
+
+    def format(self):
+        """日志中显示的一行摘要"""
+        parts = '，'.join(f"{PHASE_NAMES.get(name, name)} {ms:.0f}" for name, ms in self.phases())
+        return f"启动耗时 {self.total_ms():.0f} ms（{parts}）"
@@ -0,0 +1,183 @@
+"""图形界面的样式表
+
+所有控件的样式合并为一份应用级样式表，按对象名（objectName）区分控件，
+启动时只设置到 QApplication 上一次：Qt 只解析一次，控件之间共享解析结果，
+不再为每个控件（包括含 base64 图标的复选框样式）分别解析一遍。本模块不导入 PyQt5。
+"""
+
+TOOLTIP_STYLE = """
+    QToolTip {
+        background-color: rgba(255, 255, 255, 220);
+        color: #333;
+        border: 1px solid #ccc;
+        border-radius: 3px;
+        padding: 5px;
+    }
+"""
+
+TITLE_STYLE = """
+    QLabel#titleLabel {
+        font-size: 14pt;
+        font-weight: bold;
+        color: #333;
+    }
+    QPushButton#closeBtn {
+        background-color: #ff6b6b;
+        color: white;
+        border-radius: 12px;
+        font-weight: bold;
+    }
+    QPushButton#closeBtn:hover {
+        background-color: #ff4757;
+    }
+    QPushButton#minimizeBtn {
+        background-color: #ffd166;
+        color: white;
+        border-radius: 12px;
+        font-weight: bold;
+    }
+    QPushButton#minimizeBtn:hover {
+        background-color: #ffc107;
+    }
+"""
+
+LABEL_STYLE = """
+    QLabel#dirLabel, QLabel#logLabel {
+        font-weight: bold;
+    }
+    QLabel#statsLabel {
+        color: #555;
+    }
+"""
+
+INPUT_STYLE = """
+    QLineEdit#dirPath, QPlainTextEdit#logText {
+        background-color: rgba(255, 255, 255, 0.8);
+        border: 1px solid #ccc;
+        border-radius: 5px;
+        padding: 5px;
+    }
+"""
+
+GROUP_STYLE = """
+    QGroupBox#modeGroup, QGroupBox#optionsGroup, QGroupBox#queueGroup {
+        background-color: rgba(255, 255, 255, 0.6);
+        border: 1px solid #ddd;
+        border-radius: 5px;
+        padding: 10px;
+        margin-top: 10px;
+    }
+    QGroupBox#modeGroup::title, QGroupBox#optionsGroup::title, QGroupBox#queueGroup::title {
+        subcontrol-origin: margin;
+        subcontrol-position: top left;
+        padding: 0 5px;
+        font-weight: bold;
+    }
+"""
+
+# 修复单选按钮样式
+RADIO_STYLE = """
+    QGroupBox#modeGroup QRadioButton::indicator {
+        width: 18px;
+        height: 18px;
+    }
+    QGroupBox#modeGroup QRadioButton::indicator:checked {
+        border-radius: 9px;
+        background-color: #4a69bd;
+        border: 2px solid white;
+        width: 14px;
+        height: 14px;
+    }
+    QGroupBox#modeGroup QRadioButton::indicator:unchecked {
+        border-radius: 9px;
+        border: 2px solid #4a69bd;
+    }
+"""
+
+# 使用纯CSS重新实现复选框样式，不依赖图标
+CHECK_STYLE = """
+    QGroupBox#optionsGroup QCheckBox::indicator {
+        width: 18px;
+        height: 18px;
+        border: 2px solid #4a69bd;
+        border-radius: 3px;
+    }
+    QGroupBox#optionsGroup QCheckBox::indicator:checked {
+        background-color: #4a69bd;
+        image: url(data:image/svg+xml;base64,PHN2ZyB4bWxucz0iaHR0cDovL3d3dy53My5vcmcvMjAwMC9zdmciIHZpZXdCb3g9IjAgMCAxNiAxNiI+PHBhdGggZD0iTTE0LjI4MyAyLjI4M0w2LjAwMyAxMC4wNjNsLTMuMjgzLTMuMjgzQzIuMjgzIDYuNDQzIDIuMDM3IDYuMjk3IDEuNzUgNi4yOTdDMS40NjMgNi4yOTcgMS4yMSA2LjQ0NCAxLjIxIDYuNzAxYzAgMC4yNTcgMC4yNDcgMC41MDMgMC41MjcgMC41MDNjMC4yMTcgMCAwLjQxOC0wLjA5MyAwLjU3My0wLjI1NGwyLjc2IDIuNzY3QzUuNTYzIDEwLjkzMyA1Ljc2MyAxMSA2IDExYzAuMjM2IDAgMC40MzctMC4wNjcgMC41OTMtMC4yMDdsNy43Ny0xMC41NTNjMC4xOS0uMjYzIDAuMTctMC42MDYtMC4wNS0wLjgzM2MtMC4yMi0wLjIyLTAuNTctMC4yNC0wLjgzLTAuMDVMMTYgMy45NjdjMC4xOSAwLjIzIDAuMTkgMC42MSAwIDAuODQzTDYuODAzIDE1LjI3N2MtMC4yMDMuMjEtMC41NDUuMjEtMC43NDggMGwtNC4wNjMtNC4wNjRjLTAuMjEtMC4yMS0wLjIxLTAuNTU0IDAtMC43NjRjMC4yMS0wLjIxIDAuNTU0LTAuMjEgMC43NjQgMEw2IDExLjI1N2w3LjU4LTAuMDQzTDkuMjE1IDQuMjA0bC0wLjAwMi0wLjAwMnoiIGZpbGw9IiNmZmYiLz48L3N2Zz4=);
+    }
+    QGroupBox#optionsGroup QCheckBox::indicator:unchecked {
+        background-color: transparent;
+    }
+"""
+
+PROGRESS_STYLE = """
+    QProgressBar#progressBar {
+        background-color: rgba(255, 255, 255, 0.8);
+        border: 1px solid #ccc;
+        border-radius: 5px;
+    }
+    QProgressBar#progressBar::chunk {
+        background-color: #4a69bd;
+        border-radius: 5px;
+    }
+"""
+
+BUTTON_STYLE = """
+    QPushButton#browseBtn, QPushButton#queueToggleBtn, QPushButton#addJobBtn,
+    QPushButton#removeJobBtn, QPushButton#runQueueBtn, QPushButton#stopQueueBtn {
+        background-color: #4a69bd;
+        color: white;
+        border-radius: 5px;
+        padding: 5px 10px;
+    }
+    QPushButton#browseBtn:hover, QPushButton#queueToggleBtn:hover, QPushButton#addJobBtn:hover,
+    QPushButton#removeJobBtn:hover, QPushButton#runQueueBtn:hover, QPushButton#stopQueueBtn:hover {
+        background-color: #3c6382;
+    }
+    QPushButton#addJobBtn:disabled, QPushButton#removeJobBtn:disabled,
+    QPushButton#runQueueBtn:disabled, QPushButton#stopQueueBtn:disabled {
+        background-color: #cccccc;
+        color: #666666;
+    }
+    QPushButton#renameBtn, QPushButton#undoBtn, QPushButton#pauseBtn,
+    QPushButton#cancelBtn, QPushButton#exitBtn {
+        color: white;
+        font-weight: bold;
+        border-radius: 8px;
+        padding: 8px 16px;
+    }
+    QPushButton#renameBtn {
+        background-color: #4CAF50;
+    }
+    QPushButton#renameBtn:hover {
+        background-color: #45a049;
+    }
+    QPushButton#undoBtn {
+        background-color: #ff9800;
+    }
+    QPushButton#undoBtn:hover {
+        background-color: #f57c00;
+    }
+    QPushButton#pauseBtn, QPushButton#cancelBtn {
+        background-color: #4a69bd;
+    }
+    QPushButton#pauseBtn:hover, QPushButton#cancelBtn:hover {
+        background-color: #3c6382;
+    }
+    QPushButton#exitBtn {
+        background-color: #f44336;
+    }
+    QPushButton#exitBtn:hover {
+        background-color: #d32f2f;
+    }
+    QPushButton#renameBtn:disabled, QPushButton#undoBtn:disabled,
+    QPushButton#pauseBtn:disabled, QPushButton#cancelBtn:disabled {
+        background-color: #cccccc;
+        color: #666666;
+    }
+"""
+
+# 应用级样式表（按上面的顺序拼接，每个应用只设置一次）
+APP_STYLESHEET = ''.join((TOOLTIP_STYLE, TITLE_STYLE, LABEL_STYLE, INPUT_STYLE, GROUP_STYLE,
+                          RADIO_STYLE, CHECK_STYLE, PROGRESS_STYLE, BUTTON_STYLE))
@@ -0,0 +1,126 @@
+"""合成测试目录树生成器：按深度、分支数、文件数和文件名比例生成分卷压缩包目录"""
+import argparse
+import json
+import os
+import random
+
+
+def _dir_paths(root, depth, fanout):
+    """按深度优先顺序生成所有目录路径（包括根目录）"""
+    paths = [root]
+    level = [root]
+    for _ in range(depth):
+        next_level = []
+        for parent in level:
+            for i in range(fanout):
+                next_level.append(os.path.join(parent, f"d{i:03d}"))
+        paths.extend(next_level)
+        level = next_level
+    return paths
+
+
+def generate_tree(root, depth=2, fanout=4, files=10000, rar_ratio=0.4, rev_ratio=0.4,
+                  volumes=5, seed=0):
+    """生成合成目录树，返回统计信息字典
+
+    files 个文件平均分配到所有目录；rar_ratio/rev_ratio 分别为
+    name-partNN.rar 与 name.partNN.rev 的比例，其余为不匹配的普通文件。
+    每组分卷包含 volumes 个编号连续的文件。
+    """
+    if rar_ratio + rev_ratio > 1:
+        raise ValueError("rar_ratio 与 rev_ratio 之和不能大于1")
+    rng = random.Random(seed)
+    dirs = _dir_paths(root, depth, fanout)
+    for path in dirs:
+        os.makedirs(path, exist_ok=True)
+
+    counts = {'rar': 0, 'rev': 0, 'other': 0}
+    per_dir, extra = divmod(files, len(dirs))
+    serial = 0
+    for index, path in enumerate(dirs):
+        n = per_dir + (1 if index < extra else 0)
+        written = 0
+        while written < n:
+            roll = rng.random()
+            if roll < rar_ratio:
+                kind, template = 'rar', "set{0}-part{1:02d}.rar"
+            elif roll < rar_ratio + rev_ratio:
+                kind, template = 'rev', "set{0}.part{1:02d}.rev"
+            else:
+                kind, template = 'other', "file{0}.dat"
+            count = min(volumes, n - written) if kind != 'other' else 1
+            for part in range(1, count + 1):
+                open(os.path.join(path, template.format(serial, part)), 'xb').close()
+            counts[kind] += count
+            written += count
+            serial += 1
+    return {
+        'root': root,
+        'dirs': len(dirs),
+        'files': files,
+        'depth': depth,
+        'fanout': fanout,
+        'rar': counts['rar'],
+        'rev': counts['rev'],
+        'other': counts['other'],
+        'seed': seed,
+    }
+
+
+def synthetic_names(count, seed=0, volume_ratio=0.6):
+    """生成单个超大目录的文件名列表，包含分卷名和各种边界情况（换行、重复子串、非ASCII）
+
+    volume_ratio 为分卷文件（一半 -partNN.rar，一半 .partNN.rev）的比例。
+    """
+    rng = random.Random(seed)
+    special = ['a-part1.rar', 'a.part1.rev', '-part', '.part', 'x-part1.rar-part2.rar',
+               'y.part01.rev.part02.rev', '分卷-part3.rar', 'A-PART1.RAR', 'line\nbreak-part1.rar',
+               'z.part.rev', 'trailing-part', '.part9.rev', 'a-part1.rar.part2.rev']
+    names = set(special)
+    while len(names) < count:
+        n = rng.random()
+        stem = f"set{rng.randrange(count)}"
+        if n < volume_ratio / 2:
+            names.add(f"{stem}-part{rng.randrange(1, 20):02d}.rar")
+        elif n < volume_ratio:
+            names.add(f"{stem}.part{rng.randrange(1, 20):02d}.rev")
+        else:
+            names.add(f"{stem}.dat")
+    names = list(names)
+    rng.shuffle(names)
+    return names
+
+
+def link_tree(source, target):
+    """用硬链接复制目录树：目录是新的，文件与原树共用 inode"""
+    for root, _, files in os.walk(source):
+        dest = os.path.join(target, os.path.relpath(root, source))
+        os.makedirs(dest, exist_ok=True)
+        for name in files:
+            os.link(os.path.join(root, name), os.path.join(dest, name))
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m rename_files.treegen',
+                                     description='生成用于基准测试的合成分卷压缩包目录树')
+    parser.add_argument('root', help='要生成的目录（不存在时自动创建）')
+    parser.add_argument('--depth', type=int, default=2, help='目录深度（默认2）')
+    parser.add_argument('--fanout', type=int, default=4, help='每个目录的子目录数（默认4）')
+    parser.add_argument('--files', type=int, default=10000, help='文件总数（默认10000）')
+    parser.add_argument('--rar-ratio', type=float, default=0.4, help='-partNN.rar 文件比例')
+    parser.add_argument('--rev-ratio', type=float, default=0.4, help='.partNN.rev 文件比例')
+    parser.add_argument('--volumes', type=int, default=5, help='每组分卷的文件数')
+    parser.add_argument('--seed', type=int, default=0, help='随机种子')
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    info = generate_tree(args.root, args.depth, args.fanout, args.files,
+                         args.rar_ratio, args.rev_ratio, args.volumes, args.seed)
+    print(json.dumps(info, ensure_ascii=False))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,200 @@
+"""内容校验：读取文件头确认文件确实是 RAR/REV 分卷，避免只凭文件名误改
+
+只校验即将被重命名的文件（匹配规则的文件），每个文件只读开头的 8 个字节（本地为 os.pread，使用存储后端时通过后端读取），
+并在线程池上并行进行；结果按 (设备, inode) 缓存并记录 mtime 和大小，
+文件未变化时下次运行只需一次 stat。改名不会改变 inode 和 mtime，改名后缓存依然有效。
+"""
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .cache import default_cache_dir
+
+# 文件头签名
+RAR4_SIGNATURE = b'Rar!\x1a\x07\x00'
+RAR5_SIGNATURE = b'Rar!\x1a\x07\x01\x00'
+# RAR 5 恢复卷（.rev）；RAR 3.x 的恢复卷没有文件头签名，无法通过校验
+REV5_SIGNATURE = b'Rar!\x1aRev'
+HEADER_SIZE = 8
+
+KIND_RAR4 = 'rar4'
+KIND_RAR5 = 'rar5'
+KIND_REV5 = 'rev5'
+
+ARCHIVE_KINDS = frozenset((KIND_RAR4, KIND_RAR5))
+RECOVERY_KINDS = frozenset((KIND_REV5,))
+ALL_KINDS = ARCHIVE_KINDS | RECOVERY_KINDS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS volumes (
+    dev INTEGER NOT NULL,
+    ino INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    kind TEXT,
+    PRIMARY KEY (dev, ino)
+)
+"""
+
+_O_FLAGS = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+
+# 少于该数量的文件直接在调用线程中校验，线程池按块分配任务，避免每个文件一个 future
+PARALLEL_MIN = 32
+
+
+def header_kind(header):
+    """根据文件头判断分卷类型，不是已知的分卷时返回None"""
+    if header.startswith(RAR5_SIGNATURE):
+        return KIND_RAR5
+    if header.startswith(RAR4_SIGNATURE):
+        return KIND_RAR4
+    if header.startswith(REV5_SIGNATURE):
+        return KIND_REV5
+    return None
+
+
+def read_header(path, size=HEADER_SIZE):
+    """读取文件开头的 size 个字节"""
+    fd = os.open(path, _O_FLAGS)
+    try:
+        if hasattr(os, 'pread'):
+            return os.pread(fd, size, 0)
+        # Windows 没有 pread，刚打开的文件偏移为0，效果相同
+        return os.read(fd, size)
+    finally:
+        os.close(fd)
+
+
+def expected_kinds(old, new):
+    """按改名前后的扩展名确定文件头应属的类型
+
+    本工具处理的 .partNN.rev 是改了扩展名的普通压缩分卷，因此只要改名前或改名后的扩展名为 .rar，
+    文件头就必须是 RAR 4/5 压缩分卷：真正的恢复卷不能被改名为 .rar，也不会来自 .rar。
+    .rev 之间的改名（to-dot/to-dash）与其他扩展名接受压缩分卷或 RAR 5 恢复卷。
+    """
+    exts = {os.path.splitext(old)[1].lower(), os.path.splitext(new)[1].lower()}
+    if '.rar' in exts:
+        return ARCHIVE_KINDS
+    return ALL_KINDS
+
+
+def default_verify_cache_path():
+    """默认的校验结果缓存（所有目录和规则共用）"""
+    return os.path.join(default_cache_dir(), 'volumes.sqlite')
+
+
+class VolumeVerifier:
+    """在线程池上并行校验文件头，结果缓存在 SQLite 中
+
+    preload 为False时不把缓存整表读入内存，每个文件单独查询（限制内存模式）。
+    cache_path 为None时使用默认缓存；为空字符串时只在本次运行内缓存。
+    executor 为外部的线程池（如异步接口的共享线程池）时不再自建线程池，关闭时也不关闭它。
+    backend 为存储后端（backends 模块）时通过后端 stat 和读取文件头，为None时直接读本地文件。
+    """
+    def __init__(self, workers=8, cache_path=None, preload=True, executor=None, backend=None):
+        self.workers = max(1, workers)
+        self._stat = os.stat if backend is None else backend.stat
+        self._read_header = read_header if backend is None else backend.read_header
+        self.pool = executor
+        self._own_pool = executor is None
+        self.checked = 0
+        self.cache_hits = 0
+        self._lock = threading.Lock()
+        self._new = []
+        self.entries = {}
+        self.conn = None
+        if cache_path is None:
+            cache_path = default_verify_cache_path()
+        if cache_path:
+            os.makedirs(os.path.dirname(cache_path) or '.', exist_ok=True)
+            self.conn = sqlite3.connect(cache_path, check_same_thread=False)
+            self.conn.execute(_SCHEMA)
+            if preload:
+                self.entries = {row[:2]: row[2:] for row in self.conn.execute(
+                    "SELECT dev, ino, mtime_ns, size, kind FROM volumes")}
+            else:
+                self.entries = None
+
+    def _lookup(self, st):
+        if self.entries is not None:
+            return self.entries.get((st.st_dev, st.st_ino))
+        with self._lock:
+            return self.conn.execute(
+                "SELECT mtime_ns, size, kind FROM volumes WHERE dev = ? AND ino = ?",
+                (st.st_dev, st.st_ino)).fetchone()
+
+    def kind_of(self, path):
+        """文件的分卷类型（可在任意线程中调用）；不是分卷或无法读取时返回None"""
+        try:
+            st = self._stat(path)
+            entry = self._lookup(st)
+            if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+                with self._lock:
+                    self.cache_hits += 1
+                return entry[2]
+            kind = header_kind(self._read_header(path))
+        except OSError:
+            return None
+        record = (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size, kind)
+        with self._lock:
+            self._new.append(record)
+            if self.entries is not None:
+                self.entries[record[:2]] = record[2:]
+        return kind
+
+    def _kinds(self, paths):
+        kind_of = self.kind_of
+        return [kind_of(path) for path in paths]
+
+    def rejected(self, root, matches):
+        """返回 matches 中文件头与扩展名不符的旧文件名集合"""
+        if not matches:
+            return set()
+        join = os.path.join
+        paths = [join(root, old) for old, _ in matches]
+        if self.workers == 1 or len(paths) < PARALLEL_MIN:
+            kinds = self._kinds(paths)
+        else:
+            if self.pool is None:
+                self.pool = ThreadPoolExecutor(max_workers=self.workers,
+                                               thread_name_prefix='verify')
+            size = -(-len(paths) // self.workers)
+            chunks = [paths[i:i + size] for i in range(0, len(paths), size)]
+            futures = [self.pool.submit(self._kinds, chunk) for chunk in chunks[1:]]
+            kinds = self._kinds(chunks[0])
+            for future, chunk in zip(futures, chunks[1:]):
+                # 调用线程本身可能就是共享线程池中的线程：还没开始的块直接在调用线程中校验，
+                # 只等待已在其他线程中执行的块，线程池被占满时也不会死锁
+                kinds.extend(self._kinds(chunk) if future.cancel() else future.result())
+        self.checked += len(paths)
+        if len(self._new) >= 10000:
+            self.flush()
+        return {old for (old, new), kind in zip(matches, kinds)
+                if kind not in expected_kinds(old, new)}
+
+    def flush(self):
+        """把新的校验结果写入数据库"""
+        with self._lock:
+            new, self._new = self._new, []
+        if new and self.conn is not None:
+            with self._lock, self.conn:
+                self.conn.executemany(
+                    "INSERT OR REPLACE INTO volumes (dev, ino, mtime_ns, size, kind) "
+                    "VALUES (?, ?, ?, ?, ?)", new)
+
+    def close(self):
+        """关闭线程池（外部传入的除外）并写入剩余结果"""
+        if self.pool is not None and self._own_pool:
+            self.pool.shutdown(wait=True)
+        self.pool = None
+        self.flush()
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,38 @@
+"""分卷组：按基础名归并同一压缩包的各个分卷（name.partNN.* / name-partNN.*）
+
+分卷组整体改名时，编号不完整或不连续的组整组跳过，执行中任一分卷失败则整组回滚，
+避免同一组分卷出现新旧两种命名而无法解压。
+"""
+import re
+
+# 基础名 + 分隔符(. 或 -) + partNN + 扩展名；分隔符和扩展名不同的分卷也属于同一组
+VOLUME_RE = re.compile(r'(.+?)[.-]part(\d+)\.[^.]+', re.IGNORECASE)
+
+
+def volume_of(name):
+    """解析分卷文件名，返回 (组键, 卷号)，不是分卷时返回None"""
+    m = VOLUME_RE.fullmatch(name)
+    if m is None:
+        return None
+    return m.group(1).lower(), int(m.group(2))
+
+
+def volume_group(name):
+    """分卷所属的组键，不是分卷时返回None"""
+    m = VOLUME_RE.fullmatch(name)
+    return m.group(1).lower() if m is not None else None
+
+
+def index_volumes(names):
+    """一次遍历目录列表，建立 {组键: {卷号, ...}} 索引"""
+    index = {}
+    for name in names:
+        m = VOLUME_RE.fullmatch(name)
+        if m is not None:
+            index.setdefault(m.group(1).lower(), set()).add(int(m.group(2)))
+    return index
+
+
+def is_complete(parts):
+    """卷号从1开始且没有缺号"""
+    return len(parts) == max(parts) and min(parts) == 1
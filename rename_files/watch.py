@@ -0,0 +1,405 @@
+"""监视模式：先完整处理一遍目录树，之后只处理新建或移入的文件
+
+Linux 上使用 inotify（通过 ctypes 调用 libc，不需要第三方库），
+其他系统或 inotify 不可用时退回为定期检查目录的 mtime。
+事件经过防抖与合并，一次涌入成千上万个分卷也只作为一批处理。
+"""
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import struct
+import sys
+import time
+
+from .engine import (CONFLICT, RENAMED, SIMULATED, RenameEngine, RenameResult,
+                     collect_results)
+from .planner import OP_TO_TEMP, RenamePlan
+from .scan import scan_dir
+
+# inotify 常量（见 <sys/inotify.h>）
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_EXCL_UNLINK = 0x04000000
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = (IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MOVE_SELF
+              | IN_ONLYDIR | IN_EXCL_UNLINK)
+_EVENT = struct.Struct('iIII')
+# 记住的本程序改出的文件名上限：与 inotify 默认的事件队列长度（max_queued_events）相同，
+# 超出队列的事件会溢出为整个目录的重新检查，记住更多也用不上
+OWN_LIMIT = 16384
+
+
+class _Watcher:
+    """监视器公共部分：记录被监视目录的深度，判断新目录是否需要监视"""
+    kind = None
+
+    def __init__(self, top, recursive=True, max_depth=None, prune=None):
+        self.top = top
+        self.max_depth = max_depth if recursive else 0
+        # prune(路径, 子目录名列表) 返回需要监视的子目录名（遍历过滤）
+        self.prune = prune
+        self.depths = {}
+
+    def depth_of(self, path):
+        """目录相对于 top 的深度"""
+        rel = os.path.relpath(path, self.top)
+        return 0 if rel == os.curdir else rel.count(os.sep) + 1
+
+    def wants(self, depth):
+        return self.max_depth is None or depth <= self.max_depth
+
+    def prune_one(self, path, name):
+        """新出现的子目录是否需要监视"""
+        return self.prune is None or bool(self.prune(path, [name]))
+
+    def subdirs(self, listing):
+        """需要监视的子目录名"""
+        if self.prune is None:
+            return listing.dirs
+        return self.prune(listing.path, listing.dirs)
+
+    def _add_tree(self, path, depth, events):
+        """监视新出现的目录（及其子目录），并把整个目录作为事件（监视建立前可能已有文件）"""
+        stack = [(path, depth)]
+        while stack:
+            path, depth = stack.pop()
+            if not self.wants(depth) or not self.add(path, depth):
+                continue
+            listing = scan_dir(path)
+            if listing is None:
+                continue
+            events.append((path, None))
+            stack.extend((os.path.join(path, name), depth + 1) for name in self.subdirs(listing))
+
+
+class InotifyWatcher(_Watcher):
+    """基于 inotify 的监视器，产出 (目录, 文件名) 事件；文件名为None表示需要重新检查整个目录"""
+    kind = 'inotify'
+
+    def __init__(self, top, recursive=True, max_depth=None, prune=None):
+        super().__init__(top, recursive, max_depth, prune)
+        libc_name = ctypes.util.find_library('c') or 'libc.so.6'
+        self._libc = ctypes.CDLL(libc_name, use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            err = ctypes.get_errno()
+            raise OSError(err, os.strerror(err))
+        self.paths = {}
+
+    def add(self, path, depth=None):
+        """监视目录，返回是否成功；监视数达到上限时抛出 OSError(ENOSPC)"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd < 0:
+            err = ctypes.get_errno()
+            if err == errno.ENOSPC:
+                raise OSError(err, "inotify 监视数已达上限（/proc/sys/fs/inotify/max_user_watches）")
+            return False
+        self.paths[wd] = path
+        self.depths[path] = self.depth_of(path) if depth is None else depth
+        return True
+
+    def read(self, timeout):
+        """等待最多 timeout 秒，返回事件列表"""
+        ready, _, _ = select.select([self.fd], [], [], timeout)
+        if not ready:
+            return []
+        try:
+            data = os.read(self.fd, 1 << 16)
+        except BlockingIOError:
+            return []
+        events = []
+        pos = 0
+        while pos + _EVENT.size <= len(data):
+            wd, mask, _cookie, length = _EVENT.unpack_from(data, pos)
+            pos += _EVENT.size
+            name = os.fsdecode(data[pos:pos + length].rstrip(b'\0'))
+            pos += length
+            if mask & IN_Q_OVERFLOW:
+                # 事件队列溢出：丢失的事件无法恢复，重新检查所有被监视的目录
+                events.extend((path, None) for path in self.paths.values())
+                continue
+            path = self.paths.get(wd)
+            if path is None:
+                continue
+            if mask & (IN_IGNORED | IN_MOVE_SELF):
+                # 目录被删除或移走；移到树内的其他位置时会在新父目录收到 IN_MOVED_TO
+                self.paths.pop(wd, None)
+                self.depths.pop(path, None)
+                if not mask & IN_IGNORED:
+                    self._libc.inotify_rm_watch(self.fd, wd)
+                continue
+            if mask & IN_ISDIR:
+                if mask & (IN_CREATE | IN_MOVED_TO) and self.prune_one(path, name):
+                    self._add_tree(os.path.join(path, name), self.depths[path] + 1, events)
+                continue
+            if mask & (IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE):
+                events.append((path, name))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+class PollingWatcher(_Watcher):
+    """定期检查目录 mtime 的监视器（inotify 不可用时使用）
+
+    只保存每个目录的 mtime，不保存文件名，内存占用与目录数成正比；
+    mtime 变化的目录整个重新检查（其中已改好名的文件不会再次匹配）。
+    """
+    kind = 'polling'
+
+    def __init__(self, top, recursive=True, max_depth=None, interval=2.0, prune=None):
+        super().__init__(top, recursive, max_depth, prune)
+        self.interval = interval
+        self.mtimes = {}
+        self._next_poll = time.monotonic() + interval
+
+    def add(self, path, depth=None):
+        try:
+            self.mtimes[path] = os.stat(path).st_mtime_ns
+        except OSError:
+            return False
+        self.depths[path] = self.depth_of(path) if depth is None else depth
+        return True
+
+    def read(self, timeout):
+        wait = self._next_poll - time.monotonic()
+        if wait > timeout:
+            time.sleep(timeout)
+            return []
+        if wait > 0:
+            time.sleep(wait)
+        self._next_poll = time.monotonic() + self.interval
+        events = []
+        for path, mtime in list(self.mtimes.items()):
+            try:
+                current = os.stat(path).st_mtime_ns
+            except OSError:
+                del self.mtimes[path]
+                self.depths.pop(path, None)
+                continue
+            if current == mtime:
+                continue
+            self.mtimes[path] = current
+            events.append((path, None))
+            # 新出现的子目录
+            listing = scan_dir(path)
+            if listing is not None:
+                depth = self.depths[path] + 1
+                for name in self.subdirs(listing):
+                    child = os.path.join(path, name)
+                    if child not in self.mtimes:
+                        self._add_tree(child, depth, events)
+        return events
+
+    def close(self):
+        pass
+
+
+def create_watcher(top, recursive=True, max_depth=None, polling=False, poll_interval=2.0,
+                   prune=None):
+    """优先使用 inotify，不可用时退回轮询"""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(top, recursive, max_depth, prune)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(top, recursive, max_depth, poll_interval, prune)
+
+
+class WatchSession:
+    """监视模式：完整处理一遍后持续处理新文件，直到 control 被取消
+
+    debounce 秒内没有新事件，或距第一个未处理事件超过 max_delay 秒时，
+    把积累的事件按目录合并为一批处理。初次处理完成、开始监视时调用 on_ready(统计)，
+    每批结束后调用 on_batch(本批统计)。
+    """
+    def __init__(self, directory, mode, recursive=False, dry_run=True, max_depth=None,
+                 journal=None, control=None, debounce=1.0, max_delay=10.0,
+                 polling=False, poll_interval=2.0, on_ready=None, on_batch=None,
+                 scan_filter=None, verify=False, verify_workers=8):
+        self.directory = directory
+        self.recursive = recursive
+        self.dry_run = dry_run
+        self.max_depth = max_depth
+        self.journal = journal
+        self.control = control
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self.on_ready = on_ready
+        self.on_batch = on_batch
+        self.scan_filter = scan_filter if scan_filter else None
+        self._prune = self.scan_filter.prune_dirs if self.scan_filter is not None else None
+        self.watcher = create_watcher(directory, recursive, max_depth, polling, poll_interval,
+                                      self._prune)
+        self.engine = RenameEngine(directory, mode, recursive, dry_run, max_depth=max_depth,
+                                   journal=journal, control=control,
+                                   before_list=self._before_list, scan_filter=self.scan_filter,
+                                   verify=verify, verify_workers=verify_workers)
+        self.verifier = None
+        self.ruleset = self.engine.ruleset
+        self.mode = self.engine.mode
+        self.mode_desc = self.engine.mode_desc
+        self.batches = 0
+        # 由本程序改出的新文件名，其 IN_MOVED_TO 事件需要忽略
+        self._own = set()
+
+    @property
+    def kind(self):
+        return self.watcher.kind
+
+    def _before_list(self, path):
+        """目录列举之前先添加监视，列举期间新建的文件也不会遗漏"""
+        try:
+            self.watcher.add(path)
+        except OSError as e:
+            if e.errno != errno.ENOSPC:
+                raise
+            # inotify 监视数不足时整体切换为轮询
+            watcher = PollingWatcher(self.watcher.top, self.recursive, self.max_depth,
+                                     self.poll_interval, self._prune)
+            for watched, depth in self.watcher.depths.items():
+                watcher.add(watched, depth)
+            self.watcher.close()
+            self.watcher = watcher
+            watcher.add(path)
+
+    def _remember(self, result):
+        """记住改出的新文件名以忽略其 IN_MOVED_TO 事件；轮询没有单个文件的事件，不需要记住
+
+        初次处理可能改名数百万个文件，只记住最早的 OWN_LIMIT 个，未记住的事件作为新文件处理
+        （已改好名的文件不会再次匹配），内存占用不随改名数量增长。
+        """
+        if (result.status == RENAMED and self.watcher.kind == InotifyWatcher.kind
+                and len(self._own) < OWN_LIMIT):
+            self._own.add((result.root, result.new_name))
+        return result
+
+    def run(self):
+        """完整处理一遍，然后处理新文件；逐个产出 RenameResult"""
+        try:
+            for result in self.engine.run():
+                yield self._remember(result)
+            if self.engine.cancelled:
+                return
+            if self.journal is not None:
+                self.journal.flush()
+            if self.on_ready is not None:
+                self.on_ready(self.engine.summary())
+            self.verifier = self.engine.open_verifier()
+            yield from self._watch()
+        finally:
+            self.watcher.close()
+            if self.verifier is not None:
+                self.engine.verified += self.verifier.checked
+                self.engine.verify_cache_hits += self.verifier.cache_hits
+                self.verifier.close()
+
+    def _cancelled(self):
+        return self.control is not None and self.control.cancelled
+
+    def _watch(self):
+        pending = {}
+        first = last = None
+        while not self._cancelled():
+            if self.control is not None:
+                # 暂停期间事件留在内核队列（或目录 mtime）中，继续后再处理
+                self.control.wait()
+            events = self.watcher.read(min(self.debounce, 0.5))
+            now = time.monotonic()
+            for root, name in events:
+                if name is not None and (root, name) in self._own:
+                    self._own.discard((root, name))
+                    continue
+                if first is None:
+                    first = now
+                last = now
+                if name is None:
+                    pending[root] = None
+                else:
+                    names = pending.setdefault(root, set())
+                    if names is not None:
+                        names.add(name)
+            if pending and (now - last >= self.debounce or now - first >= self.max_delay):
+                batch, pending = pending, {}
+                first = last = None
+                self._own.clear()
+                yield from self._process(batch)
+
+    def _process(self, batch):
+        """处理一批事件：{目录: 文件名集合，或None表示整个目录}"""
+        engine = self.engine
+        match_batch = self.ruleset.match_batch
+        before = (engine.renamed_count, engine.skipped_count, engine.error_count,
+                  engine.conflict_count)
+        files_seen = 0
+        join = os.path.join
+        for root, names in batch.items():
+            if self.control is not None:
+                self.control.wait()
+            if names is None:
+                listing = scan_dir(root)
+                if listing is None:
+                    continue
+                files = listing.files
+                existing = listing.files + listing.dirs
+            else:
+                # 只处理仍然存在的普通文件（事件到达时文件可能已被移走）
+                files = [name for name in names
+                         if os.path.isfile(join(root, name)) or os.path.islink(join(root, name))]
+                existing = None
+            if self.scan_filter is not None:
+                files = self.scan_filter.filter_files(root, files)
+            files_seen += len(files)
+            matches = match_batch(files)
+            # 重新检查整个目录时，其中大多是早已处理过的文件，不重复计入未修改数量
+            if names is not None:
+                engine.skipped_count += len(files) - len(matches)
+            if not matches:
+                continue
+            if existing is None:
+                # 不列举整个目录：冲突检测只需要知道哪些目标名已被占用
+                existing = [old for old, _ in matches]
+                existing += [new for _, new in matches if os.path.lexists(join(root, new))]
+            rejected = None
+            if self.verifier is not None and matches:
+                rejected = self.verifier.rejected(root, matches)
+            plan = RenamePlan()
+            plan.add_directory(root, existing, matches, rejected=rejected)
+            for _, old, new, reason in plan.conflicts():
+                engine.conflict_count += 1
+                yield RenameResult(CONFLICT, root, old, new, reason)
+            if self.dry_run:
+                for _, kind, old, new, origin in plan.operations():
+                    if kind != OP_TO_TEMP:
+                        yield RenameResult(SIMULATED, root, origin, new, None)
+                continue
+            results = engine.rename_shard(root, list(plan.operations()))
+            for result in collect_results(results, engine):
+                yield self._remember(result)
+        if self.journal is not None:
+            self.journal.flush()
+        self.batches += 1
+        if self.on_batch is not None:
+            self.on_batch({
+                'batch': self.batches,
+                'dirs': len(batch),
+                'files': files_seen,
+                'renamed': engine.renamed_count - before[0],
+                'skipped': engine.skipped_count - before[1],
+                'errors': engine.error_count - before[2],
+                'conflicts': engine.conflict_count - before[3],
+            })
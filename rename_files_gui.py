@@ -0,0 +1,12 @@
+"""图形界面启动脚本（供直接运行或PyInstaller打包使用）"""
+import sys
+
+from rename_files.startup import PHASE_IMPORT, StartupTimer
+
+# 从这里开始计时：导入 PyQt5 和图形界面模块的耗时计入“导入”阶段
+startup = StartupTimer()
+from rename_files.gui import main  # noqa: E402
+startup.mark(PHASE_IMPORT)
+
+if __name__ == "__main__":
+    sys.exit(main(startup))
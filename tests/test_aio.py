@@ -0,0 +1,140 @@
+"""异步接口：取消或提前停止迭代时，统计与磁盘上实际完成的改名一致"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+from rename_files.aio import AsyncRenameJob, RenamePool
+from rename_files.engine import CONFLICT, SIMULATED
+from rename_files.verify import RAR5_SIGNATURE, VolumeVerifier
+
+
+def make_dirs(root, dirs=12, files=5):
+    for i in range(dirs):
+        path = os.path.join(root, f"d{i:02d}")
+        os.mkdir(path)
+        for j in range(files):
+            open(os.path.join(path, f"v{j}-part{j + 1}.rar"), 'w').close()
+
+
+def renamed_on_disk(root):
+    return sum(name.count('.part') for _, _, names in os.walk(root) for name in names)
+
+
+class SlowShardJob(AsyncRenameJob):
+    """每个分片执行前休眠，保证取消时有分片正在线程中执行"""
+    def __init__(self, *args, delay=0.02, **kwargs):
+        super().__init__(*args, **kwargs)
+        rename_shard = self.engine.rename_shard
+
+        def slow(root, operations):
+            time.sleep(delay)
+            return rename_shard(root, operations)
+        self.engine.rename_shard = slow
+
+
+class CancelTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        make_dirs(self.tmp.name)
+
+    def new_job(self, pool):
+        return SlowShardJob(self.tmp.name, 'to-dot', recursive=True, dry_run=False, pool=pool,
+                            concurrency=4, batch_size=1)
+
+    def test_cancel(self):
+        async def consume(job, started):
+            async for _ in job:
+                started.set()
+
+        async def main():
+            async with RenamePool(4) as pool:
+                job = self.new_job(pool)
+                started = asyncio.Event()
+                task = asyncio.ensure_future(consume(job, started))
+                await started.wait()
+                task.cancel()
+                with self.assertRaises(asyncio.CancelledError):
+                    await task
+                return job.summary()
+
+        summary = asyncio.run(main())
+        self.assertEqual(summary['renamed'], renamed_on_disk(self.tmp.name))
+        self.assertGreater(summary['renamed'], 0)
+        self.assertLess(summary['renamed'], 60)
+
+    def test_break(self):
+        async def main():
+            async with RenamePool(4) as pool:
+                job = self.new_job(pool)
+                results = job.results()
+                count = 0
+                async for _ in results:
+                    count += 1
+                    if count == 3:
+                        break
+                await results.aclose()
+                return job.summary()
+
+        summary = asyncio.run(main())
+        self.assertEqual(summary['renamed'], renamed_on_disk(self.tmp.name))
+        self.assertGreaterEqual(summary['renamed'], 3)
+
+    def test_complete(self):
+        async def main():
+            async with RenamePool(4) as pool:
+                job = self.new_job(pool)
+                names = [result.new_name async for result in job]
+                return names, job.summary()
+
+        names, summary = asyncio.run(main())
+        self.assertEqual(len(names), 60)
+        self.assertEqual(summary['renamed'], 60)
+        self.assertEqual(renamed_on_disk(self.tmp.name), 60)
+
+
+class VerifyTest(unittest.TestCase):
+    """内容校验在共享线程池上进行，不另建线程池；线程池只有一个线程时也不会死锁"""
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = os.path.join(tmp.name, 'd')
+        os.mkdir(self.root)
+        patcher = mock.patch.dict(os.environ, {'XDG_CACHE_HOME': os.path.join(tmp.name, 'cache')})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        for i in range(40):
+            with open(os.path.join(self.root, f"v{i}-part1.rar"), 'wb') as f:
+                f.write(RAR5_SIGNATURE if i % 10 else b'not a rar')
+
+    def test_shared_pool(self):
+        for workers in (1, 3):
+            with self.subTest(workers=workers):
+                threads = set()
+                kind_of = VolumeVerifier.kind_of
+
+                def record(verifier, path):
+                    threads.add(threading.current_thread().name)
+                    return kind_of(verifier, path)
+
+                async def main():
+                    async with RenamePool(workers) as pool:
+                        job = AsyncRenameJob(self.root, 'to-dot', dry_run=True, pool=pool,
+                                             verify=True, verify_workers=4)
+                        statuses = [result.status async for result in job]
+                        return statuses, job.summary()
+
+                with mock.patch.object(VolumeVerifier, 'kind_of', record):
+                    statuses, summary = asyncio.run(main())
+                self.assertEqual((statuses.count(SIMULATED), statuses.count(CONFLICT)), (36, 4))
+                self.assertEqual(summary['verified'], 40)
+                self.assertTrue(threads)
+                self.assertTrue(all(name.startswith('rename-aio') for name in threads), threads)
+
+
+if __name__ == '__main__':
+    unittest.main()
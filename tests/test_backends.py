@@ -0,0 +1,81 @@
+"""流水线后端：多连接并发请求与逐个请求的改名结果必须完全相同"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from rename_files.backends import LatencyConnection, PipelinedBackend
+from rename_files.engine import CONFLICT, RENAMED, RenameEngine
+from rename_files.verify import HEADER_SIZE, RAR5_SIGNATURE
+from rename_files.treegen import generate_tree
+
+
+def tree_names(directory):
+    """目录树中所有文件的相对路径集合"""
+    names = set()
+    for root, _, files in os.walk(directory):
+        rel = os.path.relpath(root, directory)
+        names.update(os.path.join(rel, name) for name in files)
+    return names
+
+
+class PipelinedBackendTest(unittest.TestCase):
+    def run_backend(self, directory, mode, connections):
+        opened = []
+
+        def connect():
+            conn = LatencyConnection(0.001)
+            opened.append(conn)
+            return conn
+
+        with PipelinedBackend(connect, connections) as backend:
+            engine = RenameEngine(directory, mode, True, False, backend=backend)
+            list(engine.run())
+        self.assertLessEqual(len(opened), connections)
+        return engine
+
+    def test_same_result_as_serial(self):
+        for mode in ('to-dot', 'rev-to-rar'):
+            with self.subTest(mode=mode), tempfile.TemporaryDirectory() as base:
+                serial_dir = os.path.join(base, 'serial')
+                pipelined_dir = os.path.join(base, 'pipelined')
+                for directory in (serial_dir, pipelined_dir):
+                    generate_tree(directory, depth=2, fanout=3, files=300, seed=1)
+                serial = self.run_backend(serial_dir, mode, 1)
+                pipelined = self.run_backend(pipelined_dir, mode, 8)
+                self.assertGreater(serial.renamed_count, 0)
+                self.assertEqual(pipelined.renamed_count, serial.renamed_count)
+                self.assertEqual(pipelined.error_count, 0)
+                self.assertEqual(tree_names(pipelined_dir), tree_names(serial_dir))
+
+
+class RecordingConnection(LatencyConnection):
+    """记录读取过文件头的路径"""
+    def __init__(self, headers):
+        super().__init__(0)
+        self.headers = headers
+
+    def read_header(self, path, size=HEADER_SIZE):
+        self.headers.append(os.path.basename(path))
+        return super().read_header(path, size)
+
+
+class VerifyThroughBackendTest(unittest.TestCase):
+    def test_headers_read_through_backend(self):
+        with tempfile.TemporaryDirectory() as base, \
+                mock.patch.dict(os.environ, {'XDG_CACHE_HOME': os.path.join(base, 'cache')}):
+            root = os.path.join(base, 'd')
+            os.mkdir(root)
+            for name, data in (('a-part1.rar', RAR5_SIGNATURE), ('b-part1.rar', b'not a rar')):
+                with open(os.path.join(root, name), 'wb') as f:
+                    f.write(data)
+            headers = []
+            with PipelinedBackend(lambda: RecordingConnection(headers), 4) as backend:
+                engine = RenameEngine(root, 'to-dot', dry_run=False, verify=True, backend=backend)
+                statuses = {result.old_name: result.status for result in engine.run()}
+        self.assertEqual(statuses, {'a-part1.rar': RENAMED, 'b-part1.rar': CONFLICT})
+        self.assertEqual(sorted(headers), ['a-part1.rar', 'b-part1.rar'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+"""目录缓存与过滤条件的组合"""
+import os
+import tempfile
+import unittest
+
+from rename_files.engine import RENAMED, RenameEngine
+from rename_files.filters import ScanFilter
+
+
+class SizeFilterCacheTest(unittest.TestCase):
+    def run_engine(self, directory, cache_dir):
+        engine = RenameEngine(directory, 'to-dot', recursive=True, dry_run=False, use_cache=True,
+                              cache_dir=cache_dir, scan_filter=ScanFilter(min_size=5))
+        return [(result.old_name, result.new_name) for result in engine.run()
+                if result.status == RENAMED]
+
+    def test_grown_file_is_renamed(self):
+        """文件增大到大小范围内但目录 mtime 不变时，第二次运行仍要处理该文件"""
+        with tempfile.TemporaryDirectory() as directory, tempfile.TemporaryDirectory() as cache_dir:
+            sub = os.path.join(directory, 'sub')
+            os.mkdir(sub)
+            path = os.path.join(sub, 'a-part1.rar')
+            with open(path, 'wb') as f:
+                f.write(b'x')
+            self.assertEqual(self.run_engine(directory, cache_dir), [])
+            st = os.stat(sub)
+            with open(path, 'ab') as f:
+                f.write(b'x' * 8)
+            os.utime(sub, ns=(st.st_atime_ns, st.st_mtime_ns))
+            self.assertEqual(self.run_engine(directory, cache_dir), [('a-part1.rar', 'a.part1.rar')])
+            self.assertEqual(os.listdir(sub), ['a.part1.rar'])
+
+
+if __name__ == '__main__':
+    unittest.main()
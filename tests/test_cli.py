@@ -0,0 +1,28 @@
+"""命令行参数检查"""
+import contextlib
+import io
+import tempfile
+import unittest
+
+from rename_files.cli import WATCH_UNSUPPORTED, main
+
+
+class WatchOptionsTest(unittest.TestCase):
+    def test_unsupported_options_rejected(self):
+        values = {'--workers': ['2'], '--rename-workers': ['2'], '--connections': ['2'],
+                  '--cache-dir': ['c'], '--memory-limit': ['100'], '--checkpoint-interval': ['5'],
+                  '--progress-interval': ['1'], '--prometheus-textfile': ['m.prom'],
+                  '--profile-dir': ['p']}
+        with tempfile.TemporaryDirectory() as directory:
+            for option, _ in WATCH_UNSUPPORTED:
+                argv = [directory, '--watch', option] + values.get(option, [])
+                stderr = io.StringIO()
+                with self.subTest(option=option), contextlib.redirect_stderr(stderr):
+                    with self.assertRaises(SystemExit) as cm:
+                        main(argv, io.StringIO())
+                    self.assertEqual(cm.exception.code, 2)
+                    self.assertIn(option, stderr.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+"""硬链接去重：同一物理文件的多个路径只改名一次"""
+import os
+import tempfile
+import unittest
+
+from rename_files.engine import RENAMED, SIMULATED, RenameEngine
+from rename_files.treegen import generate_tree, link_tree
+
+TREE = dict(depth=1, fanout=3, files=200, seed=2)
+
+
+class DedupeTest(unittest.TestCase):
+    def changed(self, directory, dry_run, dedupe):
+        engine = RenameEngine(directory, 'to-dot', True, dry_run, dedupe=dedupe)
+        count = sum(1 for result in engine.run() if result.status in (RENAMED, SIMULATED))
+        self.assertEqual(engine.error_count, 0)
+        return count, engine
+
+    def test_linked_copies(self):
+        """原始树加两份硬链接副本：去重后的改名数与只处理原始树时相同"""
+        for dry_run in (True, False):
+            with self.subTest(dry_run=dry_run), tempfile.TemporaryDirectory() as base:
+                unique_dir = os.path.join(base, 'unique')
+                generate_tree(unique_dir, **TREE)
+                unique, _ = self.changed(unique_dir, dry_run, False)
+                linked_dir = os.path.join(base, 'linked')
+                original = os.path.join(linked_dir, 'copy0')
+                generate_tree(original, **TREE)
+                for copy in (1, 2):
+                    link_tree(original, os.path.join(linked_dir, f'copy{copy}'))
+                changed, engine = self.changed(linked_dir, dry_run, True)
+                self.assertGreater(unique, 0)
+                self.assertEqual(changed, unique)
+                self.assertEqual(engine.files_deduped, 2 * unique)
+
+
+class VolumeSetDedupeTest(unittest.TestCase):
+    """按分卷组处理（volume_sets）时以整组为单位去重，不会只改名组内的一部分分卷"""
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+        for name in ('a', 'b'):
+            os.mkdir(os.path.join(self.root, name))
+
+    def make(self, path):
+        with open(os.path.join(self.root, path), 'w', encoding='utf-8') as f:
+            f.write(path)
+
+    def link(self, source, target):
+        os.link(os.path.join(self.root, source), os.path.join(self.root, target))
+
+    def run_engine(self):
+        engine = RenameEngine(self.root, 'to-dot', True, False, volume_sets=True, dedupe=True)
+        results = list(engine.run())
+        self.assertEqual(engine.error_count + engine.conflict_count, 0, results)
+        return engine
+
+    def listing(self, name):
+        return sorted(os.listdir(os.path.join(self.root, name)))
+
+    def test_partly_linked_set(self):
+        """b 中的组只有一个分卷是 a 中分卷的硬链接：两个目录中的组都整组改名"""
+        self.make('a/x-part1.rar')
+        self.make('a/x-part2.rar')
+        self.link('a/x-part1.rar', 'b/x-part1.rar')
+        self.make('b/x-part2.rar')
+        engine = self.run_engine()
+        self.assertEqual(engine.renamed_count, 4)
+        self.assertEqual(engine.files_deduped, 0)
+        self.assertEqual(self.listing('a'), ['x.part1.rar', 'x.part2.rar'])
+        self.assertEqual(self.listing('b'), ['x.part1.rar', 'x.part2.rar'])
+
+    def test_fully_linked_set(self):
+        """组内所有分卷都是硬链接副本时整组去掉，只改名先遇到的一份"""
+        self.make('a/x-part1.rar')
+        self.make('a/x-part2.rar')
+        self.link('a/x-part1.rar', 'b/x-part1.rar')
+        self.link('a/x-part2.rar', 'b/x-part2.rar')
+        self.make('b/y-part1.rar')
+        engine = self.run_engine()
+        self.assertEqual(engine.renamed_count, 3)
+        self.assertEqual(engine.files_deduped, 2)
+        sets = [self.listing('a'), [name for name in self.listing('b') if name.startswith('x')]]
+        self.assertEqual(sorted(sets), [['x-part1.rar', 'x-part2.rar'], ['x.part1.rar', 'x.part2.rar']])
+        self.assertIn('y.part1.rar', self.listing('b'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""任务队列：按设备串行调度，撤销时整批回滚上次运行的任务"""
+import os
+import tempfile
+import unittest
+
+from rename_files.jobs import JOB_DONE, JOB_RUNNING, Job, JobQueue
+
+
+class JobQueueTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def test_same_device_runs_serially(self):
+        queue = JobQueue(max_running=2)
+        first = queue.add(Job(self.tmp, 'to-dot'))
+        second = queue.add(Job(self.tmp, 'to-dot'))
+        self.assertEqual(queue.start_ready(), [first])
+        self.assertEqual(queue.start_ready(), [])
+        queue.finish(first, JOB_DONE)
+        self.assertEqual(queue.start_ready(), [second])
+        self.assertEqual(second.status, JOB_RUNNING)
+
+    def test_batch_journals(self):
+        """只返回最近一批中仍存在的日志，后结束的任务在前"""
+        queue = JobQueue(max_running=1)
+        old = queue.add(Job(self.tmp, 'to-dot'))
+        queue.start_batch()
+        queue.start_ready()
+        old.journal_path = self.touch('old.rfj')
+        queue.finish(old, JOB_DONE)
+
+        queue.start_batch()
+        jobs = [queue.add(Job(self.tmp, 'to-dot')) for _ in range(3)]
+        for job, name in zip(jobs, ('a.rfj', None, 'c.rfj')):
+            self.assertEqual(queue.start_ready(), [job])
+            job.journal_path = self.touch(name) if name else os.path.join(self.tmp, 'removed.rfj')
+            queue.finish(job, JOB_DONE)
+        self.assertEqual(queue.batch_journals(), [(jobs[2], jobs[2].journal_path),
+                                                  (jobs[0], jobs[0].journal_path)])
+
+    def touch(self, name):
+        path = os.path.join(self.tmp, name)
+        open(path, 'w').close()
+        return path
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,172 @@
+"""撤销日志：记录格式与按日志回滚"""
+import os
+import tempfile
+import unittest
+
+from rename_files.engine import CONFLICT, RENAMED, RenameEngine, UndoRun
+from rename_files.journal import Journal, read_journal, read_journal_meta
+from rename_files.rules import Rule, RuleSet
+
+
+def touch(path, data=b''):
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+class JournalTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.journal_dir = os.path.join(self.tmp, 'journal')
+        self.root = os.path.join(self.tmp, 'd')
+        os.mkdir(self.root)
+
+    def rename(self, directory, mode='to-dot'):
+        journal = Journal.create(directory, getattr(mode, 'name', mode), self.journal_dir)
+        engine = RenameEngine(directory, mode, dry_run=False, journal=journal)
+        results = list(engine.run())
+        journal.close()
+        return journal.path, results
+
+
+class FormatTest(JournalTestCase):
+    RECORDS = [
+        ('/data/a', 'x-part1.rar', 'x.part1.rar'),
+        ('/data/分卷', '名称-part2.rar', '名称.part2.rar'),
+        ('/data/a', 'y-part1.rar', 'y.part1.rar'),
+        ('/data/a', 'z' * 300 + '.rar', '.tmp-' + 'z' * 300),
+    ]
+
+    def write(self):
+        journal = Journal.create('/data', 'to-dot', self.journal_dir, sync_every=2)
+        for record in self.RECORDS:
+            journal.record(*record)
+        journal.close()
+        return journal.path
+
+    def test_round_trip(self):
+        path = self.write()
+        meta, records = read_journal(path)
+        self.assertEqual(records, self.RECORDS)
+        self.assertEqual(meta['mode'], 'to-dot')
+        self.assertEqual(read_journal_meta(path), meta)
+
+    def test_truncated_tail(self):
+        """崩溃时只写了一部分：任意位置截断都只返回完整记录组成的前缀"""
+        path = self.write()
+        with open(path, 'rb') as f:
+            data = f.read()
+        header = 8 + int.from_bytes(data[4:8], 'little')
+        truncated = os.path.join(self.tmp, 'truncated.rfj')
+        for size in range(header, len(data) + 1):
+            with open(truncated, 'wb') as f:
+                f.write(data[:size])
+            _, records = read_journal(truncated)
+            self.assertEqual(records, self.RECORDS[:len(records)], size)
+        self.assertEqual(records, self.RECORDS)
+
+    def test_empty_journal_is_removed(self):
+        journal = Journal.create(self.root, 'to-dot', self.journal_dir)
+        journal.close()
+        self.assertFalse(os.path.exists(journal.path))
+
+    def test_not_a_journal(self):
+        path = os.path.join(self.tmp, 'bad.rfj')
+        touch(path, b'nope')
+        with self.assertRaises(ValueError):
+            read_journal(path)
+
+
+class CycleUndoTest(JournalTestCase):
+    def test_swap_and_undo(self):
+        """a、b 互换名称时借助临时名，撤销后恢复原样且不留下临时文件"""
+        touch(os.path.join(self.root, 'a.rar'), b'a')
+        touch(os.path.join(self.root, 'b.rar'), b'b')
+        swap = RuleSet([Rule('a', r'^a\.rar$', 'b.rar'), Rule('b', r'^b\.rar$', 'a.rar')])
+        path, results = self.rename(self.root, swap)
+        self.assertEqual(sorted(result.status for result in results), [RENAMED, RENAMED])
+        self.assertEqual(self.contents(), {'a.rar': b'b', 'b.rar': b'a'})
+        _, records = read_journal(path)
+        # 临时名也记录在日志中（先改为临时名、最后由临时名改为目标名）
+        self.assertEqual(len(records), 3)
+        self.assertEqual(records[0][2], records[2][1])
+        undo = UndoRun(path)
+        list(undo.run())
+        self.assertEqual((undo.renamed_count, undo.error_count, undo.conflict_count), (3, 0, 0))
+        self.assertEqual(self.contents(), {'a.rar': b'a', 'b.rar': b'b'})
+        self.assertFalse(os.path.exists(path))
+
+    def contents(self):
+        result = {}
+        for name in os.listdir(self.root):
+            with open(os.path.join(self.root, name), 'rb') as f:
+                result[name] = f.read()
+        return result
+
+
+class RelativeDirectoryTest(JournalTestCase):
+    def test_undo_from_other_working_directory(self):
+        touch(os.path.join(self.root, 'a-part1.rar'))
+        cwd = os.getcwd()
+        self.addCleanup(os.chdir, cwd)
+        os.chdir(self.tmp)
+        path, _ = self.rename('d')
+        _, records = read_journal(path)
+        self.assertEqual(records, [(self.root, 'a-part1.rar', 'a.part1.rar')])
+        # 另一个工作目录下有相同的相对路径，不能被改动
+        other = os.path.join(self.tmp, 'other')
+        os.makedirs(os.path.join(other, 'd'))
+        touch(os.path.join(other, 'd', 'a.part1.rar'))
+        os.chdir(other)
+        undo = UndoRun(path)
+        list(undo.run())
+        self.assertEqual(undo.error_count, 0)
+        self.assertEqual(os.listdir(self.root), ['a-part1.rar'])
+        self.assertEqual(os.listdir(os.path.join(other, 'd')), ['a.part1.rar'])
+
+
+class UndoConflictTest(JournalTestCase):
+    def read(self, name):
+        with open(os.path.join(self.root, name), 'rb') as f:
+            return f.read()
+
+    def test_recreated_original_is_not_overwritten(self):
+        for workers in (0, 2):
+            with self.subTest(rename_workers=workers):
+                for name in os.listdir(self.root):
+                    os.remove(os.path.join(self.root, name))
+                touch(os.path.join(self.root, 'a-part1.rar'), b'volume')
+                touch(os.path.join(self.root, 'b-part1.rar'), b'other')
+                path, _ = self.rename(self.root)
+                touch(os.path.join(self.root, 'a-part1.rar'), b'precious')
+                undo = UndoRun(path, workers)
+                statuses = {result.old_name: result.status for result in undo.run()}
+                self.assertEqual(statuses, {'a.part1.rar': CONFLICT, 'b.part1.rar': RENAMED})
+                self.assertEqual((undo.renamed_count, undo.conflict_count, undo.error_count), (1, 1, 0))
+                self.assertEqual(self.read('a-part1.rar'), b'precious')
+                self.assertEqual(self.read('a.part1.rar'), b'volume')
+                self.assertEqual(self.read('b-part1.rar'), b'other')
+                # 未完整撤销的日志不标记为已撤销
+                self.assertTrue(os.path.exists(path))
+
+    def test_blocked_chain_is_not_overwritten(self):
+        """链式改名 b->c、a->b 的撤销中 b 的原名被占用时，a 也不能改回 b 覆盖现有文件"""
+        touch(os.path.join(self.root, 'a.rar'), b'a')
+        touch(os.path.join(self.root, 'b.rar'), b'b')
+        journal = Journal.create(self.root, 'chain', self.journal_dir)
+        os.rename(os.path.join(self.root, 'b.rar'), os.path.join(self.root, 'c.rar'))
+        journal.record(self.root, 'b.rar', 'c.rar')
+        os.rename(os.path.join(self.root, 'a.rar'), os.path.join(self.root, 'b.rar'))
+        journal.record(self.root, 'a.rar', 'b.rar')
+        journal.close()
+        touch(os.path.join(self.root, 'a.rar'), b'new a')
+        undo = UndoRun(journal.path)
+        list(undo.run())
+        self.assertEqual(undo.renamed_count, 0)
+        self.assertEqual({name: self.read(name) for name in os.listdir(self.root)},
+                         {'a.rar': b'new a', 'b.rar': b'a', 'c.rar': b'b'})
+
+
+if __name__ == '__main__':
+    unittest.main()
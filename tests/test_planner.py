@@ -0,0 +1,182 @@
+"""两阶段重命名计划：冲突检测、链式依赖、循环，以及执行结果在磁盘上的文件名"""
+import os
+import tempfile
+import unittest
+
+from rename_files.engine import CONFLICT, RENAMED, RenameEngine
+from rename_files.executor import iter_shard
+from rename_files.planner import (CONFLICT_REASONS, CONFLICT_BLOCKED, CONFLICT_DUPLICATE,
+                                  CONFLICT_EXISTS, OP_FROM_TEMP, OP_TO_TEMP, RenamePlan,
+                                  execute_operations, rename_in_dir)
+
+
+class PlannerTestCase(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = tmp.name
+
+    def make(self, *names):
+        """创建文件，内容为文件名本身，用于确认改名后的文件来自哪里"""
+        for name in names:
+            with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+                f.write(name)
+
+    def contents(self):
+        """{当前文件名: 原文件名}"""
+        result = {}
+        for name in os.listdir(self.root):
+            with open(os.path.join(self.root, name), encoding='utf-8') as f:
+                result[name] = f.read()
+        return result
+
+    def plan(self, matches, **options):
+        plan = RenamePlan()
+        plan.add_directory(self.root, os.listdir(self.root), matches, **options)
+        return plan
+
+    def execute(self, plan, **options):
+        return list(iter_shard(self.root, list(plan.operations()), **options))
+
+    def conflicts(self, plan):
+        return sorted((old, new, reason) for _, old, new, reason in plan.conflicts())
+
+
+class PlanTest(PlannerTestCase):
+    def test_three_cycle(self):
+        self.make('a', 'b', 'c')
+        plan = self.plan([('a', 'b'), ('b', 'c'), ('c', 'a')])
+        self.assertEqual(plan.conflict_count, 0)
+        kinds = [kind for _, kind, _, _, _ in plan.operations()]
+        self.assertEqual(kinds[0], OP_TO_TEMP)
+        self.assertEqual(kinds[-1], OP_FROM_TEMP)
+        results = self.execute(plan)
+        self.assertEqual(sorted((old, new, error) for _, old, new, error in results),
+                         [('a', 'b', None), ('b', 'c', None), ('c', 'a', None)])
+        self.assertEqual(self.contents(), {'b': 'a', 'c': 'b', 'a': 'c'})
+
+    def test_chain(self):
+        self.make('a', 'b', 'x')
+        plan = self.plan([('a', 'b'), ('b', 'c')])
+        self.assertEqual(plan.conflict_count, 0)
+        self.assertEqual([(old, new) for _, _, old, new, _ in plan.operations()],
+                         [('b', 'c'), ('a', 'b')])
+        self.execute(plan)
+        self.assertEqual(self.contents(), {'b': 'a', 'c': 'b', 'x': 'x'})
+
+    def test_duplicate_target(self):
+        self.make('a', 'b', 'c')
+        plan = self.plan([('a', 'x'), ('b', 'x'), ('c', 'y')])
+        duplicate = CONFLICT_REASONS[CONFLICT_DUPLICATE]
+        self.assertEqual(self.conflicts(plan), [('a', 'x', duplicate), ('b', 'x', duplicate)])
+        self.execute(plan)
+        self.assertEqual(self.contents(), {'a': 'a', 'b': 'b', 'y': 'c'})
+
+    def test_existing_target(self):
+        self.make('a', 'b')
+        plan = self.plan([('a', 'b')])
+        self.assertEqual(self.conflicts(plan), [('a', 'b', CONFLICT_REASONS[CONFLICT_EXISTS])])
+        self.assertEqual(len(plan), 0)
+        self.execute(plan)
+        self.assertEqual(self.contents(), {'a': 'a', 'b': 'b'})
+
+    def test_existing_target_blocks_chain(self):
+        """链的末端目标已存在时，整条链都不能执行"""
+        self.make('a', 'b', 'c')
+        plan = self.plan([('a', 'b'), ('b', 'c')])
+        self.assertEqual(self.conflicts(plan), [('a', 'b', CONFLICT_REASONS[CONFLICT_BLOCKED]),
+                                                ('b', 'c', CONFLICT_REASONS[CONFLICT_EXISTS])])
+        self.execute(plan)
+        self.assertEqual(self.contents(), {'a': 'a', 'b': 'b', 'c': 'c'})
+
+    def test_case_only_rename(self):
+        self.make('A-part1.rar')
+        plan = self.plan([('A-part1.rar', 'a-part1.rar')])
+        self.assertEqual(plan.conflict_count, 0)
+        self.execute(plan)
+        self.assertEqual(self.contents(), {'a-part1.rar': 'A-part1.rar'})
+
+
+class ExecuteTest(PlannerTestCase):
+    def failing_rename(self, *failures):
+        def rename(root, old, new):
+            if (old, new) in failures:
+                raise PermissionError(13, "拒绝访问")
+            rename_in_dir(root, old, new)
+        return rename
+
+    def test_target_not_vacated(self):
+        """b 无法移走时，a -> b 不执行，b 不会被覆盖"""
+        self.make('a', 'b')
+        plan = self.plan([('a', 'b'), ('b', 'c')])
+        results = self.execute(plan, rename=self.failing_rename(('b', 'c')))
+        errors = {old: error for _, old, _, error in results}
+        self.assertIn('拒绝访问', errors['b'])
+        self.assertEqual(errors['a'], CONFLICT_REASONS[CONFLICT_BLOCKED])
+        self.assertEqual(self.contents(), {'a': 'a', 'b': 'b'})
+
+    def test_cycle_step_fails(self):
+        """循环中的一步失败时没有文件被覆盖；原文件名已被占用时文件保留为临时名"""
+        self.make('a', 'b', 'c')
+        plan = self.plan([('a', 'b'), ('b', 'c'), ('c', 'a')])
+        results = self.execute(plan, rename=self.failing_rename(('b', 'c')))
+        contents = self.contents()
+        self.assertEqual(sorted(contents.values()), ['a', 'b', 'c'])
+        temp = [name for name in contents if 'rename-tmp' in name]
+        self.assertEqual(len(temp), 1)
+        self.assertEqual({name: contents[name] for name in ('a', 'b')}, {'a': 'c', 'b': 'b'})
+        self.assertEqual(contents[temp[0]], 'a')
+        errors = {old: error for _, old, _, error in results}
+        self.assertIsNone(errors['c'])
+        self.assertIn(temp[0], errors['a'])
+
+    def test_two_cycle_step_fails(self):
+        """两个文件互换时一步失败，临时名恢复为原文件名"""
+        self.make('a', 'b')
+        plan = self.plan([('a', 'b'), ('b', 'a')])
+        self.execute(plan, rename=self.failing_rename(('b', 'a')))
+        self.assertEqual(self.contents(), {'a': 'a', 'b': 'b'})
+
+    def test_cycle_to_temp_fails(self):
+        self.make('a', 'b')
+        plan = self.plan([('a', 'b'), ('b', 'a')])
+        temp = next(new for _, kind, _, new, _ in plan.operations() if kind == OP_TO_TEMP)
+        results = self.execute(plan, rename=self.failing_rename(('a', temp)))
+        self.assertTrue(all(error is not None for _, _, _, error in results))
+        self.assertEqual(self.contents(), {'a': 'a', 'b': 'b'})
+
+    def test_no_replace(self):
+        """计划生成后才出现的目标文件不会被覆盖"""
+        self.make('a-part1.rar')
+        plan = self.plan([('a-part1.rar', 'a.part1.rar')])
+        self.make('a.part1.rar')
+        results = list(execute_operations(plan.operations(), no_replace=True))
+        self.assertEqual(results[0][3], CONFLICT_REASONS[CONFLICT_EXISTS])
+        self.assertEqual(self.contents(), {'a-part1.rar': 'a-part1.rar', 'a.part1.rar': 'a.part1.rar'})
+
+
+class ExecutePlanTest(PlannerTestCase):
+    def test_stale_plan(self):
+        """执行较早生成的计划（预览）时，之后才出现的目标文件报告为冲突，其余照常改名"""
+        for workers in (0, 2):
+            with self.subTest(rename_workers=workers):
+                for name in os.listdir(self.root):
+                    os.remove(os.path.join(self.root, name))
+                self.make('a-part1.rar', 'b-part1.rar', 'c-part1.rar')
+                preview = RenameEngine(self.root, 'to-dot', dry_run=True)
+                plan = preview.plan()
+                self.make('b.part1.rar')
+                engine = RenameEngine(self.root, 'to-dot', dry_run=False, rename_workers=workers)
+                statuses = {result.old_name: result.status
+                            for result in engine.execute(plan, no_replace=True)}
+                self.assertEqual(statuses, {'a-part1.rar': RENAMED, 'b-part1.rar': CONFLICT,
+                                            'c-part1.rar': RENAMED})
+                self.assertEqual((engine.renamed_count, engine.conflict_count), (2, 1))
+                self.assertEqual(self.contents(), {'a.part1.rar': 'a-part1.rar',
+                                                   'b-part1.rar': 'b-part1.rar',
+                                                   'b.part1.rar': 'b.part1.rar',
+                                                   'c.part1.rar': 'c-part1.rar'})
+
+
+if __name__ == '__main__':
+    unittest.main()
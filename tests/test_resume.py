@@ -0,0 +1,94 @@
+"""取消 -> 保存断点 -> 继续：两次运行合起来与一次完整运行相同，且没有目录被列举两次"""
+import os
+import shutil
+import tempfile
+import unittest
+
+from rename_files.control import Checkpoint, RunControl
+from rename_files.engine import RENAMED, RenameEngine
+
+
+def make_tree(root, depth=2, fanout=3, files=3):
+    """每个目录中 files 个待改名的分卷和一个不匹配的文件"""
+    dirs = [root]
+    for level in range(depth):
+        dirs += [os.path.join(parent, f"sub{i}") for parent in dirs
+                 if parent.count(os.sep) - root.count(os.sep) == level for i in range(fanout)]
+    for path in dirs:
+        os.makedirs(path, exist_ok=True)
+        for i in range(files):
+            open(os.path.join(path, f"v{i}-part{i + 1}.rar"), 'w').close()
+        open(os.path.join(path, 'notes.txt'), 'w').close()
+    return dirs
+
+
+class ResumeTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+
+    def run_engine(self, root, checkpoint, resume=False, cancel_after=None):
+        """运行一次，返回 (改名结果集合, 列举过的目录列表, 引擎)；cancel_after 个目录有结果后取消"""
+        listed = []
+        control = RunControl()
+        engine = RenameEngine(root, 'to-dot', recursive=True, dry_run=False, control=control,
+                              checkpoint=checkpoint, resume=resume,
+                              before_list=listed.append)
+        renamed = set()
+        roots = []
+        for result in engine.run():
+            if result.status == RENAMED:
+                renamed.add((os.path.relpath(result.root, root), result.old_name, result.new_name))
+            if not roots or roots[-1] != result.root:
+                roots.append(result.root)
+                if cancel_after is not None and len(roots) == cancel_after:
+                    control.cancel()
+        return renamed, [os.path.relpath(path, root) for path in listed], engine
+
+    def test_cancel_and_resume(self):
+        full_root = os.path.join(self.tmp, 'full')
+        split_root = os.path.join(self.tmp, 'split')
+        dirs = make_tree(full_root)
+        shutil.copytree(full_root, split_root)
+
+        full, full_listed, full_engine = self.run_engine(
+            full_root, Checkpoint(os.path.join(self.tmp, 'full.json')))
+        self.assertEqual(len(full_listed), len(dirs))
+
+        checkpoint = Checkpoint(os.path.join(self.tmp, 'split.json'))
+        first, first_listed, first_engine = self.run_engine(split_root, checkpoint, cancel_after=4)
+        self.assertTrue(first_engine.cancelled)
+        self.assertTrue(os.path.exists(checkpoint.path))
+        self.assertLess(len(first), len(full))
+
+        second, second_listed, second_engine = self.run_engine(split_root, checkpoint, resume=True)
+        self.assertTrue(second_engine.resumed)
+        self.assertFalse(second_engine.cancelled)
+        self.assertFalse(os.path.exists(checkpoint.path))
+
+        # 两次运行的结果互不重复，合起来与完整运行相同
+        self.assertEqual(first & second, set())
+        self.assertEqual(first | second, full)
+        # 第一次运行中列举过的目录不会在继续时再次列举
+        self.assertEqual(set(first_listed) & set(second_listed), set())
+        self.assertEqual(sorted(first_listed + second_listed), sorted(full_listed))
+        # 计数从断点恢复后累计
+        summary = second_engine.summary()
+        self.assertEqual(summary['renamed'], full_engine.renamed_count)
+        self.assertEqual(summary['dirs_scanned'], len(dirs))
+        self.assertEqual(sorted(os.listdir(split_root)), sorted(os.listdir(full_root)))
+
+    def test_resume_with_other_options_starts_over(self):
+        root = os.path.join(self.tmp, 'tree')
+        make_tree(root, depth=1)
+        checkpoint = Checkpoint(os.path.join(self.tmp, 'cp.json'))
+        self.run_engine(root, checkpoint, cancel_after=1)
+        self.assertTrue(os.path.exists(checkpoint.path))
+        engine = RenameEngine(root, 'to-dash', recursive=True, dry_run=True,
+                              checkpoint=checkpoint, resume=True)
+        self.assertFalse(engine.resumed)
+
+
+if __name__ == '__main__':
+    unittest.main()
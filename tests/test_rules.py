@@ -0,0 +1,118 @@
+"""差分测试：整批匹配（match_batch）、逐个调用 apply 与最初的正则实现结果必须完全相同"""
+import re
+import unittest
+
+from rename_files.rules import BUILTIN_RULES, RuleSet, builtin_ruleset
+from rename_files.treegen import synthetic_names
+
+# 边界情况：换行、非ASCII、大小写变体、不带数字的 part、重复子串
+EDGE_NAMES = [
+    'a-part1.rar', 'a.part1.rev', '-part', '.part', 'trailing-part', 'trailing.part',
+    'a-part.rar', 'z.part.rev', 'a-partx1.rar', 'b.partx1.rev', '-part1.rar', '.part1.rev',
+    '分卷-part3.rar', '分卷.part3.rev', 'ファイル.part12.rev', 'émoji😀-part7.rar',
+    'A-PART1.RAR', 'x.PART1.REV', 'a-Part1.rar', 'a.part1.REV', 'a-part1.RAR',
+    'x-part1.rar-part2.rar', 'y.part01.rev.part02.rev', 'a-part1.rar.part2.rev',
+    'a.part1.rev.bak', 'a-part1.rar ', ' -part1.rar', 'plain.dat', '',
+]
+
+NEWLINE_NAMES = [
+    'line\nbreak-part1.rar', 'line\nbreak.part1.rev', 'x.part1.rev\n', 'x-part1.rar\n',
+    '\n-part1.rar', 'a-part\n1.rar', 'a.part1\n.rev',
+]
+
+
+def original_rename(mode, filename):
+    """最初版本（单文件脚本）的改名逻辑，不改名时返回None"""
+    if mode in ('to-dot', 'to-dash'):
+        old_str, new_str = ('-part', '.part') if mode == 'to-dot' else ('.part', '-part')
+        if old_str not in filename:
+            return None
+        new_filename = filename.replace(old_str, new_str)
+    elif mode == 'rev-to-rar':
+        match = re.search(r'(.+)(\.part)(\d+)(\.rev)$', filename)
+        if not match:
+            return None
+        new_filename = f"{match.group(1)}-part{match.group(3)}.rar"
+    else:
+        match = re.search(r'(.+)(-part)(\d+)(\.rar)$', filename)
+        if not match:
+            return None
+        new_filename = f"{match.group(1)}.part{match.group(3)}.rev"
+    return None if new_filename == filename else new_filename
+
+
+def each_apply(ruleset, names):
+    matches = []
+    for name in names:
+        new_name = ruleset.apply(name)
+        if new_name is not None and new_name != name:
+            matches.append((name, new_name))
+    return matches
+
+
+def listings():
+    """(说明, 文件名列表)：生成的大目录（分卷密集/稀疏）加上边界情况"""
+    result = [('edge', EDGE_NAMES)]
+    for seed in range(3):
+        for ratio in (0.6, 0.02):
+            names = [name for name in synthetic_names(2000, seed, ratio) if '\n' not in name]
+            result.append((f"seed={seed} ratio={ratio}", names + EDGE_NAMES))
+    return result
+
+
+class MatchBatchTest(unittest.TestCase):
+    def test_batch_matches_apply_and_original(self):
+        for mode in sorted(BUILTIN_RULES):
+            ruleset = builtin_ruleset(mode)
+            for label, names in listings():
+                with self.subTest(mode=mode, listing=label):
+                    batch = ruleset.match_batch(names)
+                    self.assertEqual(batch, each_apply(ruleset, names))
+                    original = [(name, original_rename(mode, name)) for name in names]
+                    self.assertEqual(batch, [item for item in original if item[1] is not None])
+
+    def test_case_sensitive(self):
+        for mode in sorted(BUILTIN_RULES):
+            ruleset = builtin_ruleset(mode)
+            for name in ('A-PART1.RAR', 'x.PART1.REV', 'a-Part1.rar', 'a.Part1.rev'):
+                self.assertIsNone(ruleset.apply(name), (mode, name))
+
+    def test_part_without_digits(self):
+        self.assertEqual(builtin_ruleset('rev-to-rar').match_batch(['z.part.rev', 'b.partx1.rev']), [])
+        self.assertEqual(builtin_ruleset('rar-to-rev').match_batch(['a-part.rar', 'a-partx1.rar']), [])
+        # 简单替换模式不要求数字
+        self.assertEqual(builtin_ruleset('to-dot').match_batch(['a-part.rar', 'trailing-part']),
+                         [('a-part.rar', 'a.part.rar'), ('trailing-part', 'trailing.part')])
+
+    def test_newline_names(self):
+        """含换行符的目录退回逐个匹配，结果与 apply 相同
+
+        最初的实现对含换行符的文件名会丢掉换行前的部分（'.' 不匹配换行、'$' 匹配末尾换行之前），
+        这里只与 apply 比较，并确认新文件名保留了完整的原文件名。
+        """
+        for mode in sorted(BUILTIN_RULES):
+            ruleset = builtin_ruleset(mode)
+            for seed in range(3):
+                names = synthetic_names(500, seed) + NEWLINE_NAMES
+                with self.subTest(mode=mode, seed=seed):
+                    self.assertEqual(ruleset.match_batch(names), each_apply(ruleset, names))
+        self.assertEqual(builtin_ruleset('rev-to-rar').match_batch(NEWLINE_NAMES),
+                         [('line\nbreak.part1.rev', 'line\nbreak-part1.rar'),
+                          ('x.part1.rev\n', 'x-part1.rar\n')])
+        self.assertEqual(builtin_ruleset('rar-to-rev').match_batch(NEWLINE_NAMES),
+                         [('line\nbreak-part1.rar', 'line\nbreak.part1.rev'),
+                          ('x-part1.rar\n', 'x.part1.rev\n')])
+        # 文件名本身不含换行符时，换行前后的部分不会被拼成一个文件名
+        self.assertEqual(builtin_ruleset('rar-to-rev').match_batch(['a-part', '1.rar']), [])
+
+    def test_chained_rules(self):
+        ruleset = RuleSet([BUILTIN_RULES['rev-to-rar'], BUILTIN_RULES['to-dot']])
+        for label, names in listings():
+            with self.subTest(listing=label):
+                self.assertEqual(ruleset.match_batch(names), each_apply(ruleset, names))
+        self.assertEqual(ruleset.match_batch(['a.part1.rev', 'b-part2.rar', 'c.dat']),
+                         [('a.part1.rev', 'a-part1.rar'), ('b-part2.rar', 'b.part2.rar')])
+
+
+if __name__ == '__main__':
+    unittest.main()
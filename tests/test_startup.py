@@ -0,0 +1,74 @@
+"""启动路径测试：导入包、图形界面和命令行入口时不应加载延迟导入的模块"""
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+from rename_files.bench import check_startup, measure_startup
+
+PACKAGE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HAS_PYQT5 = importlib.util.find_spec('PyQt5') is not None
+# 首次绘制前不应加载的模块（在首次使用时才导入）
+DEFERRED_MODULES = ('rename_files.backends', 'rename_files.cache', 'rename_files.engine',
+                    'rename_files.journal', 'rename_files.preview', 'rename_files.profiling',
+                    'rename_files.watch')
+# 命令行入口本身要用引擎（连带 cache、journal），其余延迟导入的模块只在用到对应选项时导入
+CLI_DEFERRED_MODULES = ('rename_files.backends', 'rename_files.preview', 'rename_files.profiling',
+                        'rename_files.watch')
+# 首次绘制的耗时预算（毫秒），只用于发现明显的退化，留足慢速CI机器的余量
+STARTUP_BUDGET_MS = 5000
+
+
+def loaded_modules(*imports):
+    """在新进程中依次导入 imports，返回其中已加载的 rename_files.* 模块"""
+    script = ''.join(f"import {name}\n" for name in imports) + (
+        "import json, sys\n"
+        "print(json.dumps(sorted(m for m in sys.modules if m.startswith('rename_files'))))\n")
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, (PACKAGE_ROOT, env.get('PYTHONPATH'))))
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    proc = subprocess.run([sys.executable, '-c', script], env=env, capture_output=True, text=True,
+                          timeout=60)
+    if proc.returncode != 0:
+        raise AssertionError(proc.stderr)
+    return set(json.loads(proc.stdout.splitlines()[-1]))
+
+
+class LazyImportTest(unittest.TestCase):
+    def test_package(self):
+        loaded = loaded_modules('rename_files', 'rename_files.jobs', 'rename_files.startup',
+                                'rename_files.styles')
+        self.assertEqual(sorted(loaded.intersection(DEFERRED_MODULES)), [])
+
+    def test_rules_without_engine(self):
+        loaded = loaded_modules('rename_files.rules')
+        self.assertNotIn('rename_files.engine', loaded)
+
+    @unittest.skipUnless(HAS_PYQT5, "PyQt5 不可用")
+    def test_gui(self):
+        loaded = loaded_modules('rename_files.gui')
+        self.assertEqual(sorted(loaded.intersection(DEFERRED_MODULES)), [])
+
+    def test_cli(self):
+        loaded = loaded_modules('rename_files.cli')
+        self.assertEqual(sorted(loaded.intersection(CLI_DEFERRED_MODULES)), [])
+
+    def test_cli_profile_modes(self):
+        from rename_files import cli, profiling
+        self.assertIs(cli.PROFILE_MODES, profiling.PROFILE_MODES)
+
+
+@unittest.skipUnless(HAS_PYQT5, "PyQt5 不可用")
+class StartupBudgetTest(unittest.TestCase):
+    def test_first_paint(self):
+        """首次绘制前不加载延迟导入的模块，耗时在预算内"""
+        record = measure_startup(3)
+        self.assertEqual(sorted(set(DEFERRED_MODULES).intersection(record['modules'])), [])
+        check, regressed = check_startup(record, None, None, STARTUP_BUDGET_MS)
+        self.assertFalse(regressed, check)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+"""分卷组整体改名：不完整的组、组内冲突和执行中失败时整组回滚"""
+import os
+import tempfile
+import unittest
+
+from rename_files.executor import iter_shard
+from rename_files.journal import Journal, read_journal
+from rename_files.planner import (CONFLICT_EXISTS, CONFLICT_INCOMPLETE, CONFLICT_REASONS,
+                                  CONFLICT_VOLUME_SET, VOLUME_SET_FAILED, RenamePlan, rename_in_dir)
+from rename_files.rules import builtin_ruleset
+from rename_files.volumes import index_volumes, is_complete, volume_group, volume_of
+
+
+class VolumeNameTest(unittest.TestCase):
+    def test_volume_of(self):
+        self.assertEqual(volume_of('Name-part01.rar'), ('name', 1))
+        self.assertEqual(volume_of('name.part2.rev'), ('name', 2))
+        self.assertIsNone(volume_of('name.rar'))
+        self.assertEqual(volume_group('a.b-part3.rar'), 'a.b')
+
+    def test_is_complete(self):
+        index = index_volumes(['x-part1.rar', 'x.part2.rev', 'x-part3.rar', 'y-part2.rar', 'z.txt'])
+        self.assertEqual(index, {'x': {1, 2, 3}, 'y': {2}})
+        self.assertTrue(is_complete(index['x']))
+        self.assertFalse(is_complete(index['y']))
+        self.assertFalse(is_complete({1, 3}))
+
+
+class VolumeSetTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = os.path.join(tmp.name, 'd')
+        self.journal_dir = os.path.join(tmp.name, 'journal')
+        os.mkdir(self.root)
+
+    def make(self, *names):
+        for name in names:
+            with open(os.path.join(self.root, name), 'w', encoding='utf-8') as f:
+                f.write(name)
+
+    def contents(self):
+        result = {}
+        for name in os.listdir(self.root):
+            with open(os.path.join(self.root, name), encoding='utf-8') as f:
+                result[name] = f.read()
+        return result
+
+    def run_plan(self, rename=None):
+        names = sorted(os.listdir(self.root))
+        matches = builtin_ruleset('to-dot').match_batch(names)
+        plan = RenamePlan()
+        plan.add_directory(self.root, names, matches, volume_sets=True)
+        journal = Journal.create(self.root, 'to-dot', self.journal_dir)
+        results = list(iter_shard(self.root, list(plan.operations()), rename=rename,
+                                  on_renamed=journal.record, group_of=volume_group))
+        journal.close()
+        conflicts = {old: reason for _, old, _, reason in plan.conflicts()}
+        errors = {old: error for _, old, _, error in results}
+        return conflicts, errors, journal.path
+
+    def test_incomplete_set_skipped(self):
+        self.make('x-part1.rar', 'x-part3.rar', 'y-part1.rar', 'y-part2.rar')
+        conflicts, errors, _ = self.run_plan()
+        incomplete = CONFLICT_REASONS[CONFLICT_INCOMPLETE]
+        self.assertEqual(conflicts, {'x-part1.rar': incomplete, 'x-part3.rar': incomplete})
+        self.assertEqual(errors, {'y-part1.rar': None, 'y-part2.rar': None})
+        self.assertEqual(sorted(os.listdir(self.root)),
+                         ['x-part1.rar', 'x-part3.rar', 'y.part1.rar', 'y.part2.rar'])
+
+    def test_conflict_on_one_member(self):
+        self.make('x-part1.rar', 'x-part2.rar', 'x.part2.rar', 'y-part1.rar')
+        conflicts, errors, _ = self.run_plan()
+        self.assertEqual(conflicts, {'x-part1.rar': CONFLICT_REASONS[CONFLICT_VOLUME_SET],
+                                     'x-part2.rar': CONFLICT_REASONS[CONFLICT_EXISTS]})
+        self.assertEqual(errors, {'y-part1.rar': None})
+        self.assertEqual(self.contents(), {'x-part1.rar': 'x-part1.rar', 'x-part2.rar': 'x-part2.rar',
+                                           'x.part2.rar': 'x.part2.rar', 'y.part1.rar': 'y-part1.rar'})
+
+    def test_failure_rolls_back_set(self):
+        """第二个分卷改名失败：已改名的分卷改回原名，整组报告失败，回滚也写入撤销日志"""
+        self.make('x-part1.rar', 'x-part2.rar', 'x-part3.rar', 'y-part1.rar')
+
+        def rename(root, old, new):
+            if old == 'x-part2.rar':
+                raise PermissionError(13, "拒绝访问")
+            rename_in_dir(root, old, new)
+
+        conflicts, errors, journal_path = self.run_plan(rename)
+        self.assertEqual(conflicts, {})
+        self.assertIn('拒绝访问', errors['x-part2.rar'])
+        self.assertEqual(errors['x-part1.rar'], VOLUME_SET_FAILED)
+        self.assertEqual(errors['x-part3.rar'], VOLUME_SET_FAILED)
+        self.assertIsNone(errors['y-part1.rar'])
+        self.assertEqual(self.contents(), {'x-part1.rar': 'x-part1.rar', 'x-part2.rar': 'x-part2.rar',
+                                           'x-part3.rar': 'x-part3.rar', 'y.part1.rar': 'y-part1.rar'})
+        _, records = read_journal(journal_path)
+        names = [(old, new) for _, old, new in records]
+        self.assertEqual(names[:2], [('x-part1.rar', 'x.part1.rar'), ('x.part1.rar', 'x-part1.rar')])
+        self.assertIn(('y-part1.rar', 'y.part1.rar'), names)
+        self.assertEqual(len(names), 3)
+
+    def test_failure_at_each_member(self):
+        for failing in (1, 2, 3):
+            with self.subTest(failing=failing):
+                for name in os.listdir(self.root):
+                    os.remove(os.path.join(self.root, name))
+                self.make('x-part1.rar', 'x-part2.rar', 'x-part3.rar')
+
+                def rename(root, old, new):
+                    if old == f'x-part{failing}.rar':
+                        raise PermissionError(13, "拒绝访问")
+                    rename_in_dir(root, old, new)
+
+                _, errors, journal_path = self.run_plan(rename)
+                self.assertTrue(all(error is not None for error in errors.values()))
+                self.assertEqual(sorted(os.listdir(self.root)),
+                                 ['x-part1.rar', 'x-part2.rar', 'x-part3.rar'])
+                # 每个已完成的改名都有一条对应的回滚记录（没有记录时日志文件被删除）
+                records = read_journal(journal_path)[1] if os.path.exists(journal_path) else []
+                self.assertEqual(len(records), 2 * (failing - 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+"""监视模式：初次处理的改名不会让记住的文件名无限增长"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from rename_files import watch
+from rename_files.control import RunControl
+from rename_files.watch import WatchSession
+
+
+class OwnRenamesTest(unittest.TestCase):
+    def run_session(self, directory, polling):
+        control = RunControl()
+        ready = []
+
+        def on_ready(stats):
+            ready.append(stats)
+            control.cancel()
+
+        session = WatchSession(directory, 'to-dot', recursive=True, dry_run=False,
+                               control=control, debounce=0.1, polling=polling,
+                               poll_interval=0.1, on_ready=on_ready)
+        results = list(session.run())
+        self.assertEqual(ready[0]['renamed'], 20)
+        self.assertEqual(len(results), 20)
+        return session
+
+    def make_files(self, directory):
+        for i in range(20):
+            open(os.path.join(directory, f"v{i}-part1.rar"), 'w').close()
+
+    def test_limit(self):
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(watch, 'OWN_LIMIT', 5):
+            self.make_files(directory)
+            session = self.run_session(directory, polling=False)
+            expected = 5 if session.kind == 'inotify' else 0
+            self.assertEqual(len(session._own), expected)
+
+    def test_polling_remembers_nothing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.make_files(directory)
+            session = self.run_session(directory, polling=True)
+            self.assertEqual(session._own, set())
+
+
+if __name__ == '__main__':
+    unittest.main()